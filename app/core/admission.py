@@ -0,0 +1,260 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.deadline import remaining
+from app.core.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_LIMIT,
+    ADMISSION_QUEUE_WAIT,
+    ADMISSION_QUEUED,
+    ADMISSION_REJECTIONS,
+)
+
+logger = logging.getLogger("app.fastapi.project")
+
+DEFAULT_GROUP = "default"
+# Multiplicative decrease applied when a request comes back too slow
+BACKOFF = 0.9
+
+
+class AdmissionRejectedError(RuntimeError):
+    """A request was turned away before reaching the application."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"request rejected: {reason}, retry in {retry_after:.1f}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RateLimitedError(AdmissionRejectedError):
+    """The client used up its request budget for the route."""
+
+
+class OverloadedError(AdmissionRejectedError):
+    """The route is at its concurrency limit and its queue is full or too slow."""
+
+
+class ConcurrencyLimiter:
+    """Caps requests in flight for a route group, with a bounded FIFO queue.
+
+    Requests over ``limit`` wait up to ``queue_timeout`` seconds (less if
+    the request deadline is closer) for a slot; when ``queue_size`` are
+    already waiting, or the wait runs out, OverloadedError is raised.
+
+    With a ``target_latency`` the limit adapts (AIMD): a request slower than
+    the target, or answered 503/504, shrinks it by BACKOFF at most once per
+    target interval; a fast one grows it by 1/limit while the group is
+    saturated, up to the configured ``limit``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        queue_size: int = 0,
+        queue_timeout: float = 1.0,
+        target_latency: float = 0.0,
+        min_limit: int = 1,
+    ):
+        self.name = name
+        self.max_limit = limit
+        self.min_limit = min(min_limit, limit)
+        self.limit = float(limit)
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        ADMISSION_LIMIT.labels(name).set(self.limit)
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in the queue if need be."""
+        if not self._waiters and self.in_flight < int(self.limit):
+            self._take()
+            return
+        timeout = self.queue_timeout
+        budget = remaining()
+        if budget is not None:
+            timeout = min(timeout, budget)
+        if len(self._waiters) >= self.queue_size or timeout <= 0:
+            self._reject("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        ADMISSION_QUEUED.labels(self.name).inc()
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except (TimeoutError, asyncio.CancelledError) as error:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we gave up; pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(error, TimeoutError):
+                self._reject("queue_timeout")
+            raise
+        finally:
+            ADMISSION_QUEUED.labels(self.name).dec()
+            ADMISSION_QUEUE_WAIT.labels(self.name).observe(time.monotonic() - started)
+
+    def release(
+        self, latency: Optional[float] = None, overloaded: bool = False
+    ) -> None:
+        """Give the slot back; ``latency`` and ``overloaded`` feed the limit."""
+        saturated = bool(self._waiters) or self.in_flight >= int(self.limit)
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.labels(self.name).dec()
+        if self.target_latency > 0 and latency is not None:
+            self._adapt(latency, overloaded, saturated)
+        self._wake()
+
+    def _adapt(self, latency: float, overloaded: bool, saturated: bool) -> None:
+        now = time.monotonic()
+        if overloaded or latency > self.target_latency:
+            # One decrease per interval, or a burst of slow requests that
+            # all started under the old limit would collapse it
+            if now - self._last_decrease >= self.target_latency:
+                self._last_decrease = now
+                self._set_limit(max(self.min_limit, self.limit * BACKOFF))
+        elif saturated and self.limit < self.max_limit:
+            self._set_limit(min(self.max_limit, self.limit + 1 / self.limit))
+
+    def _set_limit(self, limit: float) -> None:
+        if int(limit) != int(self.limit):
+            logger.info(
+                f"Admission limit for {self.name}: {int(self.limit)} -> {int(limit)}"
+            )
+        self.limit = limit
+        ADMISSION_LIMIT.labels(self.name).set(limit)
+
+    def _take(self) -> None:
+        self.in_flight += 1
+        ADMISSION_IN_FLIGHT.labels(self.name).inc()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._take()
+                waiter.set_result(None)
+
+    def _reject(self, reason: str) -> None:
+        ADMISSION_REJECTIONS.labels(self.name, reason).inc()
+        raise OverloadedError(reason, self.queue_timeout)
+
+    def stats(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+        }
+
+
+class RateLimiter:
+    """Per-client token buckets: ``rate`` requests a second, bursts of ``burst``.
+
+    Buckets of the least recently seen clients are dropped beyond
+    ``max_clients``; a dropped client starts again with a full bucket.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, max_clients: int = 10000):
+        self.name = name
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_clients = max_clients
+        # client -> (tokens, time.monotonic() of the last refill)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def acquire(self, client: str) -> None:
+        """Spend a token of ``client``'s bucket or raise RateLimitedError."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            ADMISSION_REJECTIONS.labels(self.name, "rate_limited").inc()
+            self._buckets[client] = (tokens, now)
+            raise RateLimitedError("rate_limited", (1 - tokens) / self.rate)
+        self._buckets[client] = (tokens, now)
+        self._buckets.move_to_end(client)
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+
+
+def _split_route(route: str) -> Tuple[str, str]:
+    """``"POST /prefix"`` as ("POST", "/prefix"); a bare prefix has no method."""
+    method, _, prefix = route.rpartition(" ")
+    return method.upper(), prefix
+
+
+def _parse_route_specs(raw: str) -> List[Tuple[str, List[float]]]:
+    """``"/prefix:1:2,POST /other:3"`` as [(route, numbers)], longest prefix
+    first and, for the same prefix, a route with a method before one without."""
+    specs = []
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        route, *numbers = item.split(":")
+        specs.append((route, [float(number) for number in numbers]))
+
+    def specificity(spec):
+        method, prefix = _split_route(spec[0])
+        return len(prefix), bool(method)
+
+    return sorted(specs, key=specificity, reverse=True)
+
+
+def build_concurrency_limiters() -> List[Tuple[str, Optional[ConcurrencyLimiter]]]:
+    """Limiters from ADMISSION_LIMITS, then the default group under "".
+
+    Each entry is ``[METHOD ]prefix:limit[:queue_size[:target_latency]]``;
+    a limit of 0 leaves the route unlimited.
+    """
+
+    def limiter(name, limit, queue_size, target_latency):
+        if limit <= 0:
+            return None
+        return ConcurrencyLimiter(
+            name,
+            int(limit),
+            queue_size=int(queue_size),
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+            target_latency=target_latency,
+            min_limit=settings.ADMISSION_MIN_CONCURRENCY,
+        )
+
+    defaults = [
+        settings.ADMISSION_CONCURRENCY,
+        settings.ADMISSION_QUEUE_SIZE,
+        settings.ADMISSION_TARGET_LATENCY,
+    ]
+    limiters = [
+        (prefix, limiter(prefix, *(numbers + defaults[len(numbers) :])))
+        for prefix, numbers in _parse_route_specs(settings.ADMISSION_LIMITS)
+    ]
+    limiters.append(("", limiter(DEFAULT_GROUP, *defaults)))
+    return limiters
+
+
+def build_rate_limiters() -> List[Tuple[str, RateLimiter]]:
+    """Rate limiters from RATE_LIMITS entries ``[METHOD ]prefix:rate[:burst]``."""
+    return [
+        (prefix, RateLimiter(prefix, rate, burst[0] if burst else rate))
+        for prefix, (rate, *burst) in _parse_route_specs(settings.RATE_LIMITS)
+    ]
+
+
+def for_path(limiters: List[Tuple[str, object]], path: str, method: str = ""):
+    """The limiter of the most specific route matching ``method`` and
+    ``path``, or None."""
+    for route, limiter in limiters:
+        route_method, prefix = _split_route(route)
+        if path.startswith(prefix) and route_method in ("", method):
+            return limiter
+    return None
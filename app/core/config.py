@@ -10,6 +10,138 @@ class Settings:
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "LOCAL")
     LOG_FILE_PATH: str = os.getenv("LOG_FILE_PATH", "logs/app.log")
 
+    # Logging pipeline
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "DEBUG").upper()
+    SQL_LOG_LEVEL: str = os.getenv("SQL_LOG_LEVEL", "INFO").upper()
+    LOG_JSON: bool = os.getenv("LOG_JSON", "false").lower() == "true"
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # What to do when the log queue is full: "drop" or "block"
+    LOG_QUEUE_OVERFLOW: str = os.getenv("LOG_QUEUE_OVERFLOW", "drop").lower()
+    # Fraction of requests whose access lines are logged, e.g. 0.1
+    LOG_SAMPLE_RATE: float = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+    # Per-route overrides by path prefix, e.g. "/users:0.1,/health:0"
+    LOG_SAMPLE_RATES: str = os.getenv("LOG_SAMPLE_RATES", "")
+
+    # Request deadlines in seconds: the default, per-route overrides by path
+    # prefix (0 disables, e.g. "/users/export:0") and a client header that
+    # may ask for another budget up to REQUEST_TIMEOUT_MAX
+    REQUEST_TIMEOUT: float = float(os.getenv("REQUEST_TIMEOUT", "15"))
+    REQUEST_TIMEOUTS: str = os.getenv(
+        "REQUEST_TIMEOUTS", "/users/export:0,/users/bulk:120"
+    )
+    REQUEST_TIMEOUT_HEADER: str = os.getenv(
+        "REQUEST_TIMEOUT_HEADER", "X-Request-Timeout"
+    )
+    REQUEST_TIMEOUT_MAX: float = float(os.getenv("REQUEST_TIMEOUT_MAX", "60"))
+
+    # Response compression: gzip, or brotli when the brotli package is
+    # installed and preferred by the client. Smaller bodies are sent as is.
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    # Admission control, per worker. Requests beyond ADMISSION_CONCURRENCY
+    # wait in a queue of ADMISSION_QUEUE_SIZE for up to ADMISSION_QUEUE_TIMEOUT
+    # seconds, then get 503. With a target latency the limit adapts (AIMD)
+    # between ADMISSION_MIN_CONCURRENCY and its configured value; 0 keeps it
+    # fixed. ADMISSION_LIMITS gives routes their own group as
+    # "[METHOD ]prefix:limit[:queue[:target]]"; a limit of 0 means unlimited.
+    # Routes bound by password hashing get a fixed limit, since bcrypt time
+    # says nothing about overload of the database.
+    ADMISSION_CONCURRENCY: int = int(os.getenv("ADMISSION_CONCURRENCY", "30"))
+    ADMISSION_QUEUE_SIZE: int = int(os.getenv("ADMISSION_QUEUE_SIZE", "100"))
+    ADMISSION_QUEUE_TIMEOUT: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "1"))
+    ADMISSION_TARGET_LATENCY: float = float(
+        os.getenv("ADMISSION_TARGET_LATENCY", "0.5")
+    )
+    ADMISSION_MIN_CONCURRENCY: int = int(os.getenv("ADMISSION_MIN_CONCURRENCY", "4"))
+    ADMISSION_LIMITS: str = os.getenv(
+        "ADMISSION_LIMITS",
+        "/metrics:0,/users/export:4:8:0,/users/bulk:2:4:0,POST /users/:16:64:0",
+    )
+    # Per-client token buckets by path prefix, "prefix:rate[:burst]" with rate
+    # in requests per second (e.g. "/users/bulk:0.2:2"); clients are told
+    # apart by RATE_LIMIT_KEY_HEADER, or by address when it is empty or missing
+    RATE_LIMITS: str = os.getenv("RATE_LIMITS", "")
+    RATE_LIMIT_KEY_HEADER: str = os.getenv("RATE_LIMIT_KEY_HEADER", "")
+
+    # Database connection pool
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # psycopg server-side prepare threshold; "none" disables prepared statements
+    DB_PREPARE_THRESHOLD: str = os.getenv("DB_PREPARE_THRESHOLD", "5")
+
+    # Read replicas: comma-separated async URLs; reads are spread over them
+    DATABASE_REPLICA_URLS: list[str] = [
+        url.strip()
+        for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+        if url.strip()
+    ]
+    # Clients are identified by this header (falling back to their address)
+    # and read from the primary for a while after their own writes
+    READ_YOUR_WRITES_HEADER: str = os.getenv("READ_YOUR_WRITES_HEADER", "X-Session-Id")
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = float(
+        os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", "5")
+    )
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+    REPLICA_EJECT_SECONDS: float = float(os.getenv("REPLICA_EJECT_SECONDS", "30"))
+    REPLICA_HEALTH_INTERVAL: float = float(os.getenv("REPLICA_HEALTH_INTERVAL", "5"))
+
+    # Retries of transient database errors inside a request: attempts, full
+    # jitter backoff bounds and the total time (capped by the request deadline)
+    DB_RETRY_ATTEMPTS: int = int(os.getenv("DB_RETRY_ATTEMPTS", "3"))
+    DB_RETRY_BASE_DELAY: float = float(os.getenv("DB_RETRY_BASE_DELAY", "0.05"))
+    DB_RETRY_MAX_DELAY: float = float(os.getenv("DB_RETRY_MAX_DELAY", "0.5"))
+    DB_RETRY_BUDGET: float = float(os.getenv("DB_RETRY_BUDGET", "2"))
+    # Circuit breaker: consecutive transient failures before failing fast,
+    # and seconds to stay open before letting a probe through
+    DB_BREAKER_THRESHOLD: int = int(os.getenv("DB_BREAKER_THRESHOLD", "5"))
+    DB_BREAKER_RESET_SECONDS: float = float(os.getenv("DB_BREAKER_RESET_SECONDS", "10"))
+
+    # Query instrumentation: slow-query log threshold and N+1 warning count
+    DB_SLOW_QUERY_MS: float = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+    DB_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "10"))
+
+    # Seconds a cached listing total stays valid (count_mode=cached)
+    COUNT_CACHE_TTL: float = float(os.getenv("COUNT_CACHE_TTL", "30"))
+
+    # Read-through entity cache: "memory", "redis" (needs CACHE_URL) or "none"
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory").lower()
+    CACHE_URL: str = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+    CACHE_MAXSIZE: int = int(os.getenv("CACHE_MAXSIZE", "10000"))
+    CACHE_TTL: float = float(os.getenv("CACHE_TTL", "60"))
+    CACHE_NEGATIVE_TTL: float = float(os.getenv("CACHE_NEGATIVE_TTL", "5"))
+
+    # Coalesce concurrent primary-key lookups into one IN query; 0 disables
+    LOOKUP_BATCH_WINDOW_MS: float = float(os.getenv("LOOKUP_BATCH_WINDOW_MS", "2"))
+    LOOKUP_BATCH_MAX_SIZE: int = int(os.getenv("LOOKUP_BATCH_MAX_SIZE", "100"))
+
+    # Rows per hash/insert/commit round in POST /users/bulk
+    BULK_IMPORT_CHUNK_SIZE: int = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", "1000"))
+
+    # Password hashing process pool
+    PASSWORD_HASH_WORKERS: int = int(
+        os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1))
+    )
+    PASSWORD_HASH_QUEUE_LIMIT: int = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "64"))
+
+    # Production launcher (python -m app.server)
+    WEB_HOST: str = os.getenv("WEB_HOST", "0.0.0.0")
+    WEB_PORT: int = int(os.getenv("WEB_PORT", "8000"))
+    WEB_WORKERS: int = int(os.getenv("WEB_WORKERS", str(os.cpu_count() or 1)))
+    # Recycle a worker after this many requests (+ random jitter); 0 disables
+    WEB_MAX_REQUESTS: int = int(os.getenv("WEB_MAX_REQUESTS", "10000"))
+    WEB_MAX_REQUESTS_JITTER: int = int(os.getenv("WEB_MAX_REQUESTS_JITTER", "1000"))
+    WEB_GRACEFUL_TIMEOUT: int = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+    # Prefill pools, build schemas, hash once and run hot SQL before serving
+    WARM_UP: bool = os.getenv("WARM_UP", "true").lower() == "true"
+
+    # Directory for per-worker metric files; must be shared by all workers
+    # and emptied before they start. Empty uses a private temp directory.
+    METRICS_DIR: str = os.getenv("METRICS_DIR", "")
 
 
 settings = Settings()
@@ -1,5 +1,9 @@
 import uuid
 from contextvars import ContextVar
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from app.db.instrumentation import QueryStats
 
 # Context variables
 correlation_id: ContextVar[uuid.UUID] = ContextVar(
@@ -9,3 +13,11 @@ correlation_id: ContextVar[uuid.UUID] = ContextVar(
 if_id: ContextVar[str] = ContextVar("if_id", default="IF-0000")
 
 request_id: ContextVar[str] = ContextVar("request_id", default="0000")
+
+# Database work of the current request, filled in by app.db.instrumentation
+query_stats: ContextVar[Optional["QueryStats"]] = ContextVar(
+    "query_stats", default=None
+)
+
+# time.monotonic() by which the current request must be answered, if bounded
+deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
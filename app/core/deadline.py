@@ -0,0 +1,50 @@
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.core.context import deadline
+
+
+class DeadlineExceededError(RuntimeError):
+    """The request ran out of its time budget."""
+
+
+def _parse_route_timeouts(raw: str) -> list[tuple[str, float]]:
+    timeouts = []
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        prefix, _, seconds = item.rpartition(":")
+        timeouts.append((prefix, float(seconds)))
+    # Longest prefix wins
+    return sorted(timeouts, key=lambda pair: len(pair[0]), reverse=True)
+
+
+ROUTE_TIMEOUTS = _parse_route_timeouts(settings.REQUEST_TIMEOUTS)
+
+
+def request_timeout(path: str, requested: Optional[str] = None) -> Optional[float]:
+    """Seconds a request on ``path`` may take, or None for no deadline.
+
+    ``requested`` is the client's timeout header; a valid positive value
+    replaces the route's budget, capped at REQUEST_TIMEOUT_MAX.
+    """
+    timeout = settings.REQUEST_TIMEOUT
+    for prefix, prefix_timeout in ROUTE_TIMEOUTS:
+        if path.startswith(prefix):
+            timeout = prefix_timeout
+            break
+    if requested:
+        try:
+            client_timeout = float(requested)
+        except ValueError:
+            client_timeout = 0.0
+        if client_timeout > 0:
+            timeout = min(client_timeout, settings.REQUEST_TIMEOUT_MAX)
+    return timeout if timeout > 0 else None
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current request's deadline, if it has one."""
+    expires_at = deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
@@ -1,3 +1,23 @@
+from enum import StrEnum
+
+
 class ResponseEnum:
     SUCCESS = "success"
     ERROR = "error"
+
+
+class CountMode(StrEnum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    CACHED = "cached"
+    NONE = "none"
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class SearchMode(StrEnum):
+    PREFIX = "prefix"
+    SUBSTRING = "substring"
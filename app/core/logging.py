@@ -1,13 +1,19 @@
+import atexit
+import copy
 import logging
+import queue
+import random
 import sys
 import os
 import time
 import uuid
 import json
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from app.core.context import correlation_id, if_id, request_id
+from starlette.datastructures import URL, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.context import correlation_id, if_id, query_stats, request_id
+from app.db.instrumentation import QueryStats
 from app.core.config import settings
+from logging.handlers import QueueHandler, QueueListener
 
 
 class OneLineExceptionFormatter(logging.Formatter):
@@ -32,43 +38,88 @@ class ContextFilter(logging.Filter):
             record.correlation_id = correlation_id.get()
         except LookupError:
             record.correlation_id = uuid.UUID("00000000-0000-0000-0000-000000000000")
-            
+
         try:
             record.if_id = str(if_id.get()).upper()
         except LookupError:
             record.if_id = "IF-0000"
-            
+
         try:
             record.request_id = str(request_id.get()).upper()
         except LookupError:
             record.request_id = "0000"
-            
+
         return True
 
 
-# common formatter
-formatter = OneLineExceptionFormatter(
-    "%(asctime)-15s - [SYSTEM] - [%(if_id)s] - %(name)-5s - %(request_id)s - %(levelname)s - [%(filename)s:%(lineno)s - %(funcName)s() ] - %(message)s"
-)
+class JsonLineFormatter(logging.Formatter):
+    """Formats each record as a single JSON object per line."""
 
-# root logger
-# We use a broad name to capture app logs. User requested "app.fastapi.project". 
-# Ensuring 'app' logs are captured.
-logger = logging.getLogger("app.fastapi.project")
-logger.setLevel(logging.DEBUG)
+    def format(self, record):
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "if_id": getattr(record, "if_id", None),
+            "request_id": getattr(record, "request_id", None),
+            "correlation_id": str(getattr(record, "correlation_id", "")),
+            "location": f"{record.filename}:{record.lineno}",
+            "func": record.funcName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Hands records to a background listener through a bounded queue.
+
+    With the "drop" policy a full queue discards the record (and counts it)
+    instead of stalling the event loop; "block" waits for room.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = "drop"):
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Only merge args here; full formatting happens on the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setFormatter(formatter)
 
-logger.addHandler(console_handler)
-logger.addFilter(ContextFilter())
+def build_queue_pipeline(
+    handlers, maxsize: int = 10000, overflow: str = "drop"
+) -> tuple[BoundedQueueHandler, QueueListener]:
+    log_queue = queue.Queue(maxsize=maxsize)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    return BoundedQueueHandler(log_queue, overflow), listener
 
-# sql logger
-sql_logger = logging.getLogger("sqlalchemy.engine.Engine")
-sql_logger.setLevel(logging.INFO)
 
-sql_logger.addHandler(console_handler)
-sql_logger.addFilter(ContextFilter())
+# common formatter
+if settings.LOG_JSON:
+    formatter = JsonLineFormatter()
+else:
+    formatter = OneLineExceptionFormatter(
+        "%(asctime)-15s - [SYSTEM] - [%(if_id)s] - %(name)-5s - %(request_id)s - %(levelname)s - [%(filename)s:%(lineno)s - %(funcName)s() ] - %(message)s"
+    )
+
+console_handler = logging.StreamHandler(sys.stdout)
+console_handler.setFormatter(formatter)
+output_handlers = [console_handler]
 
 # log to file if local/configured
 if settings.ENVIRONMENT.upper() == "LOCAL":
@@ -76,50 +127,124 @@ if settings.ENVIRONMENT.upper() == "LOCAL":
     log_dir = os.path.dirname(log_file_path)
     if log_dir:
         os.makedirs(log_dir, exist_ok=True)
-        
-    file_handler = logging.FileHandler(
-        log_file_path, "w", encoding="utf-8"
-    )
+
+    file_handler = logging.FileHandler(log_file_path, "w", encoding="utf-8")
     file_handler.setFormatter(formatter)
+    output_handlers.append(file_handler)
+
+# Formatting and I/O run on the listener thread, off the event loop
+queue_handler, queue_listener = build_queue_pipeline(
+    output_handlers,
+    maxsize=settings.LOG_QUEUE_SIZE,
+    overflow=settings.LOG_QUEUE_OVERFLOW,
+)
+queue_listener.start()
+atexit.register(queue_listener.stop)
+
+# root logger
+# We use a broad name to capture app logs. User requested "app.fastapi.project".
+# Ensuring 'app' logs are captured.
+logger = logging.getLogger("app.fastapi.project")
+logger.setLevel(settings.LOG_LEVEL)
+
+logger.addHandler(queue_handler)
+logger.addFilter(ContextFilter())
 
-    logger.addHandler(file_handler)
-    logger.addFilter(ContextFilter())
+# sql logger
+sql_logger = logging.getLogger("sqlalchemy.engine.Engine")
+sql_logger.setLevel(settings.SQL_LOG_LEVEL)
 
-    sql_logger.addHandler(file_handler)
-    sql_logger.addFilter(ContextFilter())
+sql_logger.addHandler(queue_handler)
+sql_logger.addFilter(ContextFilter())
 
 # stop delegate logs to root logger (avoid duplicate logs)
 sql_logger.propagate = False
 logger.propagate = False
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+def _parse_sample_rates(raw: str) -> list[tuple[str, float]]:
+    rates = []
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        prefix, _, rate = item.rpartition(":")
+        rates.append((prefix, float(rate)))
+    # Longest prefix wins
+    return sorted(rates, key=lambda pair: len(pair[0]), reverse=True)
+
+
+SAMPLE_RATES = _parse_sample_rates(settings.LOG_SAMPLE_RATES)
+
+
+def should_log_request(path: str) -> bool:
+    """Decide whether the access lines of a request on ``path`` are logged."""
+    rate = settings.LOG_SAMPLE_RATE
+    for prefix, prefix_rate in SAMPLE_RATES:
+        if path.startswith(prefix):
+            rate = prefix_rate
+            break
+    return rate >= 1 or random.random() < rate
+
+
+class RequestLoggingMiddleware:
+    """Sets the request's context variables and logs it with its DB stats.
+
+    The Server-Timing header goes out with the response start, so it only
+    counts database work done before then: the commit get_db runs after the
+    response has started is left out. The "Request finished" log line is
+    written at the end and includes it.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Set context variables
         req_id = str(uuid.uuid4())
         corr_id = uuid.uuid4()
-        
-        token_request_id = request_id.set(req_id[:8]) # Shorten for readability if desired, or keep full
+
+        # Shorten for readability if desired, or keep full
+        token_request_id = request_id.set(req_id[:8])
         token_correlation_id = correlation_id.set(corr_id)
-        token_if_id = if_id.set("IF-0001") # Example static/dynamic
+        token_if_id = if_id.set("IF-0001")  # Example static/dynamic
+        stats = QueryStats()
+        token_query_stats = query_stats.set(stats)
+
+        method = scope["method"]
+        url = URL(scope=scope)
+        status_code = 500
+        sampled = should_log_request(scope["path"])
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", stats.server_timing()
+                )
+            await send(message)
 
         start_time = time.perf_counter()
-        
+
         # Log Request
-        logger.info(f"Incoming request: {request.method} {request.url}")
+        if sampled:
+            logger.info(f"Incoming request: {method} {url}")
 
         try:
-            response = await call_next(request)
-            
+            await self.app(scope, receive, send_wrapper)
+
             process_time = time.perf_counter() - start_time
-            logger.info(
-                f"Request finished: {request.method} {request.url} - Status: {response.status_code} - Time: {process_time:.4f}s"
-            )
-            return response
+            # Server errors are always logged, sampled or not
+            if sampled or status_code >= 500:
+                logger.info(
+                    f"Request finished: {method} {url} - Status: {status_code} - Time: {process_time:.4f}s - {stats.summary()}"
+                )
         except Exception:
             process_time = time.perf_counter() - start_time
             logger.exception(
-                f"Request failed: {request.method} {request.url} - Time: {process_time:.4f}s"
+                f"Request failed: {method} {url} - Time: {process_time:.4f}s - {stats.summary()}"
             )
             raise
         finally:
@@ -127,3 +252,4 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             request_id.reset(token_request_id)
             correlation_id.reset(token_correlation_id)
             if_id.reset(token_if_id)
+            query_stats.reset(token_query_stats)
@@ -10,6 +10,7 @@ class MessageCode(StrEnum):
     USER_LIST_RETRIEVED = "user.list_retrieved"
     USER_UPDATED = "user.updated"
     USER_DELETED = "user.deleted"
+    USER_BULK_IMPORTED = "user.bulk_imported"
 
     # Success - Auth
     LOGIN_SUCCESS = "auth.login_success"
@@ -23,6 +24,11 @@ class MessageCode(StrEnum):
     NOT_FOUND = "common.not_found"
     INTERNAL_ERROR = "common.internal_error"
     VALIDATION_ERROR = "common.validation_error"
+    SERVICE_UNAVAILABLE = "common.service_unavailable"
+    REQUEST_TIMEOUT = "common.request_timeout"
+    TOO_MANY_REQUESTS = "common.too_many_requests"
+    INVALID_CURSOR = "common.invalid_cursor"
+    INVALID_FIELDS = "common.invalid_fields"
 
     # Error - User
     USER_NOT_FOUND = "user.not_found"
@@ -37,6 +43,7 @@ MESSAGES: Final[dict[str, dict[str, str]]] = {
         MessageCode.USER_LIST_RETRIEVED: "Lấy danh sách người dùng thành công",
         MessageCode.USER_UPDATED: "Cập nhật người dùng thành công",
         MessageCode.USER_DELETED: "Xóa người dùng thành công",
+        MessageCode.USER_BULK_IMPORTED: "Nhập danh sách người dùng hoàn tất",
         MessageCode.LOGIN_SUCCESS: "Đăng nhập thành công",
         MessageCode.LOGOUT_SUCCESS: "Đăng xuất thành công",
         # Error
@@ -46,6 +53,11 @@ MESSAGES: Final[dict[str, dict[str, str]]] = {
         MessageCode.NOT_FOUND: "Không tìm thấy tài nguyên",
         MessageCode.INTERNAL_ERROR: "Lỗi hệ thống, vui lòng thử lại sau",
         MessageCode.VALIDATION_ERROR: "Dữ liệu không hợp lệ",
+        MessageCode.SERVICE_UNAVAILABLE: "Hệ thống đang quá tải, vui lòng thử lại sau",
+        MessageCode.REQUEST_TIMEOUT: "Yêu cầu xử lý quá thời gian cho phép",
+        MessageCode.INVALID_CURSOR: "Con trỏ phân trang không hợp lệ",
+        MessageCode.INVALID_FIELDS: "Danh sách trường không hợp lệ",
+        MessageCode.TOO_MANY_REQUESTS: "Quá nhiều yêu cầu, vui lòng thử lại sau",
         MessageCode.USER_NOT_FOUND: "Không tìm thấy người dùng",
         MessageCode.USERNAME_EXISTS: "Tên người dùng đã tồn tại",
     },
@@ -55,6 +67,7 @@ MESSAGES: Final[dict[str, dict[str, str]]] = {
         MessageCode.USER_LIST_RETRIEVED: "User list retrieved successfully",
         MessageCode.USER_UPDATED: "User updated successfully",
         MessageCode.USER_DELETED: "User deleted successfully",
+        MessageCode.USER_BULK_IMPORTED: "User import finished",
         MessageCode.LOGIN_SUCCESS: "Login successful",
         MessageCode.LOGOUT_SUCCESS: "Logout successful",
         MessageCode.BAD_REQUEST: "Bad request",
@@ -63,6 +76,11 @@ MESSAGES: Final[dict[str, dict[str, str]]] = {
         MessageCode.NOT_FOUND: "Resource not found",
         MessageCode.INTERNAL_ERROR: "Internal server error",
         MessageCode.VALIDATION_ERROR: "Validation error",
+        MessageCode.SERVICE_UNAVAILABLE: "Service is busy, please try again later",
+        MessageCode.REQUEST_TIMEOUT: "The request took too long to process",
+        MessageCode.INVALID_CURSOR: "Invalid pagination cursor",
+        MessageCode.INVALID_FIELDS: "Invalid field list",
+        MessageCode.TOO_MANY_REQUESTS: "Too many requests, please retry later",
         MessageCode.USER_NOT_FOUND: "User not found",
         MessageCode.USERNAME_EXISTS: "Username already exists",
     },
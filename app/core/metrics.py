@@ -0,0 +1,451 @@
+import bisect
+import glob
+import json
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+# Latency buckets in seconds, upper bounds (inclusive)
+DEFAULT_BUCKETS: Sequence[float] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram of observed values, cumulative on snapshot."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = self.count
+        return {"buckets": cumulative, "count": self.count, "sum": self.sum}
+
+
+# ---------------------------------------------------------------------------
+# Prometheus exposition, aggregated across worker processes
+#
+# Each process writes its samples into its own memory-mapped file under
+# METRICS_DIR; /metrics sums the files of every worker. Recording is a dict
+# lookup plus an in-place float update, with no locks or syscalls.
+# ---------------------------------------------------------------------------
+
+_HEADER = struct.Struct("q")
+_VALUE = struct.Struct("d")
+
+
+class MmapValues:
+    """Append-only ``key -> float64`` table backed by a memory-mapped file.
+
+    Layout: an 8-byte used-size header, then entries of
+    ``[int32 key length][utf-8 key padded to 8 bytes][float64 value]``.
+    Only the owning process writes; readers just scan the entries.
+    """
+
+    def __init__(self, path: str, initial_size: int = 1 << 16):
+        self.path = path
+        self._file = open(path, "a+b")
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.truncate(initial_size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._used = _HEADER.unpack_from(self._map, 0)[0] or _HEADER.size
+        self._lock = threading.Lock()
+        self.offsets: Dict[str, int] = {
+            key: offset for key, _, offset in _scan(self._map)
+        }
+
+    def slot(self, key: str) -> int:
+        """Offset of the value for ``key``, allocating it on first use."""
+        offset = self.offsets.get(key)
+        if offset is not None:
+            return offset
+        with self._lock:
+            if key in self.offsets:
+                return self.offsets[key]
+            encoded = key.encode("utf-8")
+            padded = len(encoded) + (-(4 + len(encoded)) % 8)
+            entry_size = 4 + padded + _VALUE.size
+            while self._used + entry_size > len(self._map):
+                self._grow()
+            struct.pack_into(
+                f"i{padded}sd", self._map, self._used, len(encoded), encoded, 0.0
+            )
+            offset = self._used + 4 + padded
+            self._used += entry_size
+            # Publish the entry only once it is fully written
+            _HEADER.pack_into(self._map, 0, self._used)
+            self.offsets[key] = offset
+            return offset
+
+    def add(self, offset: int, amount: float) -> None:
+        _VALUE.pack_into(
+            self._map, offset, _VALUE.unpack_from(self._map, offset)[0] + amount
+        )
+
+    def set(self, offset: int, value: float) -> None:
+        _VALUE.pack_into(self._map, offset, value)
+
+    def get(self, offset: int) -> float:
+        return _VALUE.unpack_from(self._map, offset)[0]
+
+    def _grow(self) -> None:
+        size = len(self._map) * 2
+        self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+def _scan(data) -> Iterator[Tuple[str, float, int]]:
+    used = _HEADER.unpack_from(data, 0)[0]
+    position = _HEADER.size
+    while position < used:
+        length = struct.unpack_from("i", data, position)[0]
+        key = bytes(data[position + 4 : position + 4 + length]).decode("utf-8")
+        offset = position + 4 + length + (-(4 + length) % 8)
+        yield key, _VALUE.unpack_from(data, offset)[0], offset
+        position = offset + _VALUE.size
+
+
+def _read_file(path: str) -> List[Tuple[str, float]]:
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        return []
+    return [(key, value) for key, value, _ in _scan(data)]
+
+
+class _Child:
+    """One labelled series; holds its offsets so recording skips lookups."""
+
+    def __init__(self, metric: "_Metric", values: Tuple[str, ...]):
+        self._store = metric.registry.store(metric.kind)
+        self._offset = self._store.slot(metric.key(metric.name, values))
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._store.add(self._offset, amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._store.add(self._offset, -amount)
+
+    def set(self, value: float) -> None:
+        self._store.set(self._offset, value)
+
+
+class _HistogramChild:
+    def __init__(self, metric: "HistogramMetric", values: Tuple[str, ...]):
+        self._store = metric.registry.store(metric.kind)
+        self._buckets = metric.buckets
+        self._bucket_offsets = [
+            self._store.slot(
+                metric.key(f"{metric.name}_bucket", values, le=_format_bound(bound))
+            )
+            for bound in (*metric.buckets, math.inf)
+        ]
+        self._sum = self._store.slot(metric.key(f"{metric.name}_sum", values))
+        self._count = self._store.slot(metric.key(f"{metric.name}_count", values))
+
+    def observe(self, value: float) -> None:
+        store = self._store
+        store.add(self._bucket_offsets[bisect.bisect_left(self._buckets, value)], 1)
+        store.add(self._sum, value)
+        store.add(self._count, 1)
+
+
+class _Metric:
+    kind = "counter"
+    type_name = "counter"
+    child_class: type = _Child
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+    ):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        registry.register(self)
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self.child_class(self, values)
+        return child
+
+    def key(self, sample: str, values: Tuple[str, ...], **extra: str) -> str:
+        labels = list(zip(self.labelnames, values)) + list(extra.items())
+        return json.dumps([self.name, sample, labels])
+
+    def reset(self) -> None:
+        self._children.clear()
+
+
+class CounterMetric(_Metric):
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class GaugeMetric(_Metric):
+    """Per-process gauge; the exposed value is the sum over live workers."""
+
+    kind = "gauge"
+    type_name = "gauge"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class HistogramMetric(_Metric):
+    type_name = "histogram"
+    child_class = _HistogramChild
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(*args, **kwargs)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+
+class MetricsRegistry:
+    """Metric families of this process plus the files all workers share.
+
+    Counters and histograms of exited workers stay in the totals; gauge
+    files are removed by ``close()`` so they drop out with their worker.
+    """
+
+    KINDS = ("counter", "gauge")
+
+    def __init__(self, directory: Optional[str], process_id: Optional[int] = None):
+        self.directory = directory
+        self.process_id = process_id
+        self.metrics: Dict[str, _Metric] = {}
+        self._stores: Dict[str, MmapValues] = {}
+
+    def register(self, metric: _Metric) -> None:
+        self.metrics[metric.name] = metric
+
+    def store(self, kind: str) -> MmapValues:
+        store = self._stores.get(kind)
+        if store is None:
+            if self.directory is None:
+                # Created on first use so importing processes stay file-free
+                self.directory = tempfile.mkdtemp(prefix="app-metrics-")
+            os.makedirs(self.directory, exist_ok=True)
+            pid = self.process_id or os.getpid()
+            path = os.path.join(self.directory, f"{kind}_{pid}.db")
+            store = self._stores[kind] = MmapValues(path)
+        return store
+
+    def reset(self) -> None:
+        """Drop open files and cached series, e.g. in a freshly forked child."""
+        for store in self._stores.values():
+            store.close()
+        self._stores.clear()
+        for metric in self.metrics.values():
+            metric.reset()
+
+    def close(self) -> None:
+        gauges = self._stores.get("gauge")
+        self.reset()
+        if gauges is not None and os.path.exists(gauges.path):
+            os.remove(gauges.path)
+
+    def collect(self) -> Dict[str, Dict[Tuple[str, Tuple], float]]:
+        """Sum every worker's samples, grouped by metric family."""
+        families: Dict[str, Dict[Tuple[str, Tuple], float]] = {}
+        if self.directory is None:
+            return families
+        for kind in self.KINDS:
+            for path in glob.glob(os.path.join(self.directory, f"{kind}_*.db")):
+                try:
+                    samples = _read_file(path)
+                except FileNotFoundError:
+                    continue
+                for key, value in samples:
+                    name, sample, labels = json.loads(key)
+                    series = (sample, tuple(tuple(pair) for pair in labels))
+                    family = families.setdefault(name, {})
+                    family[series] = family.get(series, 0.0) + value
+        return families
+
+    def render(self) -> str:
+        """The Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        families = self.collect()
+        for name in sorted(families):
+            metric = self.metrics.get(name)
+            if metric is not None:
+                lines.append(f"# HELP {name} {metric.documentation}")
+                lines.append(f"# TYPE {name} {metric.type_name}")
+            samples = families[name]
+            if metric is not None and metric.type_name == "histogram":
+                samples = _cumulate_buckets(name, samples)
+            for (sample, labels), value in sorted(samples.items(), key=_sort_key):
+                lines.append(f"{sample}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _cumulate_buckets(name: str, samples: Dict) -> Dict:
+    cumulated = dict(samples)
+    series: Dict[Tuple, List[Tuple[float, Tuple]]] = {}
+    for sample, labels in samples:
+        if sample == f"{name}_bucket":
+            rest = tuple(pair for pair in labels if pair[0] != "le")
+            bound = float(dict(labels)["le"])
+            series.setdefault(rest, []).append((bound, (sample, labels)))
+    for buckets in series.values():
+        running = 0.0
+        for _, key in sorted(buckets):
+            running += samples[key]
+            cumulated[key] = running
+    return cumulated
+
+
+def _sort_key(item) -> Tuple:
+    (sample, labels), _ = item
+    bound = dict(labels).get("le")
+    return (sample, [pair for pair in labels if pair[0] != "le"], float(bound or 0))
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if math.isinf(bound) else repr(float(bound))
+
+
+def _format_labels(labels: Tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+registry = MetricsRegistry(settings.METRICS_DIR or None)
+# A forked worker must not keep writing into its parent's files
+os.register_at_fork(after_in_child=registry.reset)
+
+HTTP_REQUEST_DURATION = HistogramMetric(
+    registry,
+    "http_request_duration_seconds",
+    "Request latency by route template and status.",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = GaugeMetric(
+    registry, "http_requests_in_flight", "Requests currently being served."
+)
+HTTP_EXCEPTIONS = CounterMetric(
+    registry,
+    "http_exceptions_total",
+    "Exceptions turned into responses, by handler and exception type.",
+    ("handler", "exception"),
+)
+DB_POOL_CAPACITY = GaugeMetric(
+    registry,
+    "db_pool_capacity",
+    "Connections the pools may open (pool_size + max_overflow).",
+)
+DB_POOL_CHECKED_OUT = GaugeMetric(
+    registry, "db_pool_checked_out", "Connections currently checked out."
+)
+DB_POOL_WAIT = HistogramMetric(
+    registry, "db_pool_wait_seconds", "Time spent waiting for a pool connection."
+)
+DB_POOL_TIMEOUTS = CounterMetric(
+    registry, "db_pool_timeouts_total", "Pool checkouts that timed out."
+)
+DB_RETRIES = CounterMetric(
+    registry, "db_retries_total", "Statements retried after a transient error."
+)
+DB_BREAKER_REJECTIONS = CounterMetric(
+    registry,
+    "db_breaker_rejections_total",
+    "Database calls failed fast by the open circuit breaker.",
+)
+ADMISSION_LIMIT = GaugeMetric(
+    registry,
+    "admission_concurrency_limit",
+    "Current concurrency limit of each admission group.",
+    ("group",),
+)
+ADMISSION_IN_FLIGHT = GaugeMetric(
+    registry,
+    "admission_in_flight",
+    "Requests holding an admission slot.",
+    ("group",),
+)
+ADMISSION_QUEUED = GaugeMetric(
+    registry,
+    "admission_queued",
+    "Requests waiting for an admission slot.",
+    ("group",),
+)
+ADMISSION_QUEUE_WAIT = HistogramMetric(
+    registry,
+    "admission_queue_wait_seconds",
+    "Time spent queued for admission, by group.",
+    ("group",),
+)
+ADMISSION_REJECTIONS = CounterMetric(
+    registry,
+    "admission_rejections_total",
+    "Requests shed before reaching the application, by group and reason.",
+    ("group", "reason"),
+)
+PASSWORD_HASH_DURATION = HistogramMetric(
+    registry,
+    "password_hash_duration_seconds",
+    "bcrypt time per hashing pool job.",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
@@ -1,5 +1,15 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Sequence
+
 from passlib.context import CryptContext
 
+from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_DURATION
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -9,3 +19,130 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+# ====================== ASYNC (PROCESS POOL) ======================
+class HashQueueFullError(RuntimeError):
+    """Raised when too many hash jobs are already waiting on the pool."""
+
+
+@dataclass
+class HashPoolStats:
+    submitted: int = 0
+    completed: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+    hash_time_total: float = 0.0
+    hash_time_max: float = 0.0
+
+
+_executor: Optional[Executor] = None
+_stats = HashPoolStats()
+
+
+def _timed_hash(password: str) -> tuple[str, float, float]:
+    started = time.time()
+    hashed = pwd_context.hash(password)
+    return hashed, started, time.time()
+
+
+def _timed_hash_many(passwords: Sequence[str]) -> tuple[List[str], float, float]:
+    started = time.time()
+    hashed = [pwd_context.hash(password) for password in passwords]
+    return hashed, started, time.time()
+
+
+def _timed_verify(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, float, float]:
+    started = time.time()
+    ok = pwd_context.verify(plain_password, hashed_password)
+    return ok, started, time.time()
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        # spawn keeps worker processes free of the parent's threads and sockets
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def _run_in_pool(func, *args):
+    if _stats.in_flight >= settings.PASSWORD_HASH_QUEUE_LIMIT:
+        _stats.rejected += 1
+        raise HashQueueFullError(
+            f"Password hash queue is full ({_stats.in_flight} jobs pending)"
+        )
+
+    _stats.submitted += 1
+    _stats.in_flight += 1
+    submitted_at = time.time()
+    try:
+        loop = asyncio.get_running_loop()
+        result, started, finished = await loop.run_in_executor(
+            _get_executor(), func, *args
+        )
+    finally:
+        _stats.in_flight -= 1
+
+    queue_wait = max(started - submitted_at, 0.0)
+    hash_time = finished - started
+    _stats.completed += 1
+    _stats.queue_wait_total += queue_wait
+    _stats.queue_wait_max = max(_stats.queue_wait_max, queue_wait)
+    _stats.hash_time_total += hash_time
+    _stats.hash_time_max = max(_stats.hash_time_max, hash_time)
+    PASSWORD_HASH_DURATION.observe(hash_time)
+    return result
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_pool(_timed_hash, password)
+
+
+async def hash_passwords_async(passwords: Sequence[str]) -> List[str]:
+    """Hash a batch across all workers, one pool job per worker-sized slice."""
+    if not passwords:
+        return []
+    slices = settings.PASSWORD_HASH_WORKERS
+    size = -(-len(passwords) // slices)
+    results = await asyncio.gather(
+        *(
+            _run_in_pool(_timed_hash_many, passwords[i : i + size])
+            for i in range(0, len(passwords), size)
+        )
+    )
+    return [hashed for chunk in results for hashed in chunk]
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_pool(_timed_verify, plain_password, hashed_password)
+
+
+async def start_hash_pool() -> None:
+    """Spawn the hash workers and load bcrypt in each before serving traffic."""
+    executor = _get_executor()
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(
+        *(
+            loop.run_in_executor(executor, _timed_hash, "warm-up")
+            for _ in range(settings.PASSWORD_HASH_WORKERS)
+        )
+    )
+
+
+def shutdown_hash_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+def get_hash_pool_stats() -> dict:
+    return asdict(_stats)
@@ -1,8 +1,87 @@
-from sqlalchemy import create_engine
+from typing import Any, Dict
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import DB_POOL_CAPACITY
+from app.db.instrumentation import attach_query_listeners
+from app.db.pool import InstrumentedQueuePool, attach_pool_listeners, get_pool_stats
+from app.db.resilience import CircuitBreaker, attach_breaker
+from app.db.timeouts import attach_statement_timeouts
+from app.db.routing import Replica, SessionRouter
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _connect_args(url: str) -> Dict[str, Any]:
+    if not url.startswith("postgresql+psycopg"):
+        return {}
+    threshold = settings.DB_PREPARE_THRESHOLD
+    return {
+        "prepare_threshold": None if threshold.lower() == "none" else int(threshold)
+    }
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=_connect_args(url),
+    )
+    attach_pool_listeners(engine.pool)
+    attach_query_listeners(engine.sync_engine)
+    attach_statement_timeouts(engine.sync_engine)
+    attach_breaker(
+        engine.sync_engine,
+        CircuitBreaker(
+            threshold=settings.DB_BREAKER_THRESHOLD,
+            reset_seconds=settings.DB_BREAKER_RESET_SECONDS,
+        ),
+    )
+    DB_POOL_CAPACITY.inc(settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+    return engine
+
+
+def _session_factory(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+def _autocommit_session_factory(engine: AsyncEngine) -> async_sessionmaker:
+    # Shares the engine's pool; no BEGIN/COMMIT is sent on these sessions
+    return _session_factory(engine.execution_options(isolation_level="AUTOCOMMIT"))
+
+
+engine = _create_engine(settings.DATABASE_URL)
+AsyncSessionLocal = _session_factory(engine)
 Base = declarative_base()
+
+replica_engines = [_create_engine(url) for url in settings.DATABASE_REPLICA_URLS]
+session_router = SessionRouter(
+    AsyncSessionLocal,
+    [
+        Replica(
+            f"replica{i}",
+            replica_engine,
+            _session_factory(replica_engine),
+            _autocommit_session_factory(replica_engine),
+        )
+        for i, replica_engine in enumerate(replica_engines)
+    ],
+    primary_autocommit=_autocommit_session_factory(engine),
+    read_your_writes=settings.REPLICA_READ_YOUR_WRITES_SECONDS,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    eject_seconds=settings.REPLICA_EJECT_SECONDS,
+)
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Live statistics for the application connection pool."""
+    return get_pool_stats(engine.pool)
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections of the primary and every replica."""
+    for pooled in (engine, *replica_engines):
+        await pooled.dispose()
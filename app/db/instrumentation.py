@@ -0,0 +1,117 @@
+import logging
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.context import query_stats
+
+# Configured in app.core.logging; looked up by name to avoid an import cycle
+logger = logging.getLogger("app.fastapi.project")
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryStats:
+    """Database work attributed to one request."""
+
+    queries: int = 0
+    db_time: float = 0.0
+    pool_wait: float = 0.0
+    rows: int = 0
+    # BEGIN/COMMIT/ROLLBACK sent to the server (none in autocommit mode)
+    transaction_statements: int = 0
+    shapes: Counter = field(default_factory=Counter)
+
+    @property
+    def round_trips(self) -> int:
+        return self.queries + self.transaction_statements
+
+    def server_timing(self) -> str:
+        """Server-Timing value of the work so far; sent with the response
+        start, it leaves out the commit that follows."""
+        return (
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries", '
+            f"pool;dur={self.pool_wait * 1000:.1f}"
+        )
+
+    def summary(self) -> str:
+        return (
+            f"DB: {self.queries} queries {self.db_time:.4f}s - "
+            f"Round-trips: {self.round_trips} - "
+            f"Pool wait: {self.pool_wait:.4f}s - Rows: {self.rows}"
+        )
+
+
+def normalize_sql(statement: str) -> str:
+    """Reduce a statement to its shape: literals, placeholders and IN lists
+    collapse so repeated executions with different values compare equal."""
+    shape = _LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _IN_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def record_pool_wait(seconds: float) -> None:
+    stats = query_stats.get()
+    if stats is not None:
+        stats.pool_wait += seconds
+
+
+def attach_query_listeners(engine: Engine) -> None:
+    """Time every cursor execution on ``engine`` and attribute it, along with
+    transaction control statements, to the current request's QueryStats."""
+
+    def _transaction_statement(conn):
+        stats = query_stats.get()
+        if stats is None:
+            return
+        if conn.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+            stats.transaction_statements += 1
+
+    for name in ("begin", "commit", "rollback"):
+        event.listen(engine, name, _transaction_statement)
+
+    # Start times are keyed by execution context: a failed statement never
+    # reaches after_cursor_execute, so its entry is dropped in handle_error
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", {})[context] = time.perf_counter()
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        if context.connection is not None:
+            starts = context.connection.info.get("query_start", {})
+            starts.pop(context.execution_context, None)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop(context)
+        slow = elapsed * 1000 >= settings.DB_SLOW_QUERY_MS
+        stats = query_stats.get()
+        if stats is None and not slow:
+            return
+        shape = normalize_sql(statement)
+        if slow:
+            logger.warning(f"Slow query ({elapsed * 1000:.1f}ms): {shape}")
+        if stats is None:
+            return
+        stats.queries += 1
+        stats.db_time += elapsed
+        # Drivers report -1 when the count is unknown (e.g. sqlite SELECTs)
+        if cursor.rowcount > 0:
+            stats.rows += cursor.rowcount
+        stats.shapes[shape] += 1
+        if stats.shapes[shape] == settings.DB_N_PLUS_ONE_THRESHOLD + 1:
+            logger.warning(
+                f"Possible N+1: statement ran more than "
+                f"{settings.DB_N_PLUS_ONE_THRESHOLD} times in one request: {shape}"
+            )
@@ -0,0 +1,104 @@
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_TIMEOUTS,
+    DB_POOL_WAIT,
+    Histogram,
+)
+from app.db.instrumentation import record_pool_wait
+
+if TYPE_CHECKING:
+    from app.db.resilience import CircuitBreaker
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    checkins: int = 0
+    connects: int = 0
+    invalidations: int = 0
+    timeouts: int = 0
+    wait_time: Histogram = field(default_factory=Histogram)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        # Set by app.db.resilience.attach_breaker
+        self.breaker: Optional["CircuitBreaker"] = None
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep the counters going
+        pool = super().recreate()
+        pool.stats = self.stats
+        pool.breaker = self.breaker
+        return pool
+
+    def _do_get(self):
+        if self.breaker is not None:
+            # Fail fast instead of queueing for a database that is down
+            self.breaker.before_call()
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            DB_POOL_TIMEOUTS.inc()
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.stats.wait_time.observe(waited)
+            DB_POOL_WAIT.observe(waited)
+            record_pool_wait(waited)
+
+
+def attach_pool_listeners(pool: InstrumentedQueuePool) -> None:
+    """Count connection lifecycle events on ``pool`` into its stats."""
+    stats = pool.stats
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        stats.connects += 1
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.checkouts += 1
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        stats.checkins += 1
+        DB_POOL_CHECKED_OUT.dec()
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        stats.invalidations += 1
+
+
+def get_pool_stats(pool: InstrumentedQueuePool) -> Dict[str, Any]:
+    stats = pool.stats
+    breaker = pool.breaker.stats() if pool.breaker is not None else None
+    return {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "checkouts": stats.checkouts,
+        "checkins": stats.checkins,
+        "connects": stats.connects,
+        "invalidations": stats.invalidations,
+        "timeouts": stats.timeouts,
+        "wait_time": stats.wait_time.snapshot(),
+        "breaker": breaker,
+    }
@@ -0,0 +1,181 @@
+import logging
+import random
+import time
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from tenacity import AsyncRetrying, RetryCallState, retry_if_exception
+
+from app.core.config import settings
+from app.core.context import deadline
+from app.core.metrics import DB_BREAKER_REJECTIONS, DB_RETRIES
+
+logger = logging.getLogger("app.fastapi.project")
+
+# Postgres SQLSTATEs worth retrying besides the whole 08 (connection) class:
+# serialization failure, deadlock, lock timeout, too many connections and
+# the server shutting down or still starting up
+TRANSIENT_SQLSTATES = frozenset(
+    {"40001", "40P01", "55P03", "53300", "57P01", "57P02", "57P03"}
+)
+# SQLite primary result codes: BUSY, LOCKED, IOERR, CANTOPEN, PROTOCOL
+TRANSIENT_SQLITE_CODES = frozenset({5, 6, 10, 14, 15})
+
+
+class CircuitOpenError(RuntimeError):
+    """The database is failing; the call was rejected without trying it."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"database circuit open, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether running the same statement again may succeed.
+
+    Connection loss, pool exhaustion, deadlocks and serialization failures
+    are transient; constraint violations, bad SQL and cancelled statements
+    fail the same way every time.
+    """
+    if isinstance(error, exc.TimeoutError):
+        return True
+    if not isinstance(error, exc.DBAPIError):
+        return False
+    if error.connection_invalidated:
+        return True
+    orig = error.orig
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    if sqlstate:
+        return sqlstate.startswith("08") or sqlstate in TRANSIENT_SQLSTATES
+    sqlite_code = getattr(orig, "sqlite_errorcode", None)
+    if sqlite_code is not None:
+        # Extended codes carry the primary code in the low byte
+        return sqlite_code & 0xFF in TRANSIENT_SQLITE_CODES
+    # Other drivers give no code; trust the DBAPI exception class
+    return isinstance(error, (exc.OperationalError, exc.InterfaceError))
+
+
+class CircuitBreaker:
+    """Fails database calls fast while the database keeps failing.
+
+    ``threshold`` consecutive transient failures open the circuit. After
+    ``reset_seconds`` one probe call is let through (half-open): its
+    success closes the circuit, its failure opens it again. A probe that
+    never reports back frees its slot after another ``reset_seconds``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int = 5, reset_seconds: float = 10.0):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_started: Optional[float] = None
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless the call may go ahead."""
+        if self.state == self.CLOSED:
+            return
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            if now - self.opened_at < self.reset_seconds:
+                self._reject(self.opened_at + self.reset_seconds - now)
+            self.state = self.HALF_OPEN
+            self._probe_started = None
+        if (
+            self._probe_started is not None
+            and now - self._probe_started < self.reset_seconds
+        ):
+            self._reject(self._probe_started + self.reset_seconds - now)
+        self._probe_started = now
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info("Database circuit closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (
+            self.state == self.CLOSED and self.failures >= self.threshold
+        ):
+            logger.warning(
+                f"Database circuit opened after {self.failures} failures; "
+                f"failing fast for {self.reset_seconds:g}s"
+            )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._probe_started = None
+
+    def _reject(self, retry_after: float) -> None:
+        DB_BREAKER_REJECTIONS.inc()
+        raise CircuitOpenError(retry_after)
+
+    def stats(self) -> dict:
+        return {"state": self.state, "failures": self.failures}
+
+
+def attach_breaker(engine: Engine, breaker: CircuitBreaker) -> None:
+    """Feed statement outcomes on ``engine`` into ``breaker``.
+
+    The pool checks the breaker before handing out a connection, so an open
+    circuit rejects callers before they queue for one.
+    """
+    engine.pool.breaker = breaker
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _on_success(conn, cursor, statement, parameters, context, executemany):
+        breaker.record_success()
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        if is_transient(context.sqlalchemy_exception):
+            breaker.record_failure()
+
+
+def retrying(retryable: bool = True) -> AsyncRetrying:
+    """Retry loop for one statement, bounded by attempts and time.
+
+    Only transient errors are retried, with full-jitter exponential backoff
+    slept on the event loop. No retry starts once its sleep would cross
+    DB_RETRY_BUDGET or the request deadline, whichever comes first. Pass
+    ``retryable=False`` when a rollback would lose earlier work of the
+    transaction, so the error is raised at once.
+    """
+    give_up_at = time.monotonic() + settings.DB_RETRY_BUDGET
+    request_deadline = deadline.get()
+    if request_deadline is not None:
+        give_up_at = min(give_up_at, request_deadline)
+    delays = []
+
+    def stop(retry_state: RetryCallState) -> bool:
+        if not retryable or retry_state.attempt_number >= settings.DB_RETRY_ATTEMPTS:
+            return True
+        cap = settings.DB_RETRY_BASE_DELAY * 2 ** (retry_state.attempt_number - 1)
+        delays.append(random.uniform(0, min(cap, settings.DB_RETRY_MAX_DELAY)))
+        return time.monotonic() + delays[-1] >= give_up_at
+
+    def wait(retry_state: RetryCallState) -> float:
+        return delays[-1]
+
+    def before_sleep(retry_state: RetryCallState) -> None:
+        DB_RETRIES.inc()
+        logger.warning(
+            f"DB retry {retry_state.attempt_number}/{settings.DB_RETRY_ATTEMPTS} "
+            f"in {delays[-1] * 1000:.0f}ms | error: {retry_state.outcome.exception()}"
+        )
+
+    return AsyncRetrying(
+        stop=stop,
+        wait=wait,
+        retry=retry_if_exception(is_transient),
+        before_sleep=before_sleep,
+        reraise=True,
+    )
@@ -0,0 +1,146 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, async_sessionmaker
+
+logger = logging.getLogger("app.fastapi.project")
+
+# Replay lag in seconds; 0 when the replica has applied everything it received
+POSTGRES_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+async def measure_lag(conn: AsyncConnection) -> float:
+    """Replication lag of the database behind ``conn``, in seconds.
+
+    Only Postgres streaming replicas report lag; other backends just have
+    to answer a trivial query.
+    """
+    if conn.dialect.name == "postgresql":
+        return float((await conn.execute(POSTGRES_LAG_SQL)).scalar() or 0)
+    await conn.execute(text("SELECT 1"))
+    return 0.0
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    session_factory: async_sessionmaker
+    # Same pool in autocommit mode, for read-only requests
+    autocommit_factory: Optional[async_sessionmaker] = None
+    lag: float = 0.0
+    # Monotonic time before which the replica is not routed to
+    ejected_until: float = 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+
+class SessionRouter:
+    """Picks the session factory for a request.
+
+    Reads go round-robin to available replicas, writes to the primary.
+    A client whose last write was less than ``read_your_writes`` seconds ago
+    reads from the primary too, so it never sees a replica that is behind
+    its own change. Replicas that fail or lag more than ``max_lag`` are
+    ejected for ``eject_seconds`` and re-admitted by a passing health check.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replicas: Sequence[Replica] = (),
+        primary_autocommit: Optional[async_sessionmaker] = None,
+        read_your_writes: float = 5.0,
+        max_lag: float = 10.0,
+        eject_seconds: float = 30.0,
+        max_tracked_clients: int = 10000,
+    ):
+        self.primary = primary
+        self.primary_autocommit = primary_autocommit
+        self.replicas = list(replicas)
+        self.read_your_writes = read_your_writes
+        self.max_lag = max_lag
+        self.eject_seconds = eject_seconds
+        self.max_tracked_clients = max_tracked_clients
+        self._next = itertools.count()
+        self._last_write: "OrderedDict[str, float]" = OrderedDict()
+
+    def route(
+        self,
+        read_only: bool,
+        client_key: Optional[str] = None,
+        autocommit: bool = False,
+    ) -> Tuple[async_sessionmaker, Optional[Replica]]:
+        """The session factory to use, and the replica behind it if any.
+
+        ``autocommit`` picks the autocommit variant of the chosen pool when
+        one is configured; only ask for it when the request does not write.
+        """
+        available = [replica for replica in self.replicas if replica.available]
+        if not read_only or not available or self.wrote_recently(client_key):
+            if autocommit and self.primary_autocommit is not None:
+                return self.primary_autocommit, None
+            return self.primary, None
+        replica = available[next(self._next) % len(available)]
+        if autocommit and replica.autocommit_factory is not None:
+            return replica.autocommit_factory, replica
+        return replica.session_factory, replica
+
+    def record_write(self, client_key: Optional[str]) -> None:
+        if client_key is None or not self.replicas:
+            return
+        self._last_write[client_key] = time.monotonic()
+        self._last_write.move_to_end(client_key)
+        while len(self._last_write) > self.max_tracked_clients:
+            self._last_write.popitem(last=False)
+
+    def wrote_recently(self, client_key: Optional[str]) -> bool:
+        written_at = self._last_write.get(client_key) if client_key else None
+        return (
+            written_at is not None
+            and time.monotonic() - written_at < self.read_your_writes
+        )
+
+    def eject(self, replica: Replica, reason: str) -> None:
+        if replica.available:
+            logger.warning(f"Ejecting replica {replica.name}: {reason}")
+        replica.ejected_until = time.monotonic() + self.eject_seconds
+
+    async def check_health(self, timeout: float = 2.0) -> None:
+        """Probe every replica, ejecting failed or lagging ones and
+        re-admitting those that recovered."""
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    replica.lag = await asyncio.wait_for(measure_lag(conn), timeout)
+            except Exception as e:
+                self.eject(replica, f"health check failed: {e}")
+                continue
+            if replica.lag > self.max_lag:
+                self.eject(replica, f"lag {replica.lag:.1f}s")
+            elif not replica.available:
+                logger.info(f"Replica {replica.name} re-admitted")
+                replica.ejected_until = 0.0
+
+    async def run_health_checks(self, interval: float) -> None:
+        while True:
+            await self.check_health()
+            await asyncio.sleep(interval)
+
+    def stats(self) -> List[dict]:
+        return [
+            {"name": r.name, "available": r.available, "lag": r.lag}
+            for r in self.replicas
+        ]
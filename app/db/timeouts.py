@@ -0,0 +1,82 @@
+import asyncio
+import math
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.deadline import DeadlineExceededError, remaining
+
+# Postgres query_canceled, also what an expired statement_timeout raises
+QUERY_CANCELED = "57014"
+SQLITE_INTERRUPT = 9
+# Keys in the pooled connection's info dict
+_SESSION_TIMEOUT = "statement_timeout_set"
+_INTERRUPT_TIMER = "interrupt_timer"
+
+
+def _is_cancellation(error: BaseException) -> bool:
+    sqlstate = getattr(error, "sqlstate", None) or getattr(error, "pgcode", None)
+    if sqlstate:
+        return sqlstate == QUERY_CANCELED
+    return getattr(error, "sqlite_errorcode", None) == SQLITE_INTERRUPT
+
+
+def _cancel_timer(conn) -> None:
+    timer = conn.info.pop(_INTERRUPT_TIMER, None)
+    if timer is not None:
+        timer.cancel()
+
+
+def _set_statement_timeout(conn, cursor, context, budget) -> None:
+    if budget is None:
+        # A session-level timeout left by an earlier request must not linger
+        if conn.info.pop(_SESSION_TIMEOUT, False):
+            cursor.execute("SET statement_timeout = DEFAULT")
+        return
+    timeout_ms = max(math.ceil(budget * 1000), 1)
+    if context.execution_options.get("isolation_level") == "AUTOCOMMIT":
+        # SET LOCAL does nothing outside a transaction
+        conn.info[_SESSION_TIMEOUT] = True
+        cursor.execute(f"SET statement_timeout = {timeout_ms}")
+    else:
+        cursor.execute(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
+def attach_statement_timeouts(engine: Engine) -> None:
+    """Bound every statement on ``engine`` by the request's remaining budget.
+
+    Postgres gets a statement_timeout: SET LOCAL inside a transaction, a
+    session setting (reset once a statement runs without a deadline) on
+    autocommit connections. SQLite has no such setting, so a timer on the
+    event loop interrupts the running statement instead. Either way the
+    cancelled statement surfaces as DeadlineExceededError.
+    """
+    dialect = engine.dialect.name
+    # Only async SQLite drivers leave the loop free to fire the interrupt
+    interruptible = dialect == "sqlite" and engine.dialect.is_async
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _apply_budget(conn, cursor, statement, parameters, context, executemany):
+        budget = remaining()
+        if budget is not None and budget <= 0:
+            raise DeadlineExceededError("request deadline passed before the query")
+        if dialect == "postgresql":
+            _set_statement_timeout(conn, cursor, context, budget)
+        elif interruptible and budget is not None:
+            # aiosqlite runs queries on its own thread; its interrupt() just
+            # calls this, and sqlite3_interrupt is safe from any thread
+            sqlite_connection = conn.connection.driver_connection._conn
+            conn.info[_INTERRUPT_TIMER] = asyncio.get_running_loop().call_later(
+                budget, sqlite_connection.interrupt
+            )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _clear_timer(conn, cursor, statement, parameters, context, executemany):
+        _cancel_timer(conn)
+
+    @event.listens_for(engine, "handle_error")
+    def _translate_cancel(context):
+        if context.connection is not None:
+            _cancel_timer(context.connection)
+        if remaining() is not None and _is_cancellation(context.original_exception):
+            return DeadlineExceededError("query cancelled at the request deadline")
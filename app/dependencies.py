@@ -1,14 +1,61 @@
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
-
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+from typing import AsyncIterator, Optional
+from fastapi import Request
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.database import session_router
+from app.repositories.entity_cache import invalidate_committed
+
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def client_key(request: Request) -> Optional[str]:
+    """Identity used for read-your-writes routing."""
+    key = request.headers.get(settings.READ_YOUR_WRITES_HEADER)
+    if key:
+        return key
+    return request.client.host if request.client else None
+
+
+async def get_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Session on a replica for safe-method requests, the primary otherwise."""
+    read_only = request.method in READ_ONLY_METHODS
+    key = client_key(request)
+    session_factory, replica = session_router.route(read_only, key)
+    async with session_factory() as db:
+        try:
+            yield db
+            if not read_only:
+                session_router.record_write(key)
+            await db.commit()
+            await invalidate_committed(db)
+        except Exception as e:
+            await db.rollback()
+            if replica is not None and isinstance(
+                e, (OperationalError, InterfaceError)
+            ):
+                session_router.eject(replica, str(e))
+            raise
+
+
+async def get_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Session for handlers that only read.
+
+    It runs in autocommit mode, so no BEGIN/COMMIT round-trips are sent and
+    nothing is committed at the end; the connection is only checked out if
+    the handler actually queries (a cache hit never touches the pool).
+    Writes made through it would be committed immediately, so never use it
+    for a handler that writes.
+    """
+    session_factory, replica = session_router.route(
+        True, client_key(request), autocommit=True
+    )
+    async with session_factory() as db:
+        try:
+            yield db
+        except Exception as e:
+            if replica is not None and isinstance(
+                e, (OperationalError, InterfaceError)
+            ):
+                session_router.eject(replica, str(e))
+            raise
@@ -1,31 +1,89 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
-from app.routers import users
+from app.routers import metrics, users
 from app.middleware.exception_handler import (
     http_exception_handler,
     validation_exception_handler,
+    circuit_open_exception_handler,
+    deadline_exceeded_exception_handler,
+    pool_timeout_exception_handler,
     general_exception_handler,
 )
+from app.middleware.admission import AdmissionMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.deadline import DeadlineMiddleware
 from app.middleware.language import LanguageMiddleware
+from app.middleware.metrics import MetricsMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.core.logging import logger, RequestLoggingMiddleware
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.database import dispose_engines, session_router
+from app.core.deadline import DeadlineExceededError
+from app.db.resilience import CircuitOpenError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.core.security import start_hash_pool, shutdown_hash_pool
+from app.warmup import warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.WARM_UP:
+        # Nothing is served until every worker has its pool, schemas,
+        # bcrypt workers and hot statements ready
+        timings = await warm_up()
+        logger.info(
+            "Worker warmed up: "
+            + ", ".join(f"{step} {seconds:.3f}s" for step, seconds in timings.items())
+        )
+    else:
+        await start_hash_pool()
+        logger.info("Password hash pool started")
+    health_checks = None
+    if session_router.replicas:
+        health_checks = asyncio.create_task(
+            session_router.run_health_checks(settings.REPLICA_HEALTH_INTERVAL)
+        )
+    yield
+    if health_checks is not None:
+        health_checks.cancel()
+    shutdown_hash_pool()
+    await dispose_engines()
+    # Drop this worker's gauges from the shared totals
+    registry.close()
+
 
 app = FastAPI(
     title="Backend Service",
     version="1.0.0",
     openapi_url="/openapi.json",
     docs_url="/docs",
+    lifespan=lifespan,
 )
 
+# Innermost: time spent queued counts against the deadline, and shed
+# requests are still logged and measured
+app.add_middleware(AdmissionMiddleware)
+# Inside logging and metrics, so timed-out requests are still recorded
+app.add_middleware(DeadlineMiddleware)
 # Setup logging
 app.add_middleware(RequestLoggingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.add_middleware(LanguageMiddleware)
+# Outermost, so everything the app sends passes through it
+app.add_middleware(CompressionMiddleware)
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
+app.add_exception_handler(CircuitOpenError, circuit_open_exception_handler)
+app.add_exception_handler(DeadlineExceededError, deadline_exceeded_exception_handler)
+app.add_exception_handler(PoolTimeoutError, pool_timeout_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
 # === Include routers ===
 app.include_router(users.router)
+app.include_router(metrics.router)
@@ -0,0 +1,87 @@
+import time
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.admission import (
+    OverloadedError,
+    RateLimitedError,
+    build_concurrency_limiters,
+    build_rate_limiters,
+    for_path,
+)
+from app.core.config import settings
+from app.middleware.exception_handler import (
+    overloaded_exception_handler,
+    rate_limited_exception_handler,
+)
+
+# Statuses that mean the request hit an overloaded dependency
+OVERLOAD_STATUSES = (503, 504)
+
+
+class AdmissionMiddleware:
+    """Sheds load before it reaches the database pool and the hash workers.
+
+    The most specific matching route (a path prefix, optionally with a
+    method) picks a per-client rate limiter (429 when its bucket is empty)
+    and a concurrency limiter (503 when its queue is full or the wait runs
+    out). Both answers carry Retry-After.
+    """
+
+    def __init__(self, app: ASGIApp, limiters=None, rate_limiters=None):
+        self.app = app
+        self.limiters = build_concurrency_limiters() if limiters is None else limiters
+        self.rate_limiters = (
+            build_rate_limiters() if rate_limiters is None else rate_limiters
+        )
+        self.key_header = settings.RATE_LIMIT_KEY_HEADER.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path, method = scope["path"], scope["method"]
+        limiter = for_path(self.limiters, path, method)
+        try:
+            rate_limiter = for_path(self.rate_limiters, path, method)
+            if rate_limiter is not None:
+                rate_limiter.acquire(self._client(scope))
+            if limiter is not None:
+                await limiter.acquire()
+        except RateLimitedError as e:
+            response = await rate_limited_exception_handler(Request(scope), e)
+            await response(scope, receive, send)
+            return
+        except OverloadedError as e:
+            response = await overloaded_exception_handler(Request(scope), e)
+            await response(scope, receive, send)
+            return
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            limiter.release(
+                time.monotonic() - started, status_code in OVERLOAD_STATUSES
+            )
+
+    def _client(self, scope: Scope) -> str:
+        if self.key_header:
+            for name, value in scope["headers"]:
+                if name == self.key_header:
+                    return value.decode("latin-1")
+        client = scope.get("client")
+        return client[0] if client else ""
@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.context import deadline
+from app.core.deadline import DeadlineExceededError, request_timeout
+from app.middleware.exception_handler import deadline_exceeded_exception_handler
+
+# Statement timeouts expire at the deadline itself; the request is only
+# cancelled a little later so a query can fail cleanly on its connection
+CANCEL_GRACE = 0.05
+
+
+class DeadlineMiddleware:
+    """Gives each request a deadline and answers 504 when it runs out.
+
+    The deadline is published in ``app.core.context.deadline`` for the
+    database layer; if the handler is still running at the deadline it is
+    cancelled. A response that has already started cannot be replaced, so
+    it is cut off instead.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.header = settings.REQUEST_TIMEOUT_HEADER.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = None
+        for name, value in scope["headers"]:
+            if name == self.header:
+                requested = value.decode("latin-1")
+                break
+        timeout = request_timeout(scope["path"], requested)
+        if timeout is None:
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        token = deadline.set(time.monotonic() + timeout)
+        try:
+            async with asyncio.timeout(timeout + CANCEL_GRACE) as cancel_scope:
+                await self.app(scope, receive, send_wrapper)
+        except TimeoutError:
+            if not cancel_scope.expired() or response_started:
+                raise
+            response = await deadline_exceeded_exception_handler(
+                Request(scope), DeadlineExceededError("request cancelled")
+            )
+            await response(scope, receive, send)
+        finally:
+            deadline.reset(token)
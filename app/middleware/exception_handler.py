@@ -1,3 +1,5 @@
+import math
+from typing import Optional
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
@@ -5,9 +7,12 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.middleware.response import build_response
 from app.core.messages import get_message, MessageCode
 from app.core.enum import ResponseEnum
+from app.core.metrics import HTTP_EXCEPTIONS
+from app.core.deadline import DeadlineExceededError
 
 
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    HTTP_EXCEPTIONS.labels("http", type(exc).__name__).inc()
     return JSONResponse(
         status_code=exc.status_code,
         content=build_response(
@@ -20,6 +25,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    HTTP_EXCEPTIONS.labels("validation", type(exc).__name__).inc()
     return JSONResponse(
         status_code=422,
         content=build_response(
@@ -32,7 +38,64 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+def retry_later_handler(
+    source: str,
+    status_code: int,
+    message_code: MessageCode,
+    retry_after: Optional[float] = None,
+):
+    """Handler answering ``status_code`` with a Retry-After header: the
+    exception's own ``retry_after`` unless a fixed one is given."""
+
+    async def handler(request: Request, exc: Exception):
+        HTTP_EXCEPTIONS.labels(source, type(exc).__name__).inc()
+        seconds = exc.retry_after if retry_after is None else retry_after
+        return JSONResponse(
+            status_code=status_code,
+            headers={"Retry-After": str(math.ceil(seconds))},
+            content=build_response(
+                request=request,
+                code=status_code,
+                status=ResponseEnum.ERROR,
+                message=get_message(message_code, request.state.lang),
+            ).model_dump(exclude_none=True),
+        )
+
+    return handler
+
+
+circuit_open_exception_handler = retry_later_handler(
+    "circuit_open", 503, MessageCode.SERVICE_UNAVAILABLE
+)
+rate_limited_exception_handler = retry_later_handler(
+    "rate_limited", 429, MessageCode.TOO_MANY_REQUESTS
+)
+overloaded_exception_handler = retry_later_handler(
+    "overloaded", 503, MessageCode.SERVICE_UNAVAILABLE
+)
+# Every connection stayed busy for DB_POOL_TIMEOUT: overload, not a bug
+pool_timeout_exception_handler = retry_later_handler(
+    "pool_timeout", 503, MessageCode.SERVICE_UNAVAILABLE, retry_after=1
+)
+
+
+async def deadline_exceeded_exception_handler(
+    request: Request, exc: DeadlineExceededError
+):
+    HTTP_EXCEPTIONS.labels("deadline", type(exc).__name__).inc()
+    return JSONResponse(
+        status_code=504,
+        content=build_response(
+            request=request,
+            code=504,
+            status=ResponseEnum.ERROR,
+            message=get_message(MessageCode.REQUEST_TIMEOUT, request.state.lang),
+        ).model_dump(exclude_none=True),
+    )
+
+
 async def general_exception_handler(request: Request, exc: Exception):
+    HTTP_EXCEPTIONS.labels("general", type(exc).__name__).inc()
     return JSONResponse(
         status_code=500,
         content=build_response(
@@ -1,10 +1,20 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 
-class LanguageMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        lang = request.headers.get("lang", "vi")  # default: vi
-        request.state.lang = lang
-        response = await call_next(request)
-        return response
+class LanguageMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        lang = "vi"  # default: vi
+        for name, value in scope["headers"]:
+            if name == b"lang":
+                lang = value.decode("latin-1")
+                break
+        # request.state is backed by scope["state"]
+        scope.setdefault("state", {})["lang"] = lang
+        await self.app(scope, receive, send)
@@ -1,10 +1,19 @@
 from fastapi import Request
-from datetime import datetime
+from fastapi.responses import Response
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
 from typing import Any, Optional, List, Dict
+import hashlib
+from pydantic import TypeAdapter
 from app.schemas.response import APIResponse
 from app.core.enum import ResponseEnum
 
 
+def _utc_timestamp() -> str:
+    return f"{datetime.utcnow().isoformat(timespec='seconds')}Z"
+
+
 def build_response(
     request: Optional[Request] = None,
     *,
@@ -23,5 +32,109 @@ def build_response(
         errors=errors,
         meta=meta,
         url=str(request.url) if request else None,
-        timestamp=f"{datetime.utcnow().isoformat(timespec='seconds')}Z",
+        timestamp=_utc_timestamp(),
+    )
+
+
+class EnvelopeResponse(Response):
+    """JSON response whose body is an already-serialized envelope."""
+
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def envelope_adapter(data_type: Any) -> TypeAdapter:
+    """Compiled validator/serializer for ``APIResponse[data_type]``."""
+    return TypeAdapter(APIResponse[data_type])
+
+
+def build_json_response(
+    request: Optional[Request] = None,
+    *,
+    adapter: TypeAdapter,
+    data: Any = None,
+    message: Optional[str] = None,
+    code: int = 200,
+    status: str = ResponseEnum.SUCCESS,
+    errors: Optional[List[Dict[str, Any]]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> EnvelopeResponse:
+    """Same envelope as ``build_response``, but validated once (reading ORM
+    attributes directly) and dumped straight to JSON bytes, so FastAPI does
+    not re-validate it against the route's response_model."""
+    envelope = adapter.validate_python(
+        {
+            "code": code,
+            "status": status,
+            "message": message,
+            "data": data,
+            "errors": errors,
+            "meta": meta,
+            "url": str(request.url) if request else None,
+            "timestamp": _utc_timestamp(),
+        },
+        from_attributes=True,
     )
+    return EnvelopeResponse(
+        content=adapter.dump_json(envelope), status_code=code, headers=headers
+    )
+
+
+def _utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _version_part(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return _utc(value).isoformat()
+    if isinstance(value, (list, tuple)):
+        return [_version_part(item) for item in value]
+    return value
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over the values a representation is derived from.
+
+    Weak, because envelopes carry their own timestamp and may be compressed
+    differently, so equal tags only promise the same data.
+    """
+    digest = hashlib.blake2b(
+        repr(_version_part(parts)).encode(), digest_size=16
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def validator_headers(
+    etag: str, last_modified: Optional[datetime] = None
+) -> Dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+    return headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime] = None
+) -> bool:
+    """Whether the client's copy is current (RFC 9110 section 13.2.2):
+    If-None-Match by weak comparison, else If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have whole seconds
+    return _utc(last_modified).replace(microsecond=0) <= _utc(since)
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
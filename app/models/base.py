@@ -1,8 +1,18 @@
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy import DateTime, String, func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import now
 from datetime import datetime
 
 
+@compiles(now, "sqlite")
+def _sqlite_now(element, compiler, **kw):
+    # CURRENT_TIMESTAMP has no fraction ("... HH:MM:SS"), while SQLAlchemy
+    # writes and binds datetimes as "... HH:MM:SS.ffffff". Text comparison
+    # of the two forms breaks keyset cursors, so defaults use the long form.
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
 class Base(DeclarativeBase):
     __abstract__ = True
 
@@ -1,9 +1,65 @@
-from sqlalchemy import Column, String
+from sqlalchemy import DDL, Column, Index, String, event
 from app.models.base import Base
 
+# SQLite stand-in for the pg_trgm index: an external-content FTS5 table over
+# u_username with a case-sensitive trigram tokenizer, kept in sync by triggers
+USERNAME_FTS_TABLE = "users_username_fts"
+USERNAME_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {USERNAME_FTS_TABLE} USING fts5("
+    "u_username, content='users', content_rowid='rowid', "
+    "tokenize='trigram case_sensitive 1')",
+    f"CREATE TRIGGER IF NOT EXISTS users_fts_insert AFTER INSERT ON users BEGIN "
+    f"INSERT INTO {USERNAME_FTS_TABLE}(rowid, u_username) "
+    "VALUES (new.rowid, new.u_username); END",
+    f"CREATE TRIGGER IF NOT EXISTS users_fts_delete AFTER DELETE ON users BEGIN "
+    f"INSERT INTO {USERNAME_FTS_TABLE}({USERNAME_FTS_TABLE}, rowid, u_username) "
+    "VALUES ('delete', old.rowid, old.u_username); END",
+    f"CREATE TRIGGER IF NOT EXISTS users_fts_update "
+    f"AFTER UPDATE OF u_username ON users BEGIN "
+    f"INSERT INTO {USERNAME_FTS_TABLE}({USERNAME_FTS_TABLE}, rowid, u_username) "
+    "VALUES ('delete', old.rowid, old.u_username); "
+    f"INSERT INTO {USERNAME_FTS_TABLE}(rowid, u_username) "
+    "VALUES (new.rowid, new.u_username); END",
+    # Indexes rows that were already in the table
+    f"INSERT INTO {USERNAME_FTS_TABLE}({USERNAME_FTS_TABLE}) VALUES ('rebuild')",
+)
+
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Backs keyset pagination ordered by (created_at, u_id)
+        Index("idx_users_created_at_uid", "created_at", "u_id"),
+        # Username search: byte-wise prefix matching and ordering ...
+        Index(
+            "idx_users_username_pattern",
+            "u_username",
+            postgresql_ops={"u_username": "text_pattern_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # ... and substring matching through trigrams
+        Index(
+            "idx_users_username_trgm",
+            "u_username",
+            postgresql_using="gin",
+            postgresql_ops={"u_username": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
     u_id = Column(String, primary_key=True, index=True)
     u_username = Column(String, unique=True, index=True)
     u_password = Column(String)
+
+
+event.listen(
+    User.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+for statement in USERNAME_FTS_DDL:
+    event.listen(
+        User.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    User.__table__,
+    "after_drop",
+    DDL(f"DROP TABLE IF EXISTS {USERNAME_FTS_TABLE}").execute_if(dialect="sqlite"),
+)
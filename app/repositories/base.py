@@ -1,155 +1,692 @@
-from typing import Any, Dict, List, Optional, Type, TypeVar, Generic, Sequence
-from sqlalchemy.orm import Session
-from sqlalchemy import select, update, delete, insert, func
-from sqlalchemy.exc import SQLAlchemyError
-from pydantic import BaseModel
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Generic,
+    Sequence,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    bindparam,
+    column as column_clause,
+    delete,
+    func,
+    insert,
+    select,
+    text,
+    tuple_,
+    update,
+    values as values_clause,
 )
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import load_only
+from pydantic import BaseModel
 from loguru import logger
 import math
+from app.core.enum import CountMode
+from app.db.resilience import retrying
+from app.repositories.batch_loader import build_batch_loader
+from app.repositories.count_cache import count_cache
+from app.repositories.entity_cache import EntityCache, defer_invalidation
+from app.repositories.pagination import (
+    NEXT,
+    PREV,
+    column_python_type,
+    decode_cursor,
+    encode_cursor,
+)
+from datetime import datetime
 
 T = TypeVar("T")
 
-RETRY_CONFIG = dict(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=1, max=10),
-    retry=retry_if_exception_type(SQLAlchemyError),
-    reraise=True,
-    before_sleep=lambda retry_state: logger.warning(
-        f"DB retry {retry_state.attempt_number}/3 | error: {retry_state.outcome.exception()}"
-    ),
-)
-
 
 class BaseRepository(Generic[T]):
+    # Columns used for keyset pagination; falls back to the primary key
+    keyset_columns: Sequence = ()
+    # Read-through cache behind get_by_id; None disables caching
+    entity_cache: Optional[EntityCache] = None
+    # Coalesce concurrent get_by_id misses into batched IN queries
+    batch_lookups: bool = False
+
     def __init__(self, model: Type[T]):
         self.model = model
+        self.primary_key = model.__table__.c[model.get_primary_key()]
+        self.batch_loader = (
+            build_batch_loader(self._load_batch) if self.batch_lookups else None
+        )
 
-    @retry(**RETRY_CONFIG)
-    def _execute(self, db: Session, stmt):
-        try:
-            result = db.execute(stmt)
-            db.flush()
-            return result
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Database error in {self.model.__name__}: {e}")
-            raise
+    async def _execute(self, db: AsyncSession, stmt, params=None):
+        # The rollback below discards the whole transaction, so a retry is
+        # only safe when this statement is the first thing in it
+        retryable = not db.in_transaction()
+        async for attempt in retrying(retryable):
+            with attempt:
+                try:
+                    result = await db.execute(stmt, params)
+                    await db.flush()
+                except Exception as e:
+                    await db.rollback()
+                    logger.error(f"Database error in {self.model.__name__}: {e}")
+                    raise
+        return result
 
     # ====================== CREATE ======================
-    def create(self, db: Session, data: Dict[str, Any]) -> T:
+    async def create(self, db: AsyncSession, data: Dict[str, Any]) -> T:
         stmt = insert(self.model).values(**data).returning(self.model)
-        result = self._execute(db, stmt)
-        return result.scalar_one()
+        result = await self._execute(db, stmt)
+        instance = result.scalar_one()
+        self._invalidate_counts(db)
+        await self._invalidate_entities(db, self._id_of(instance))
+        return instance
 
-    def bulk_create(self, db: Session, data: List[Dict[str, Any]]) -> None:
+    async def bulk_create(
+        self,
+        db: AsyncSession,
+        data: List[Dict[str, Any]],
+        chunk_size: int = 1000,
+        use_copy: bool = True,
+    ) -> int:
+        """Insert rows in chunks and return how many were written.
+
+        On Postgres with psycopg each chunk is sent with COPY; elsewhere it
+        is an executemany, which SQLAlchemy batches into multi-row VALUES.
+        """
         if not data:
-            return
-        stmt = insert(self.model).values(data)
-        self._execute(db, stmt)
+            return 0
+        copy = use_copy and self._supports_copy(db)
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start : start + chunk_size]
+            if copy:
+                await self._copy_rows(db, chunk)
+            else:
+                await self._execute(db, insert(self.model), chunk)
+        self._invalidate_counts(db)
+        await self._invalidate_entities(
+            db,
+            *(
+                row[self.primary_key.name]
+                for row in data
+                if self.primary_key.name in row
+            ),
+        )
+        return len(data)
+
+    async def _copy_rows(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        columns = list(rows[0])
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        sql = f'COPY "{self.model.__tablename__}" ({column_list}) FROM STDIN'
+        try:
+            connection = await db.connection()
+            raw = await connection.get_raw_connection()
+            async with raw.driver_connection.cursor() as cursor:
+                async with cursor.copy(sql) as copy:
+                    for row in rows:
+                        await copy.write_row([row.get(column) for column in columns])
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"COPY error in {self.model.__name__}: {e}")
+            # The raw cursor raises driver exceptions; wrap them the way
+            # SQLAlchemy would, so callers can catch e.g. IntegrityError
+            dbapi = db.get_bind().dialect.loaded_dbapi
+            if isinstance(e, dbapi.Error):
+                raise DBAPIError.instance(sql, None, e, dbapi.Error) from e
+            raise
+
+    @staticmethod
+    def _supports_copy(db: AsyncSession) -> bool:
+        dialect = db.get_bind().dialect
+        return dialect.name == "postgresql" and dialect.driver == "psycopg"
 
     # ====================== READ ======================
-    def find_one_by_conditions(self, db: Session, **conditions) -> Optional[T]:
-        stmt = select(self.model).filter_by(**conditions).limit(1)
-        result = db.execute(stmt)
+    async def get_by_id(self, db: AsyncSession, id_value: Any) -> Optional[T]:
+        """Primary-key lookup, read through ``entity_cache`` when configured.
+
+        Cached and batched results are detached snapshots; load the row with
+        a find_* method before modifying it.
+        """
+        if self.entity_cache is None:
+            row = await self._load_row(db, id_value)
+        else:
+            row = await self.entity_cache.get_or_load(
+                self._cache_key(id_value), lambda: self._load_row(db, id_value)
+            )
+        return None if row is None else self._from_row(row)
+
+    async def find_many_by_ids(
+        self,
+        db: AsyncSession,
+        id_values: Sequence[Any],
+        chunk_size: int = 500,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[T]:
+        """Fetch rows by primary key with chunked IN lists, in input order.
+
+        Missing ids are skipped and duplicates collapse to one row.
+        """
+        id_values = list(dict.fromkeys(id_values))
+        found: Dict[Any, T] = {}
+        for start in range(0, len(id_values), chunk_size):
+            chunk = id_values[start : start + chunk_size]
+            stmt = self._select(fields).where(self.primary_key.in_(chunk))
+            result = await db.execute(stmt)
+            for instance in result.scalars():
+                found[self._id_of(instance)] = instance
+        return [found[id_value] for id_value in id_values if id_value in found]
+
+    async def find_one_by_conditions(
+        self, db: AsyncSession, fields: Optional[Sequence[str]] = None, **conditions
+    ) -> Optional[T]:
+        stmt = self._select(fields).filter_by(**conditions).limit(1)
+        result = await db.execute(stmt)
         return result.scalar_one_or_none()
 
-    def find_by_conditions(self, db: Session, **conditions) -> List[T]:
+    async def find_by_conditions(self, db: AsyncSession, **conditions) -> List[T]:
         stmt = select(self.model).filter_by(**conditions)
-        result = db.execute(stmt)
+        result = await db.execute(stmt)
         return list(result.scalars().all())
 
-    def find_by_field(self, db: Session, **conditions) -> Optional[T]:
+    async def find_by_field(self, db: AsyncSession, **conditions) -> Optional[T]:
         stmt = select(self.model).filter_by(**conditions).limit(1)
-        result = db.execute(stmt)
+        result = await db.execute(stmt)
         return result.scalar_one_or_none()
 
-    def find_all(
+    async def find_all(
         self,
-        db: Session,
+        db: AsyncSession,
         conditions: Optional[Dict[str, Any]] = None,
         order_by=None,
         offset: Optional[int] = None,
         limit: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[T]:
-        stmt = select(self.model)
+        stmt = self._select(fields)
         if conditions:
             stmt = stmt.filter_by(**conditions)
-        if order_by:
-            stmt = stmt.order_by(order_by)
+        stmt = self._apply_order_by(stmt, order_by)
         if offset is not None:
             stmt = stmt.offset(offset)
         if limit is not None:
             stmt = stmt.limit(limit)
-        result = db.execute(stmt)
+        result = await db.execute(stmt)
         return list(result.scalars().all())
 
-    def count(self, db: Session, conditions: Optional[Dict[str, Any]] = None) -> int:
+    async def count(
+        self, db: AsyncSession, conditions: Optional[Dict[str, Any]] = None
+    ) -> int:
         stmt = select(func.count()).select_from(self.model)
         if conditions:
             stmt = stmt.filter_by(**conditions)
-        result = db.execute(stmt)
+        result = await db.execute(stmt)
         return result.scalar_one()
 
-    def paginate(
+    async def estimate_count(
+        self, db: AsyncSession, conditions: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Row count from planner statistics; exact when filtered or unsupported."""
+        if conditions:
+            return await self.count(db, conditions)
+
+        table = self.model.__tablename__
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            result = await db.execute(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"
+                ),
+                {"t": table},
+            )
+            estimate = result.scalar_one_or_none()
+            # reltuples is -1 until the table has been vacuumed or analyzed
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+        elif dialect == "sqlite":
+            # max(rowid) is an index lookup; it over-counts only after deletes
+            result = await db.execute(text(f'SELECT max(rowid) FROM "{table}"'))
+            return result.scalar_one() or 0
+        return await self.count(db, conditions)
+
+    async def cached_count(
+        self, db: AsyncSession, conditions: Optional[Dict[str, Any]] = None
+    ) -> int:
+        key = count_cache.key(self.model.__tablename__, conditions)
+        total = count_cache.get(key)
+        if total is None:
+            generation = count_cache.generation(self.model.__tablename__)
+            total = await self.count(db, conditions)
+            count_cache.set(key, total, generation)
+        return total
+
+    async def paginate(
         self,
-        db: Session,
+        db: AsyncSession,
         page: int = 1,
         per_page: int = 20,
         conditions: Optional[Dict[str, Any]] = None,
         order_by=None,
+        count_mode: CountMode = CountMode.EXACT,
+        fields: Optional[Sequence[str]] = None,
+        total: Optional[int] = None,
     ) -> Dict[str, Any]:
-        total = self.count(db, conditions)
-        items = self.find_all(
+        # A caller that already counted (e.g. via page_versions) passes it in
+        if total is None:
+            total = await self._total(db, conditions, count_mode)
+
+        # One extra row tells us whether a next page exists without the total
+        items = await self.find_all(
             db,
             conditions=conditions,
             order_by=order_by,
             offset=(page - 1) * per_page,
-            limit=per_page,
+            limit=per_page + 1,
+            fields=fields,
         )
+        has_next = len(items) > per_page
 
-        total_pages = math.ceil(total / per_page) if total > 0 else 1
+        if total is None:
+            total_pages = None
+        else:
+            total_pages = math.ceil(total / per_page) if total > 0 else 1
 
         return {
-            "items": items,
+            "items": items[:per_page],
             "total": total,
             "page": page,
             "per_page": per_page,
             "pages": total_pages,
-            "has_next": page < total_pages,
+            "has_next": has_next,
+            "has_prev": page > 1,
+            "count_mode": count_mode,
+        }
+
+    async def page_versions(
+        self,
+        db: AsyncSession,
+        page: int = 1,
+        per_page: int = 20,
+        conditions: Optional[Dict[str, Any]] = None,
+        order_by=None,
+        count_mode: CountMode = CountMode.EXACT,
+    ) -> Dict[str, Any]:
+        """The page ``paginate`` would return, reduced to (primary key,
+        updated_at) per row: enough to validate a client's cached copy
+        without loading the rows."""
+        total = await self._total(db, conditions, count_mode)
+        stmt = select(self.primary_key, self.model.updated_at)
+        if conditions:
+            stmt = stmt.filter_by(**conditions)
+        stmt = self._apply_order_by(stmt, order_by)
+        stmt = stmt.offset((page - 1) * per_page).limit(per_page + 1)
+        versions = [tuple(row) for row in (await db.execute(stmt)).all()]
+        return {
+            "versions": versions[:per_page],
+            "total": total,
+            "has_next": len(versions) > per_page,
             "has_prev": page > 1,
         }
 
+    async def _total(
+        self,
+        db: AsyncSession,
+        conditions: Optional[Dict[str, Any]],
+        count_mode: CountMode,
+    ) -> Optional[int]:
+        if count_mode == CountMode.ESTIMATE:
+            return await self.estimate_count(db, conditions)
+        if count_mode == CountMode.CACHED:
+            return await self.cached_count(db, conditions)
+        if count_mode == CountMode.NONE:
+            return None
+        return await self.count(db, conditions)
+
+    async def paginate_keyset(
+        self,
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        conditions: Optional[Dict[str, Any]] = None,
+        key_columns: Optional[Sequence] = None,
+        descending: bool = True,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """Seek-based pagination: each page starts right after the cursor row,
+        so the cost does not grow with how deep the client has paged."""
+        columns = self._keyset(key_columns)
+        direction = NEXT
+        stmt = self._select(fields, *columns)
+        if conditions:
+            stmt = stmt.filter_by(**conditions)
+
+        scan_desc = descending
+        if cursor:
+            values, direction = decode_cursor(cursor, columns)
+            # Walking backwards flips both the comparison and the sort order
+            scan_desc = descending if direction == NEXT else not descending
+            key, bound = tuple_(*columns), tuple_(*values)
+            stmt = stmt.where(key < bound if scan_desc else key > bound)
+
+        stmt = stmt.order_by(*(c.desc() if scan_desc else c.asc() for c in columns))
+        stmt = stmt.limit(per_page + 1)
+        result = await db.execute(stmt)
+        items = list(result.scalars().all())
+
+        has_more = len(items) > per_page
+        items = items[:per_page]
+        if direction == PREV:
+            items.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, cursor is not None
+        has_next = has_next and bool(items)
+        has_prev = has_prev and bool(items)
+
+        return {
+            "items": items,
+            "per_page": per_page,
+            "has_next": has_next,
+            "has_prev": has_prev,
+            "next_cursor": (
+                self.build_cursor(items[-1], NEXT, columns) if has_next else None
+            ),
+            "prev_cursor": (
+                self.build_cursor(items[0], PREV, columns) if has_prev else None
+            ),
+        }
+
+    async def stream(
+        self,
+        db: AsyncSession,
+        conditions: Optional[Dict[str, Any]] = None,
+        filters: Sequence = (),
+        order_by=None,
+        columns: Optional[Sequence] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Any]]:
+        """Iterate over matching rows in batches through a server-side cursor.
+
+        Only ``batch_size`` rows are buffered at a time, and the next batch is
+        fetched only when the consumer asks for it. With ``columns`` the
+        batches hold row mappings instead of ORM instances.
+        """
+        stmt = select(*columns) if columns else select(self.model)
+        if conditions:
+            stmt = stmt.filter_by(**conditions)
+        if filters:
+            stmt = stmt.where(*filters)
+        stmt = self._apply_order_by(stmt, order_by)
+        stmt = stmt.execution_options(yield_per=batch_size)
+
+        result = await db.stream(stmt)
+        rows = result.mappings() if columns else result.scalars()
+        async for batch in rows.partitions():
+            yield batch
+
+    def build_cursor(
+        self, instance: T, direction: str, key_columns: Optional[Sequence] = None
+    ) -> str:
+        columns = self._keyset(key_columns)
+        return encode_cursor([getattr(instance, c.key) for c in columns], direction)
+
+    @staticmethod
+    def _group_by_keys(data: List[Dict[str, Any]]) -> List[tuple]:
+        """Split rows by their set of keys so each group fits one statement."""
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for row in data:
+            groups.setdefault(tuple(row), []).append(row)
+        return list(groups.items())
+
+    def _select(self, fields: Optional[Sequence[str]] = None, *required):
+        """``select(model)``, or with ``fields`` one loading only those columns.
+
+        The primary key, the keyset columns and any ``required`` columns are
+        always loaded, since identity and cursors need them. Reading any
+        other attribute of the result raises instead of lazy-loading it.
+        """
+        stmt = select(self.model)
+        if not fields:
+            return stmt
+        attributes = self.model.__mapper__.column_attrs
+        unknown = [name for name in fields if name not in attributes]
+        if unknown:
+            raise ValueError(f"Unknown {self.model.__name__} columns: {unknown}")
+        keys = dict.fromkeys(
+            [
+                self.primary_key.key,
+                *(column.key for column in self._keyset()),
+                *(column.key for column in required),
+                *fields,
+            ]
+        )
+        columns = [getattr(self.model, key) for key in keys]
+        return stmt.options(load_only(*columns, raiseload=True))
+
+    @staticmethod
+    def _apply_order_by(stmt, order_by):
+        if order_by is None:
+            return stmt
+        if isinstance(order_by, (list, tuple)):
+            return stmt.order_by(*order_by)
+        return stmt.order_by(order_by)
+
+    async def _load_row(self, db: AsyncSession, id_value: Any) -> Optional[dict]:
+        # A session inside a transaction may hold writes the batch's own
+        # session would not see, so it reads for itself
+        if self.batch_loader is not None and not db.in_transaction():
+            return await self.batch_loader.load(db.bind, id_value)
+        instance = await self.find_one_by_conditions(
+            db, **{self.primary_key.key: id_value}
+        )
+        return None if instance is None else instance.to_dict()
+
+    async def _load_rows(
+        self, db: AsyncSession, id_values: List[Any]
+    ) -> Dict[Any, dict]:
+        # Rows go back as dicts so no caller holds another session's instances
+        instances = await self.find_many_by_ids(db, id_values)
+        return {self._id_of(instance): instance.to_dict() for instance in instances}
+
+    async def _load_batch(self, bind, id_values: List[Any]) -> Dict[Any, dict]:
+        # Merged lookups of several requests get a short-lived session of
+        # their own on the engine those requests were routed to
+        async with AsyncSession(bind=bind, expire_on_commit=False) as db:
+            return await self._load_rows(db, id_values)
+
+    def _invalidate_counts(self, db: AsyncSession) -> None:
+        table = self.model.__tablename__
+        count_cache.invalidate(table)
+        # As with entities: a count taken before the commit must not linger
+        defer_invalidation(db, count_cache, table)
+
+    async def _invalidate_entities(self, db: AsyncSession, *id_values: Any) -> None:
+        if self.entity_cache is None:
+            return
+        for id_value in id_values:
+            key = self._cache_key(id_value)
+            await self.entity_cache.invalidate(key)
+            # Until the transaction commits, a concurrent read can cache the
+            # old row again; get_db drops the key once more after the commit
+            defer_invalidation(db, self.entity_cache, key)
+
+    def _cache_key(self, id_value: Any) -> str:
+        return f"{self.model.__tablename__}:{id_value}"
+
+    def _id_of(self, instance: T) -> Any:
+        return getattr(instance, self.primary_key.key)
+
+    def _from_row(self, row: Dict[str, Any]) -> T:
+        values = {}
+        for column in self.model.__table__.columns:
+            value = row.get(column.name)
+            # Shared backends round-trip through JSON, which flattens datetimes
+            if isinstance(value, str) and column_python_type(column) is datetime:
+                value = datetime.fromisoformat(value)
+            values[column.key] = value
+        return self.model(**values)
+
+    def _keyset(self, key_columns: Optional[Sequence] = None) -> list:
+        return list(
+            key_columns
+            or self.keyset_columns
+            or self.model.__table__.primary_key.columns
+        )
+
     # ====================== UPDATE ======================
-    def update(self, db: Session, instance: T, data: Dict[str, Any]) -> T:
+    async def update(self, db: AsyncSession, instance: T, data: Dict[str, Any]) -> T:
         for key, value in data.items():
             setattr(instance, key, value)
-        db.flush()
+        await db.flush()
+        await db.refresh(instance)
+        await self._invalidate_entities(db, self._id_of(instance))
         return instance
 
-    def update_by_id(
-        self, db: Session, id_value: Any, data: Dict[str, Any]
+    async def update_by_id(
+        self, db: AsyncSession, id_value: Any, data: Dict[str, Any]
     ) -> Optional[T]:
         stmt = (
             update(self.model)
-            .where(self.model.id == id_value)
+            .where(self.primary_key == id_value)
             .values(**data)
             .returning(self.model)
         )
-        result = self._execute(db, stmt)
+        result = await self._execute(db, stmt)
+        await self._invalidate_entities(db, id_value)
         return result.scalar_one_or_none()
 
+    async def bulk_update(
+        self, db: AsyncSession, data: List[Dict[str, Any]], chunk_size: int = 1000
+    ) -> int:
+        """Update rows by primary key without loading them; returns rows changed.
+
+        Each dict holds the primary key plus the columns to set. On Postgres a
+        chunk is one UPDATE ... FROM (VALUES ...) join; elsewhere it is an
+        executemany of a single parameterized UPDATE.
+        """
+        table = self.model.__table__
+        pk_name = self.primary_key.name
+        on_postgres = db.get_bind().dialect.name == "postgresql"
+        changed = 0
+        for keys, rows in self._group_by_keys(data):
+            names = [name for name in keys if name != pk_name]
+            if not names:
+                continue
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start : start + chunk_size]
+                if on_postgres:
+                    source = values_clause(
+                        *(column_clause(name, table.c[name].type) for name in keys),
+                        name="v",
+                    ).data([tuple(row[name] for name in keys) for row in chunk])
+                    stmt = (
+                        update(table)
+                        .where(self.primary_key == source.c[pk_name])
+                        .values({name: source.c[name] for name in names})
+                    )
+                    result = await self._execute(db, stmt)
+                else:
+                    # bind names must not clash with the column names being set
+                    stmt = (
+                        update(table)
+                        .where(self.primary_key == bindparam("_pk"))
+                        .values({name: bindparam(f"_{name}") for name in names})
+                    )
+                    params = [
+                        {f"_{name}": row[name] for name in keys} | {"_pk": row[pk_name]}
+                        for row in chunk
+                    ]
+                    result = await self._execute(db, stmt, params)
+                changed += result.rowcount
+        await self._invalidate_entities(db, *(row[pk_name] for row in data))
+        return changed
+
+    async def upsert(
+        self,
+        db: AsyncSession,
+        data: List[Dict[str, Any]],
+        conflict_columns: Optional[Sequence[str]] = None,
+        update_columns: Optional[Sequence[str]] = None,
+        chunk_size: int = 500,
+    ) -> int:
+        """INSERT ... ON CONFLICT in multi-row chunks; returns rows written.
+
+        Conflicts are matched on ``conflict_columns`` (default: the primary
+        key). Conflicting rows get ``update_columns`` (default: every other
+        column supplied) from the new values; an empty list means skip them.
+        """
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            dialect_insert = postgresql.insert
+        elif dialect == "sqlite":
+            dialect_insert = sqlite.insert
+        else:
+            raise NotImplementedError(f"upsert is not supported on {dialect}")
+
+        table = self.model.__table__
+        conflict = list(conflict_columns or [self.primary_key.name])
+        written = 0
+        for keys, rows in self._group_by_keys(data):
+            if update_columns is None:
+                names = [name for name in keys if name not in conflict]
+            else:
+                names = list(update_columns)
+            for start in range(0, len(rows), chunk_size):
+                stmt = dialect_insert(table).values(rows[start : start + chunk_size])
+                if names:
+                    set_ = {name: stmt.excluded[name] for name in names}
+                    # ON CONFLICT DO UPDATE does not fire column onupdate defaults
+                    for col in table.columns:
+                        if col.onupdate is not None and col.name not in set_:
+                            if col.onupdate.is_clause_element:
+                                set_[col.name] = col.onupdate.arg
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=conflict, set_=set_
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=conflict)
+                result = await self._execute(db, stmt)
+                written += result.rowcount
+        self._invalidate_counts(db)
+        await self._invalidate_entities(
+            db,
+            *(
+                row[self.primary_key.name]
+                for row in data
+                if self.primary_key.name in row
+            ),
+        )
+        return written
+
     # ====================== DELETE ======================
-    def delete(self, db: Session, instance: T) -> None:
-        db.delete(instance)
+    async def delete(self, db: AsyncSession, instance: T) -> None:
+        await db.delete(instance)
+        self._invalidate_counts(db)
+        await self._invalidate_entities(db, self._id_of(instance))
 
-    def delete_by_id(self, db: Session, id_value: Any) -> bool:
+    async def delete_by_id(self, db: AsyncSession, id_value: Any) -> bool:
         stmt = (
-            delete(self.model).where(self.model.id == id_value).returning(self.model.id)
+            delete(self.model)
+            .where(self.primary_key == id_value)
+            .returning(self.primary_key)
         )
-        result = self._execute(db, stmt)
-        return result.scalar_one() is not None
+        result = await self._execute(db, stmt)
+        self._invalidate_counts(db)
+        await self._invalidate_entities(db, id_value)
+        return result.scalar_one_or_none() is not None
+
+    async def bulk_delete_by_ids(
+        self, db: AsyncSession, id_values: Sequence[Any], chunk_size: int = 500
+    ) -> int:
+        """Delete by primary key with chunked IN lists; returns rows deleted."""
+        id_values = list(id_values)
+        deleted = 0
+        for start in range(0, len(id_values), chunk_size):
+            chunk = id_values[start : start + chunk_size]
+            stmt = delete(self.model.__table__).where(self.primary_key.in_(chunk))
+            result = await self._execute(db, stmt)
+            deleted += result.rowcount
+        self._invalidate_counts(db)
+        await self._invalidate_entities(db, *id_values)
+        return deleted
@@ -0,0 +1,95 @@
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+LoadMany = Callable[[Any, List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+
+class BatchLoader:
+    """DataLoader-style coalescer: single-key loads issued within ``window``
+    seconds are merged into one ``load_many`` call and fanned back out.
+
+    Loads are merged per ``group`` (the engine the callers' sessions are
+    bound to, so routing to a replica or the primary is kept), and
+    ``load_many`` receives that group to open a session of its own. Batches
+    run in an empty context, so no caller's deadline, replica choice or
+    query stats apply to a query that serves several requests.
+    """
+
+    def __init__(self, load_many: LoadMany, window: float, max_batch_size: int):
+        self.load_many = load_many
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.keys_loaded = 0
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+        # group -> key -> future of the batch being collected for it
+        self._pending: Dict[Any, Dict[Hashable, asyncio.Future]] = {}
+        self._timers: Dict[Any, asyncio.TimerHandle] = {}
+
+    async def load(self, group, key: Hashable) -> Any:
+        pending = self._pending.setdefault(group, {})
+        future = pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            pending[key] = future
+            if len(pending) == 1:
+                self._timers[group] = asyncio.get_running_loop().call_later(
+                    self.window,
+                    self._dispatch,
+                    group,
+                    context=contextvars.Context(),
+                )
+            if len(pending) >= self.max_batch_size:
+                self._dispatch(group)
+        return await asyncio.shield(future)
+
+    def _dispatch(self, group) -> None:
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(group, None)
+        if batch:
+            asyncio.get_running_loop().create_task(
+                self._run(group, batch), context=contextvars.Context()
+            )
+
+    async def _run(self, group, batch: Dict[Hashable, asyncio.Future]) -> None:
+        self.batches += 1
+        self.keys_loaded += len(batch)
+        self.batch_size.observe(len(batch))
+        try:
+            results = await self.load_many(group, list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark retrieved so unawaited futures don't log a warning
+                    future.exception()
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "keys_loaded": self.keys_loaded,
+            "batch_size": self.batch_size.snapshot(),
+        }
+
+
+def build_batch_loader(load_many: LoadMany) -> Optional[BatchLoader]:
+    """Build a loader from settings; a window of 0 disables coalescing."""
+    if settings.LOOKUP_BATCH_WINDOW_MS <= 0:
+        return None
+    return BatchLoader(
+        load_many,
+        window=settings.LOOKUP_BATCH_WINDOW_MS / 1000,
+        max_batch_size=settings.LOOKUP_BATCH_MAX_SIZE,
+    )
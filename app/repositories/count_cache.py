@@ -0,0 +1,50 @@
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+CacheKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+class CountCache:
+    """TTL-memoized row counts, keyed by table name and filter conditions."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[CacheKey, Tuple[float, int]] = {}
+        # Bumped by invalidate(); a count taken under an older generation
+        # may predate a write and is not stored
+        self._generations: Dict[str, int] = {}
+
+    @staticmethod
+    def key(table: str, conditions: Optional[Dict[str, Any]] = None) -> CacheKey:
+        return table, tuple(sorted((conditions or {}).items()))
+
+    def get(self, key: CacheKey) -> Optional[int]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def generation(self, table: str) -> int:
+        return self._generations.get(table, 0)
+
+    def set(self, key: CacheKey, value: int, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation(key[0]):
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, table: str) -> None:
+        self._generations[table] = self.generation(table) + 1
+        for key in [k for k in self._entries if k[0] == table]:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+count_cache = CountCache(ttl=settings.COUNT_CACHE_TTL)
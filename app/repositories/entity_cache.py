@@ -0,0 +1,193 @@
+import asyncio
+import inspect
+import json
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+from app.core.config import settings
+
+# Returned by backends when a key is absent, so a cached ``None`` (negative
+# entry) can be told apart from a miss
+MISS = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    coalesced: int = 0
+    invalidations: int = 0
+
+
+class MemoryCacheBackend:
+    """Bounded in-process LRU with per-entry TTL."""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISS
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return MISS
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class SharedCacheBackend:
+    """Cache shared between workers, on any client with the redis.asyncio
+    ``get``/``set(ex=)``/``delete`` interface. Values are stored as JSON."""
+
+    def __init__(self, client, prefix: str = "entity:"):
+        self.client = client
+        self.prefix = prefix
+        self.evictions = 0  # evictions happen server-side and are not visible
+
+    async def get(self, key: str) -> Any:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            return MISS
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        raw = json.dumps(value, default=str)
+        await self.client.set(self.prefix + key, raw, ex=max(int(ttl), 1))
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+    async def clear(self) -> None:
+        keys = [k async for k in self.client.scan_iter(match=self.prefix + "*")]
+        if keys:
+            await self.client.delete(*keys)
+
+
+class EntityCache:
+    """Read-through cache of entity rows, with negative caching and a single
+    in-flight load per key."""
+
+    def __init__(self, backend, ttl: float = 60, negative_ttl: float = 5):
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._stats = CacheStats()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        # Keys invalidated while their load was in flight; not cached
+        self._stale: Set[str] = set()
+
+    async def get_or_load(
+        self, key: str, loader: Callable[[], Awaitable[Optional[dict]]]
+    ) -> Optional[dict]:
+        value = await self.backend.get(key)
+        if value is not MISS:
+            if value is None:
+                self._stats.negative_hits += 1
+            else:
+                self._stats.hits += 1
+            return value
+
+        self._stats.misses += 1
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self._stats.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            self._stats.loads += 1
+            value = await loader()
+            if key not in self._stale:
+                await self.backend.set(
+                    key, value, self.ttl if value is not None else self.negative_ttl
+                )
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Followers re-raise it; mark it retrieved for the leader's copy
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+            self._stale.discard(key)
+
+    async def invalidate(self, key: str) -> None:
+        self._stats.invalidations += 1
+        if key in self._in_flight:
+            # That load may have read the row before the change
+            self._stale.add(key)
+        await self.backend.delete(key)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**asdict(self._stats), "evictions": self.backend.evictions}
+
+
+# Session.info key of the cache keys a transaction has invalidated
+PENDING_INVALIDATIONS = "pending_entity_invalidations"
+
+
+def defer_invalidation(db, cache: Any, key: Hashable) -> None:
+    """Remember to invalidate ``key`` of ``cache`` again once ``db`` commits.
+
+    ``cache`` is an EntityCache or anything else with an ``invalidate(key)``
+    method, sync or async (the count cache uses it too).
+    """
+    db.info.setdefault(PENDING_INVALIDATIONS, set()).add((cache, key))
+
+
+async def invalidate_committed(db) -> None:
+    """Invalidate the keys ``db``'s transaction touched; call after commit."""
+    for cache, key in db.info.pop(PENDING_INVALIDATIONS, ()):
+        outcome = cache.invalidate(key)
+        if inspect.isawaitable(outcome):
+            await outcome
+
+
+def build_entity_cache() -> Optional[EntityCache]:
+    """Cache configured by CACHE_BACKEND: "memory" (default), "redis" or "none"."""
+    backend_name = settings.CACHE_BACKEND
+    if backend_name == "none":
+        return None
+    if backend_name == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis needs the redis package: pip install 'redis>=5'"
+            ) from e
+
+        backend = SharedCacheBackend(redis.from_url(settings.CACHE_URL))
+    else:
+        backend = MemoryCacheBackend(maxsize=settings.CACHE_MAXSIZE)
+    return EntityCache(
+        backend, ttl=settings.CACHE_TTL, negative_ttl=settings.CACHE_NEGATIVE_TTL
+    )
@@ -0,0 +1,47 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Sequence, Tuple
+
+NEXT = "next"
+PREV = "prev"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def column_python_type(column) -> type:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return object
+
+
+def encode_cursor(values: Sequence[Any], direction: str) -> str:
+    """Encode keyset values into an opaque, URL-safe token."""
+    payload = {
+        "k": [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        "d": direction,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, columns: Sequence) -> Tuple[List[Any], str]:
+    """Decode a token produced by ``encode_cursor`` back into typed key values."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        keys, direction = payload["k"], payload["d"]
+        if direction not in (NEXT, PREV) or len(keys) != len(columns):
+            raise ValueError("cursor does not match the keyset")
+        values = []
+        for column, value in zip(columns, keys):
+            if column_python_type(column) is datetime:
+                value = datetime.fromisoformat(value)
+            values.append(value)
+    except (binascii.Error, KeyError, TypeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {e}") from e
+    return values, direction
@@ -1,7 +1,105 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+from sqlalchemy import column, func, literal_column, select, table, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.enum import SearchMode
 from app.repositories.base import BaseRepository
-from app.models.user import User
+from app.repositories.entity_cache import build_entity_cache
+from app.repositories.pagination import NEXT, decode_cursor, encode_cursor
+from app.models.user import USERNAME_FTS_TABLE, User
+
+# Sorts after every character a username can continue a prefix with
+MAX_CHAR = "\U0010ffff"
+
+username_fts = table(USERNAME_FTS_TABLE, column("rowid"), column("u_username"))
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _escape_glob(value: str) -> str:
+    return "".join(f"[{char}]" if char in "*?[" else char for char in value)
 
 
 class UserRepository(BaseRepository[User]):
+    keyset_columns = (User.created_at, User.u_id)
+    entity_cache = build_entity_cache()
+    batch_lookups = True
+
     def __init__(self):
         super().__init__(User)
+
+    async def find_existing_usernames(
+        self, db: AsyncSession, usernames: Iterable[str]
+    ) -> Set[str]:
+        stmt = select(User.u_username).where(User.u_username.in_(list(usernames)))
+        result = await db.execute(stmt)
+        return set(result.scalars().all())
+
+    async def search_by_username(
+        self,
+        db: AsyncSession,
+        query: str,
+        mode: SearchMode = SearchMode.PREFIX,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """Users whose username starts with (prefix) or contains (substring)
+        ``query``, case-sensitively, one ranked page at a time.
+
+        Prefix matches come in username order. Substring matches rank by
+        where the match starts, then by username length, then username.
+        Usernames compare byte-wise (code point order) on every backend, so
+        cursors are stable. Postgres uses the text_pattern_ops and pg_trgm
+        indexes; SQLite the username btree and the trigram FTS5 table.
+        """
+        postgres = db.get_bind().dialect.name == "postgresql"
+        username = User.u_username
+        # The next cursor is built from the username
+        stmt = self._select(fields, username)
+
+        if mode == SearchMode.PREFIX:
+            keys = [username]
+            if postgres:
+                # The pattern operators (~>~, USING ~<~) are what the
+                # text_pattern_ops index serves, so a page is an index range
+                stmt = stmt.where(username.like(f"{_escape_like(query)}%"))
+                ordering = [text(f"{User.__tablename__}.{username.name} USING ~<~")]
+            else:
+                stmt = stmt.where(username >= query, username < query + MAX_CHAR)
+                ordering = keys
+        else:
+            position = (func.strpos if postgres else func.instr)(username, query)
+            sort_name = username.collate("C") if postgres else username
+            keys = [position, func.length(username), sort_name]
+            ordering = keys
+            if postgres:
+                stmt = stmt.where(username.like(f"%{_escape_like(query)}%"))
+            else:
+                matches = select(username_fts.c.rowid).where(
+                    username_fts.c.u_username.op("GLOB")(f"*{_escape_glob(query)}*")
+                )
+                rowid = literal_column(f"{User.__tablename__}.rowid")
+                stmt = stmt.where(rowid.in_(matches))
+
+        if cursor:
+            values, _ = decode_cursor(cursor, keys)
+            if postgres and mode == SearchMode.PREFIX:
+                stmt = stmt.where(username.op("~>~")(values[0]))
+            else:
+                stmt = stmt.where(tuple_(*keys) > tuple_(*values))
+
+        result = await db.execute(stmt.order_by(*ordering).limit(limit + 1))
+        items: List[User] = list(result.scalars().all())
+        has_next = len(items) > limit
+        items = items[:limit]
+
+        next_cursor = None
+        if has_next:
+            name = items[-1].u_username
+            last = [name]
+            if mode == SearchMode.SUBSTRING:
+                last = [name.find(query) + 1, len(name), name]
+            next_cursor = encode_cursor(last, NEXT)
+        return {"items": items, "has_next": has_next, "next_cursor": next_cursor}
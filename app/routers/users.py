@@ -1,18 +1,53 @@
 from fastapi import APIRouter, Request, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, FrozenSet, List, Optional, Tuple
+import json
 
-from app.schemas.user import UserCreate, UserResponse
-from app.services.user_service import create_user, get_user, get_users_paginated
-from app.dependencies import get_db
-from app.middleware.response import build_response
+from app.schemas.user import UserBulkImportResponse, UserCreate, UserResponse
+from app.services.user_service import (
+    create_user,
+    export_users,
+    get_user,
+    get_users_by_cursor,
+    get_users_by_ids,
+    get_users_page_versions,
+    get_users_paginated,
+    import_users,
+    search_users,
+)
+from app.dependencies import get_db, get_read_db
+from app.middleware.response import (
+    build_json_response,
+    envelope_adapter,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
+from app.schemas.base import project_schema
 from app.schemas.response import APIResponse
 from app.core.messages import get_message, MessageCode
 from app.core.logging import logger
+from app.core.security import HashQueueFullError
+from app.core.enum import CountMode, ExportFormat, SearchMode
+from app.repositories.pagination import InvalidCursorError
 
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+MAX_PAGE_SIZE = 100
+
+USER_ENVELOPE = envelope_adapter(UserResponse)
+USER_LIST_ENVELOPE = envelope_adapter(List[UserResponse])
+BULK_IMPORT_ENVELOPE = envelope_adapter(UserBulkImportResponse)
+
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated fields to return, e.g. u_id,u_username",
+)
+
 
 @router.post(
     "/",
@@ -22,17 +57,107 @@ router = APIRouter(prefix="/users", tags=["users"])
 async def create_new_user(
     request: Request,
     user: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    new_user = create_user(db, user)
-    return build_response(
+    try:
+        new_user = await create_user(db, user)
+    except HashQueueFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=get_message(MessageCode.SERVICE_UNAVAILABLE, request.state.lang),
+        )
+    return build_json_response(
         request=request,
+        adapter=USER_ENVELOPE,
         data=new_user,
         message=get_message(MessageCode.USER_CREATED, request.state.lang),
         code=201,
     )
 
 
+async def _ndjson_rows(request: Request) -> AsyncIterator[Tuple[int, Any]]:
+    """Parse an NDJSON body line by line as it arrives."""
+    index = 0
+    # Pieces of the unfinished last line; only new chunks are searched for
+    # line breaks, so a long line is not re-split as it arrives
+    tail: List[bytes] = []
+    async for chunk in request.stream():
+        lines = chunk.split(b"\n")
+        if len(lines) == 1:
+            tail.append(chunk)
+            continue
+        lines[0] = b"".join([*tail, lines[0]])
+        tail = [lines.pop()]
+        for line in lines:
+            if line.strip():
+                yield index, _parse_line(line)
+                index += 1
+    last = b"".join(tail)
+    if last.strip():
+        yield index, _parse_line(last)
+
+
+def _parse_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None  # reported per row as a validation error
+
+
+async def _array_rows(items: List[Any]) -> AsyncIterator[Tuple[int, Any]]:
+    for index, item in enumerate(items):
+        yield index, item
+
+
+@router.post(
+    "/bulk",
+    response_model=APIResponse[UserBulkImportResponse],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": UserCreate.model_json_schema(),
+                    }
+                },
+                "application/x-ndjson": {"schema": UserCreate.model_json_schema()},
+            },
+            "required": True,
+        }
+    },
+)
+async def bulk_create_users(request: Request, db: AsyncSession = Depends(get_db)):
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("application/x-ndjson"):
+        rows = _ndjson_rows(request)
+    else:
+        try:
+            items = await request.json()
+        except ValueError:
+            items = None
+        if not isinstance(items, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=get_message(MessageCode.BAD_REQUEST, request.state.lang),
+            )
+        rows = _array_rows(items)
+
+    try:
+        result = await import_users(db, rows)
+    except HashQueueFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=get_message(MessageCode.SERVICE_UNAVAILABLE, request.state.lang),
+        )
+    return build_json_response(
+        request=request,
+        adapter=BULK_IMPORT_ENVELOPE,
+        data=result,
+        message=get_message(MessageCode.USER_BULK_IMPORTED, request.state.lang),
+    )
+
+
 @router.get(
     "/",
     response_model=APIResponse[List[UserResponse]],
@@ -40,21 +165,240 @@ async def create_new_user(
 async def read_users(
     request: Request,
     page_no: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1),
-    db: Session = Depends(get_db),
+    page_size: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    count_mode: CountMode = Query(CountMode.EXACT),
+    ids: Optional[str] = Query(None, description="Comma-separated user IDs"),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_read_db),
 ):
-    result = get_users_paginated(db, page_no=page_no, page_size=page_size)
-    return build_response(
-        request=request,
-        data=result["items"],
-        message=get_message(MessageCode.USER_LIST_RETRIEVED, request.state.lang),
-        meta={
+    selected = _parse_fields(request, fields)
+    if ids is not None:
+        return await _read_users_by_ids(request, db, ids, selected)
+
+    total = None
+    if not cursor and "if-none-match" in request.headers:
+        # Revalidation: compare against the page's row versions before
+        # loading (and serializing) the rows themselves
+        versions = await get_users_page_versions(
+            db, page_no=page_no, page_size=page_size, count_mode=count_mode
+        )
+        headers = validator_headers(
+            _list_etag(
+                request,
+                selected,
+                versions["versions"],
+                versions["total"],
+                versions["has_next"],
+                versions["has_prev"],
+            )
+        )
+        if is_not_modified(request, headers["ETag"]):
+            return not_modified_response(headers)
+        # Reused below so a changed page is not counted twice
+        total = versions["total"]
+
+    if cursor:
+        try:
+            result = await get_users_by_cursor(
+                db,
+                cursor=cursor,
+                page_size=page_size,
+                fields=_columns(selected),
+            )
+        except InvalidCursorError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=get_message(MessageCode.INVALID_CURSOR, request.state.lang),
+            )
+        meta = {"page_size": result["page_size"]}
+    else:
+        result = await get_users_paginated(
+            db,
+            page_no=page_no,
+            page_size=page_size,
+            count_mode=count_mode,
+            fields=_columns(selected),
+            total=total,
+        )
+        meta = {
             "total": result["total"],
+            "count_mode": result["count_mode"],
             "page_no": result["page_no"],
             "page_size": result["page_size"],
             "total_pages": result["total_pages"],
+        }
+
+    headers = validator_headers(
+        _list_etag(
+            request,
+            selected,
+            _versions(result["items"]),
+            result.get("total"),
+            result["has_next"],
+            result["has_prev"],
+        )
+    )
+    if is_not_modified(request, headers["ETag"]):
+        return not_modified_response(headers)
+    return build_json_response(
+        request=request,
+        adapter=_list_envelope(selected),
+        data=result["items"],
+        message=get_message(MessageCode.USER_LIST_RETRIEVED, request.state.lang),
+        meta={
+            **meta,
             "has_next": result["has_next"],
             "has_prev": result["has_prev"],
+            "next_cursor": result["next_cursor"],
+            "prev_cursor": result["prev_cursor"],
+        },
+        headers=headers,
+    )
+
+
+def _parse_fields(request: Request, fields: Optional[str]) -> Optional[FrozenSet[str]]:
+    if fields is None:
+        return None
+    selected = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    if not selected or not selected <= UserResponse.model_fields.keys():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=get_message(MessageCode.INVALID_FIELDS, request.state.lang),
+        )
+    return selected
+
+
+def _columns(selected: Optional[FrozenSet[str]]) -> Optional[List[str]]:
+    """Columns to load for a sparse fieldset; updated_at feeds the ETag."""
+    if selected is None:
+        return None
+    return sorted(selected | {"updated_at"})
+
+
+def _envelope(selected: Optional[FrozenSet[str]]):
+    if selected is None:
+        return USER_ENVELOPE
+    return envelope_adapter(project_schema(UserResponse, selected))
+
+
+def _list_envelope(selected: Optional[FrozenSet[str]]):
+    if selected is None:
+        return USER_LIST_ENVELOPE
+    return envelope_adapter(List[project_schema(UserResponse, selected)])
+
+
+def _versions(users) -> List[Tuple[str, datetime]]:
+    return [(user.u_id, user.updated_at) for user in users]
+
+
+def _list_etag(
+    request: Request, selected: Optional[FrozenSet[str]], versions, *page_state
+) -> str:
+    # Page number, size and mode are in the URL, which caches key on
+    fields = sorted(selected) if selected else None
+    return make_etag(request.state.lang, fields, versions, *page_state)
+
+
+async def _read_users_by_ids(
+    request: Request,
+    db: AsyncSession,
+    ids: str,
+    selected: Optional[FrozenSet[str]] = None,
+):
+    user_ids = [user_id.strip() for user_id in ids.split(",") if user_id.strip()]
+    if not user_ids or len(user_ids) > MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=get_message(MessageCode.BAD_REQUEST, request.state.lang),
+        )
+    result = await get_users_by_ids(db, user_ids, fields=_columns(selected))
+    headers = validator_headers(
+        _list_etag(request, selected, _versions(result["items"]), result["missing"])
+    )
+    if is_not_modified(request, headers["ETag"]):
+        return not_modified_response(headers)
+    return build_json_response(
+        request=request,
+        adapter=_list_envelope(selected),
+        data=result["items"],
+        message=get_message(MessageCode.USER_LIST_RETRIEVED, request.state.lang),
+        meta={
+            "requested": len(user_ids),
+            "found": len(result["items"]),
+            "missing": result["missing"],
+        },
+        headers=headers,
+    )
+
+
+@router.get("/export")
+async def export_all_users(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    updated_after: Optional[datetime] = Query(None),
+    updated_before: Optional[datetime] = Query(None),
+    # Keeps a transaction: Postgres server-side cursors cannot run in
+    # autocommit mode
+    db: AsyncSession = Depends(get_db),
+):
+    # Rows are read and sent one batch at a time: the next batch is only
+    # fetched once the server has flushed the previous chunk to the client.
+    media_type = (
+        "text/csv" if export_format == ExportFormat.CSV else "application/x-ndjson"
+    )
+    return StreamingResponse(
+        export_users(
+            db,
+            export_format=export_format,
+            updated_after=updated_after,
+            updated_before=updated_before,
+        ),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="users.{export_format}"'
+        },
+    )
+
+
+@router.get(
+    "/search",
+    response_model=APIResponse[List[UserResponse]],
+)
+async def search_users_by_username(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    mode: SearchMode = Query(SearchMode.PREFIX),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_read_db),
+):
+    selected = _parse_fields(request, fields)
+    try:
+        result = await search_users(
+            db,
+            q,
+            mode=mode,
+            limit=limit,
+            cursor=cursor,
+            fields=None if selected is None else sorted(selected),
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=get_message(MessageCode.INVALID_CURSOR, request.state.lang),
+        )
+    return build_json_response(
+        request=request,
+        adapter=_list_envelope(selected),
+        data=result["items"],
+        message=get_message(MessageCode.USER_LIST_RETRIEVED, request.state.lang),
+        meta={
+            "q": q,
+            "mode": mode,
+            "limit": limit,
+            "has_next": result["has_next"],
+            "next_cursor": result["next_cursor"],
         },
     )
 
@@ -62,16 +406,39 @@ async def read_users(
 @router.get(
     "/{user_id}",
     response_model=APIResponse[UserResponse],
-    responses={404: {"model": APIResponse[None], "description": "User not found"}},
+    responses={
+        304: {"description": "The client's copy is current"},
+        404: {"model": APIResponse[None], "description": "User not found"},
+    },
 )
-async def read_user(user_id: str, request: Request, db: Session = Depends(get_db)):
+async def read_user(
+    user_id: str,
+    request: Request,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_read_db),
+):
+    selected = _parse_fields(request, fields)
     logger.info(f"Fetching user with ID: {user_id}")
-    user = get_user(db, user_id)
+    # Served whole from the entity cache; fields only narrows the response
+    user = await get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return build_response(
+    headers = validator_headers(
+        make_etag(
+            request.state.lang,
+            sorted(selected) if selected else None,
+            user.u_id,
+            user.updated_at,
+        ),
+        user.updated_at,
+    )
+    if is_not_modified(request, headers["ETag"], user.updated_at):
+        return not_modified_response(headers)
+    return build_json_response(
         request=request,
+        adapter=_envelope(selected),
         data=user,
         message=get_message(MessageCode.USER_RETRIEVED, request.state.lang),
+        headers=headers,
     )
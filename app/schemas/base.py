@@ -1,22 +1,42 @@
-from pydantic import BaseModel, ConfigDict, field_serializer
+from pydantic import BaseModel, ConfigDict, PlainSerializer, create_model
 from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Annotated, FrozenSet, Optional, Type
+
+
+def to_utc_iso(dt: datetime) -> str:
+    """Render a datetime as UTC ISO-8601 with second precision and a Z suffix."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (
+        dt.astimezone(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+    )
+
+
+# Carried on the field itself, so projections of a schema keep it
+UTCDateTime = Annotated[datetime, PlainSerializer(to_utc_iso, return_type=str)]
 
 
 class BaseSchema(BaseModel):
-    created_at: datetime
-    updated_at: datetime
+    created_at: UTCDateTime
+    updated_at: UTCDateTime
     created_by: Optional[str] = None
     updated_by: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
-    @field_serializer("created_at", "updated_at")
-    def serialize_dt(self, dt: datetime) -> str:
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return (
-            dt.astimezone(timezone.utc)
-            .isoformat(timespec="seconds")
-            .replace("+00:00", "Z")
-        )
+
+@lru_cache(maxsize=256)
+def project_schema(schema: Type[BaseModel], fields: FrozenSet[str]) -> Type[BaseModel]:
+    """``schema`` narrowed to ``fields``, built once per field set.
+
+    Validating against the projection reads only those attributes, so it
+    works on rows loaded with just the matching columns.
+    """
+    definitions = {
+        name: (info.annotation, info)
+        for name, info in schema.model_fields.items()
+        if name in fields
+    }
+    name = f"{schema.__name__}[{','.join(sorted(definitions))}]"
+    return create_model(name, __config__=schema.model_config, **definitions)
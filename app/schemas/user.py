@@ -1,6 +1,6 @@
 from app.schemas.base import BaseSchema
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 
 class UserCreate(BaseModel):
@@ -14,3 +14,30 @@ class UserResponse(BaseSchema):
 
     class Config:
         from_attributes = True  # For serialize from SQLAlchemy model
+
+
+class BulkImportRowError(BaseModel):
+    index: int
+    username: Optional[str] = None
+    error: str
+    detail: Optional[str] = None
+
+
+class BulkImportChunk(BaseModel):
+    chunk: int
+    rows: int
+    created: int
+    hash_ms: float
+    insert_ms: float
+
+
+class UserBulkImportResponse(BaseModel):
+    total: int
+    created: int
+    failed: int
+    elapsed_ms: float
+    rows_per_sec: float
+    errors: List[BulkImportRowError]
+    chunks: List[BulkImportChunk]
+    # First row not attempted when the request deadline cut the import short
+    resume_from: Optional[int] = None
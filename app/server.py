@@ -0,0 +1,103 @@
+"""Production entry point: ``python -m app.server``.
+
+Runs uvicorn with WEB_WORKERS processes under its supervisor, which
+restarts any worker that exits. Each worker recycles itself gracefully
+after WEB_MAX_REQUESTS plus a random share of WEB_MAX_REQUESTS_JITTER
+requests, so workers do not all restart at once.
+"""
+
+import atexit
+import glob
+import logging
+import os
+import random
+import shutil
+import tempfile
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.fastapi.project")
+
+
+class RecyclingConfig(uvicorn.Config):
+    """uvicorn config whose request limit is drawn once per worker process."""
+
+    def __init__(self, *args, max_requests_jitter: int = 0, **kwargs):
+        self.max_requests_jitter = max_requests_jitter
+        self._limit_for_pid = None
+        super().__init__(*args, **kwargs)
+
+    @property
+    def limit_max_requests(self):
+        if self._base_limit is None:
+            return None
+        pid = os.getpid()
+        if self._limit_for_pid is None or self._limit_for_pid[0] != pid:
+            jitter = random.randint(0, self.max_requests_jitter)
+            self._limit_for_pid = (pid, self._base_limit + jitter)
+        return self._limit_for_pid[1]
+
+    @limit_max_requests.setter
+    def limit_max_requests(self, value):
+        self._base_limit = value
+
+
+def worker_count() -> int:
+    return max(settings.WEB_WORKERS, 1)
+
+
+def configure_worker_env(workers: int) -> None:
+    """Environment inherited by the spawned workers."""
+    # Split the cores between web workers instead of giving each a full pool
+    os.environ.setdefault(
+        "PASSWORD_HASH_WORKERS", str(max((os.cpu_count() or 1) // workers, 1))
+    )
+    if not settings.METRICS_DIR and workers > 1:
+        # Each worker would otherwise fall back to a private directory and
+        # /metrics would only show the worker that happened to answer
+        settings.METRICS_DIR = tempfile.mkdtemp(prefix="app-metrics-")
+        os.environ["METRICS_DIR"] = settings.METRICS_DIR
+        atexit.register(shutil.rmtree, settings.METRICS_DIR, ignore_errors=True)
+    elif settings.METRICS_DIR:
+        # Counters of a previous run would otherwise be summed into this one
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        for path in glob.glob(os.path.join(settings.METRICS_DIR, "*.db")):
+            os.remove(path)
+
+
+def build_config(workers: int) -> RecyclingConfig:
+    max_requests = settings.WEB_MAX_REQUESTS or None
+    if max_requests and workers == 1:
+        # Without the supervisor nothing would start a recycled worker again
+        logger.warning("WEB_MAX_REQUESTS needs WEB_WORKERS > 1; recycling disabled")
+        max_requests = None
+    return RecyclingConfig(
+        "app.main:app",
+        host=settings.WEB_HOST,
+        port=settings.WEB_PORT,
+        workers=workers,
+        limit_max_requests=max_requests,
+        max_requests_jitter=settings.WEB_MAX_REQUESTS_JITTER,
+        timeout_graceful_shutdown=settings.WEB_GRACEFUL_TIMEOUT,
+        proxy_headers=True,
+        lifespan="on",
+    )
+
+
+def main() -> None:
+    workers = worker_count()
+    configure_worker_env(workers)
+    config = build_config(workers)
+    server = uvicorn.Server(config)
+    if workers == 1:
+        server.run()
+        return
+    socket = config.bind_socket()
+    Multiprocess(config, target=server.run, sockets=[socket]).run()
+
+
+if __name__ == "__main__":
+    main()
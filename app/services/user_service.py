@@ -1,54 +1,353 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
 from app.schemas.user import UserCreate
-from app.core.security import hash_password
-from typing import List, Dict, Any
+from app.core.messages import MessageCode
+from app.core.config import settings
+from app.core.deadline import remaining
+from app.core.security import hash_password_async, hash_passwords_async
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from app.repositories.user_repository import UserRepository
+from app.repositories.pagination import NEXT, PREV
+from app.core.enum import CountMode, ExportFormat, SearchMode
+from app.schemas.base import to_utc_iso
+from datetime import datetime
+import csv
+import io
+import json
 import uuid
 from sqlalchemy import desc
+from sqlalchemy.exc import IntegrityError
+from pydantic import ValidationError
+import time
 
 user_repo = UserRepository()
 
 
-def create_user(db: Session, user_create: UserCreate) -> User:
+async def create_user(db: AsyncSession, user_create: UserCreate) -> User:
+    hashed_password = await hash_password_async(user_create.password)
     user_data = {
         User.u_id.name: str(uuid.uuid4()),
         User.u_username.name: user_create.username,
-        User.u_password.name: hash_password(user_create.password),
+        User.u_password.name: hashed_password,
         User.created_by.name: "SYS",
         User.updated_by.name: "SYS",
     }
 
-    return user_repo.create(db, user_data)
+    return await user_repo.create(db, user_data)
 
 
-def get_users(db: Session, offset: int = 0, limit: int = 10) -> List[User]:
-    return user_repo.find_all(db, offset=offset, limit=limit)
+async def get_users(db: AsyncSession, offset: int = 0, limit: int = 10) -> List[User]:
+    return await user_repo.find_all(db, offset=offset, limit=limit)
 
 
-def get_user(db: Session, user_id: str) -> User:
-    condition = {"u_id": user_id}
-    return user_repo.find_one_by_conditions(db, **condition)
+async def get_user(db: AsyncSession, user_id: str) -> User:
+    return await user_repo.get_by_id(db, user_id)
 
 
-def get_users_paginated(
-    db: Session,
+async def get_users_by_ids(
+    db: AsyncSession, user_ids: List[str], fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    items = await user_repo.find_many_by_ids(db, user_ids, fields=fields)
+    found = {user.u_id for user in items}
+    return {
+        "items": items,
+        "missing": [
+            user_id for user_id in dict.fromkeys(user_ids) if user_id not in found
+        ],
+    }
+
+
+async def search_users(
+    db: AsyncSession,
+    query: str,
+    mode: SearchMode = SearchMode.PREFIX,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    return await user_repo.search_by_username(
+        db, query, mode=mode, limit=limit, cursor=cursor, fields=fields
+    )
+
+
+LIST_ORDER = (desc(User.created_at), desc(User.u_id))
+
+
+async def get_users_paginated(
+    db: AsyncSession,
     page_no: int = 1,
     page_size: int = 20,
+    count_mode: CountMode = CountMode.EXACT,
+    fields: Optional[List[str]] = None,
+    total: Optional[int] = None,
 ) -> Dict[str, Any]:
-    result = user_repo.paginate(
+    result = await user_repo.paginate(
         db=db,
         page=page_no,
         per_page=page_size,
-        # order_by=desc(User.created_at),
+        order_by=LIST_ORDER,
+        count_mode=count_mode,
+        fields=fields,
+        total=total,
     )
 
+    items = result["items"]
+    has_next = result["has_next"]
+    has_prev = result["has_prev"]
     return {
-        "items": result["items"],
+        "items": items,
         "total": result["total"],
         "page_no": page_no,
         "page_size": page_size,
         "total_pages": result["pages"],
-        "has_next": page_no < result["pages"],
-        "has_prev": page_no > 1,
+        "has_next": has_next,
+        "has_prev": has_prev,
+        "count_mode": result["count_mode"],
+        # Cursors let clients switch to keyset paging from any offset page
+        "next_cursor": (
+            user_repo.build_cursor(items[-1], NEXT) if has_next and items else None
+        ),
+        "prev_cursor": (
+            user_repo.build_cursor(items[0], PREV) if has_prev and items else None
+        ),
+    }
+
+
+async def get_users_page_versions(
+    db: AsyncSession,
+    page_no: int = 1,
+    page_size: int = 20,
+    count_mode: CountMode = CountMode.EXACT,
+) -> Dict[str, Any]:
+    """(u_id, updated_at) of the rows on a page, plus what else the page
+    response depends on; for answering conditional requests cheaply."""
+    return await user_repo.page_versions(
+        db=db,
+        page=page_no,
+        per_page=page_size,
+        order_by=LIST_ORDER,
+        count_mode=count_mode,
+    )
+
+
+async def get_users_by_cursor(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    page_size: int = 20,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    result = await user_repo.paginate_keyset(
+        db=db, cursor=cursor, per_page=page_size, fields=fields
+    )
+
+    return {
+        "items": result["items"],
+        "page_size": page_size,
+        "has_next": result["has_next"],
+        "has_prev": result["has_prev"],
+        "next_cursor": result["next_cursor"],
+        "prev_cursor": result["prev_cursor"],
+    }
+
+
+EXPORT_COLUMNS = (
+    User.u_id,
+    User.u_username,
+    User.created_at,
+    User.updated_at,
+    User.created_by,
+    User.updated_by,
+)
+
+
+def _export_value(value: Any) -> Any:
+    return to_utc_iso(value) if isinstance(value, datetime) else value
+
+
+async def export_users(
+    db: AsyncSession,
+    export_format: ExportFormat = ExportFormat.NDJSON,
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[bytes]:
+    """Encode users batch by batch; each yielded chunk holds one DB batch."""
+    filters = []
+    if updated_after is not None:
+        filters.append(User.updated_at >= updated_after)
+    if updated_before is not None:
+        filters.append(User.updated_at < updated_before)
+    names = [column.key for column in EXPORT_COLUMNS]
+
+    if export_format == ExportFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(names)
+        yield buffer.getvalue().encode()
+
+    async for batch in user_repo.stream(
+        db,
+        filters=filters,
+        order_by=[User.created_at, User.u_id],
+        columns=EXPORT_COLUMNS,
+        batch_size=batch_size,
+    ):
+        if export_format == ExportFormat.CSV:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(
+                [_export_value(row[name]) for name in names] for row in batch
+            )
+            yield buffer.getvalue().encode()
+        else:
+            yield "".join(
+                json.dumps(
+                    {name: _export_value(row[name]) for name in names},
+                    ensure_ascii=False,
+                )
+                + "\n"
+                for row in batch
+            ).encode()
+
+
+async def _import_chunk(
+    db: AsyncSession, chunk: List[Tuple[int, UserCreate]], errors: List[Dict[str, Any]]
+) -> Tuple[int, float, float]:
+    """Hash and insert one chunk; returns (created, hash_ms, insert_ms)."""
+    # A concurrent import can still claim a username between the check and
+    # the insert; the retry re-checks against the now-committed rows.
+    for attempt in range(2):
+        existing = await user_repo.find_existing_usernames(
+            db, (user.username for _, user in chunk)
+        )
+        fresh = [(i, user) for i, user in chunk if user.username not in existing]
+        hash_ms = insert_ms = 0.0
+        if fresh:
+            started = time.perf_counter()
+            hashed = await hash_passwords_async([user.password for _, user in fresh])
+            hash_ms = (time.perf_counter() - started) * 1000
+
+            rows = [
+                {
+                    User.u_id.name: str(uuid.uuid4()),
+                    User.u_username.name: user.username,
+                    User.u_password.name: password,
+                    User.created_by.name: "SYS",
+                    User.updated_by.name: "SYS",
+                }
+                for (_, user), password in zip(fresh, hashed)
+            ]
+            started = time.perf_counter()
+            try:
+                await user_repo.bulk_create(db, rows, chunk_size=len(rows))
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+                if attempt:
+                    raise
+                continue
+            insert_ms = (time.perf_counter() - started) * 1000
+        break
+
+    errors.extend(
+        {"index": i, "username": user.username, "error": MessageCode.USERNAME_EXISTS}
+        for i, user in chunk
+        if user.username in existing
+    )
+    return len(fresh), hash_ms, insert_ms
+
+
+async def import_users(
+    db: AsyncSession,
+    rows: AsyncIterator[Tuple[int, Any]],
+    chunk_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Create users from ``(index, payload)`` pairs, committing chunk by chunk.
+
+    Rows that fail validation or whose username is taken are reported in
+    ``errors`` and skipped; the rest of the batch still goes in.
+
+    When the request deadline leaves less time than the slowest chunk took,
+    the import stops at the chunk boundary and reports ``resume_from``, the
+    index of the first row it did not attempt; the report covers the rows
+    before it, whose chunks are already committed.
+    """
+    chunk_size = chunk_size or settings.BULK_IMPORT_CHUNK_SIZE
+    started = time.perf_counter()
+    total = created = 0
+    errors: List[Dict[str, Any]] = []
+    chunks: List[Dict[str, Any]] = []
+    seen: set = set()
+    pending: List[Tuple[int, UserCreate]] = []
+    slowest = 0.0
+
+    def out_of_time() -> bool:
+        # Cancellation mid-chunk would lose the report of committed chunks
+        budget = remaining()
+        return budget is not None and budget < slowest
+
+    async def flush() -> None:
+        nonlocal created, slowest
+        chunk_started = time.perf_counter()
+        count, hash_ms, insert_ms = await _import_chunk(db, pending, errors)
+        slowest = max(slowest, time.perf_counter() - chunk_started)
+        created += count
+        chunks.append(
+            {
+                "chunk": len(chunks),
+                "rows": len(pending),
+                "created": count,
+                "hash_ms": round(hash_ms, 2),
+                "insert_ms": round(insert_ms, 2),
+            }
+        )
+        pending.clear()
+
+    async for index, payload in rows:
+        total += 1
+        try:
+            user = UserCreate.model_validate(payload)
+        except ValidationError as e:
+            errors.append(
+                {
+                    "index": index,
+                    "error": MessageCode.VALIDATION_ERROR,
+                    "detail": str(e.errors(include_url=False)),
+                }
+            )
+            continue
+        if user.username in seen:
+            errors.append(
+                {
+                    "index": index,
+                    "username": user.username,
+                    "error": MessageCode.USERNAME_EXISTS,
+                }
+            )
+            continue
+        seen.add(user.username)
+        pending.append((index, user))
+        if len(pending) >= chunk_size:
+            if out_of_time():
+                break
+            await flush()
+    else:
+        if pending and not out_of_time():
+            await flush()
+
+    resume_from = pending[0][0] if pending else None
+    if resume_from is not None:
+        total = resume_from
+        errors = [error for error in errors if error["index"] < resume_from]
+
+    elapsed = time.perf_counter() - started
+    return {
+        "total": total,
+        "created": created,
+        "failed": len(errors),
+        "elapsed_ms": round(elapsed * 1000, 2),
+        "rows_per_sec": round(created / elapsed, 2) if elapsed > 0 else 0.0,
+        "errors": sorted(errors, key=lambda error: error["index"]),
+        "chunks": chunks,
+        "resume_from": resume_from,
     }
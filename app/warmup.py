@@ -0,0 +1,71 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.enum import CountMode
+from app.core.security import start_hash_pool
+from app.db.database import AsyncSessionLocal, engine, replica_engines
+from app.middleware.response import build_json_response, envelope_adapter
+from app.models.user import User
+from app.schemas.user import UserResponse
+from app.services.user_service import get_users_paginated, user_repo
+
+WARM_UP_ID = "__warm_up__"
+
+
+async def prefill_pool(engine: AsyncEngine, size: int) -> None:
+    """Open ``size`` connections at once so they are all pooled afterwards."""
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(size))
+        )
+
+
+async def prefill_pools() -> None:
+    for pooled in (engine, *replica_engines):
+        await prefill_pool(pooled, settings.DB_POOL_SIZE)
+
+
+async def build_schemas() -> None:
+    # The first validate/dump through an adapter builds its pydantic-core
+    # validator and serializer; do it for the single and list envelopes
+    user = User(
+        u_id=WARM_UP_ID,
+        u_username=WARM_UP_ID,
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+    )
+    build_json_response(adapter=envelope_adapter(UserResponse), data=user)
+    build_json_response(adapter=envelope_adapter(List[UserResponse]), data=[user])
+
+
+async def compile_hot_sql() -> None:
+    # Executing populates the engine's compiled statement cache
+    async with AsyncSessionLocal() as db:
+        await user_repo.find_one_by_conditions(db, u_id=WARM_UP_ID)
+        await user_repo.find_many_by_ids(db, [WARM_UP_ID])
+        await get_users_paginated(db, page_no=1, count_mode=CountMode.NONE)
+        await db.rollback()
+
+
+WARM_UP_STEPS: Dict[str, Callable[[], Awaitable[None]]] = {
+    "db_pool": prefill_pools,
+    "schemas": build_schemas,
+    "bcrypt": start_hash_pool,
+    "sql": compile_hot_sql,
+}
+
+
+async def warm_up() -> Dict[str, float]:
+    """Run every warm-up step and return how long each took, in seconds."""
+    timings = {}
+    for name, step in WARM_UP_STEPS.items():
+        started = time.perf_counter()
+        await step()
+        timings[name] = time.perf_counter() - started
+    return timings
@@ -0,0 +1,114 @@
+"""Set-based repository operations versus a per-row loop.
+
+Runs against a throwaway SQLite database (or BENCH_DATABASE_URL, an async
+SQLAlchemy URL) and times update, upsert and delete for N rows each way.
+
+    python -m benchmarks.bulk_operations [rows]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.base import Base
+from app.models.user import User  # noqa: F401  (registers the table)
+from app.repositories.user_repository import UserRepository
+
+user_repo = UserRepository()
+
+
+def make_rows(n: int, suffix: str = "") -> list[dict]:
+    return [
+        {"u_id": f"uid_{i}", "u_username": f"user_{i}{suffix}", "u_password": "x"}
+        for i in range(n)
+    ]
+
+
+async def timed(label: str, session_factory, operation) -> float:
+    async with session_factory() as db:
+        started = time.perf_counter()
+        await operation(db)
+        await db.commit()
+        elapsed = time.perf_counter() - started
+    print(f"  {label:<28} {elapsed * 1e3:9.1f} ms")
+    return elapsed
+
+
+async def reset(session_factory, n: int) -> None:
+    async with session_factory() as db:
+        await user_repo.bulk_delete_by_ids(db, [f"uid_{i}" for i in range(n * 2)])
+        await user_repo.bulk_create(db, make_rows(n))
+        await db.commit()
+
+
+async def main(n: int, url: str) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    updates = make_rows(n, suffix="_v2")
+    for row in updates:
+        row.pop("u_password")
+
+    print(f"update {n} rows")
+    await reset(session_factory, n)
+
+    async def update_loop(db):
+        for row in updates:
+            await user_repo.update_by_id(db, row["u_id"], row)
+
+    loop = await timed("per-row update_by_id", session_factory, update_loop)
+    await reset(session_factory, n)
+    bulk = await timed(
+        "bulk_update", session_factory, lambda db: user_repo.bulk_update(db, updates)
+    )
+    print(f"  speed-up {loop / bulk:.1f}x")
+
+    print(f"upsert {n} rows (half new)")
+    await reset(session_factory, n // 2)
+    upserts = make_rows(n, suffix="_v3")
+
+    async def upsert_loop(db):
+        for row in upserts:
+            if await user_repo.find_one_by_conditions(db, u_id=row["u_id"]):
+                await user_repo.update_by_id(db, row["u_id"], row)
+            else:
+                await user_repo.create(db, row)
+
+    loop = await timed("per-row find + write", session_factory, upsert_loop)
+    await reset(session_factory, n // 2)
+    bulk = await timed(
+        "upsert", session_factory, lambda db: user_repo.upsert(db, upserts)
+    )
+    print(f"  speed-up {loop / bulk:.1f}x")
+
+    print(f"delete {n} rows")
+    ids = [f"uid_{i}" for i in range(n)]
+    await reset(session_factory, n)
+
+    async def delete_loop(db):
+        for id_value in ids:
+            await user_repo.delete_by_id(db, id_value)
+
+    loop = await timed("per-row delete_by_id", session_factory, delete_loop)
+    await reset(session_factory, n)
+    bulk = await timed(
+        "bulk_delete_by_ids",
+        session_factory,
+        lambda db: user_repo.bulk_delete_by_ids(db, ids),
+    )
+    print(f"  speed-up {loop / bulk:.1f}x")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as tmp:
+        default_url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        url = os.getenv("BENCH_DATABASE_URL", default_url)
+        asyncio.run(main(rows, url))
@@ -0,0 +1,88 @@
+"""Cold start to first request, with and without the lifespan warm-up.
+
+Starts ``python -m app.server`` with one worker against the load-suite
+database (seed it first with ``python -m benchmarks.load_suite``), measures
+how long the port takes to answer and then the latency of the first request
+to each endpoint.
+
+    python -m benchmarks.cold_start [runs]
+"""
+
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+from benchmarks.load_suite import DATABASE_URL, free_port
+
+FIRST_REQUESTS = {
+    "get_by_id": ("GET", "/users/uid_1", None),
+    "list_page_1": ("GET", "/users/", None),
+    "create": ("POST", "/users/", "create"),
+}
+
+
+def first_requests(base_url: str) -> dict:
+    latencies = {}
+    with httpx.Client(base_url=base_url) as client:
+        for name, (method, path, body) in FIRST_REQUESTS.items():
+            payload = (
+                {"username": f"cold_{uuid.uuid4().hex}", "password": "benchmark"}
+                if body
+                else None
+            )
+            started = time.perf_counter()
+            client.request(method, path, json=payload).raise_for_status()
+            latencies[name] = time.perf_counter() - started
+    return latencies
+
+
+def cold_start(warm_up: bool) -> dict:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "DATABASE_URL": DATABASE_URL,
+        "WEB_PORT": str(port),
+        "WEB_WORKERS": "1",
+        "WARM_UP": str(warm_up).lower(),
+        "ENVIRONMENT": "benchmark",
+    }
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                httpx.get(f"{base_url}/openapi.json", timeout=1)
+                break
+            except httpx.TransportError:
+                if server.poll() is not None:
+                    raise RuntimeError("server exited during startup")
+                time.sleep(0.01)
+        result = {"ready": time.perf_counter() - started}
+        result.update(first_requests(base_url))
+        return result
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main(runs: int) -> None:
+    for warm_up in (False, True):
+        results = [cold_start(warm_up) for _ in range(runs)]
+        print(f"warm-up {'on' if warm_up else 'off'} (best of {runs})")
+        for key in results[0]:
+            best = min(result[key] for result in results)
+            print(f"  {key:<14} {best * 1e3:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
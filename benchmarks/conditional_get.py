@@ -0,0 +1,69 @@
+"""Bytes and latency for repeat readers of the users API.
+
+Seeds the load-suite database, then fetches a user and a 100-user page
+plainly, revalidated with If-None-Match (304), and gzip-compressed, and
+reports the mean latency and bytes on the wire for each.
+
+    python -m benchmarks.conditional_get [rounds]
+"""
+
+import asyncio
+import sys
+import time
+
+import httpx
+
+from benchmarks.load_suite import seed
+
+USERS = 10_000
+TARGETS = {
+    "get by id": "/users/uid_42",
+    "list page": "/users/?page_no=3&page_size=100",
+}
+# httpx asks for gzip by default; "identity" keeps the plain body uncompressed
+VARIANTS = ("plain", "304", "gzip")
+
+
+async def measure(client, path: str, variant: str, rounds: int):
+    headers = {"Accept-Encoding": "identity"}
+    if variant == "gzip":
+        headers["Accept-Encoding"] = "gzip"
+    elif variant == "304":
+        etag = (await client.get(path, headers=headers)).headers["etag"]
+        headers["If-None-Match"] = etag
+    for _ in range(10):
+        await client.get(path, headers=headers)
+
+    wire_bytes = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        response = await client.get(path, headers=headers)
+        wire_bytes = response.num_bytes_downloaded
+    return (time.perf_counter() - started) / rounds, wire_bytes
+
+
+async def main(rounds: int) -> None:
+    await seed(USERS)
+    from app.db.database import engine
+    from app.main import app
+
+    try:
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://bench"
+            ) as client:
+                for name, path in TARGETS.items():
+                    for variant in VARIANTS:
+                        latency, wire_bytes = await measure(
+                            client, path, variant, rounds
+                        )
+                        print(
+                            f"{name:<10} {variant:<6} {latency * 1e3:7.2f} ms"
+                            f"  {wire_bytes:7d} bytes"
+                        )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
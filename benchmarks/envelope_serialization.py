@@ -0,0 +1,95 @@
+"""Envelope serialization: response_model path versus the fast path.
+
+Both routes return the same list of ORM ``User`` objects; the first goes
+through ``build_response`` and FastAPI's response_model validation, the
+second through ``build_json_response`` with a precompiled TypeAdapter.
+
+    python -m benchmarks.envelope_serialization [rounds]
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi import FastAPI, Request
+
+from app.middleware.response import (
+    build_json_response,
+    build_response,
+    envelope_adapter,
+)
+from app.models.user import User
+from app.schemas.response import APIResponse
+from app.schemas.user import UserResponse
+from benchmarks.middleware_overhead import SCOPE
+
+PAGE_SIZES = (20, 100, 1000)
+USERS = [
+    User(
+        u_id=f"uid_{i}",
+        u_username=f"user_{i}",
+        u_password="x",
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        updated_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        created_by="SYS",
+        updated_by="SYS",
+    )
+    for i in range(max(PAGE_SIZES))
+]
+USER_LIST_ENVELOPE = envelope_adapter(List[UserResponse])
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/model", response_model=APIResponse[List[UserResponse]])
+    async def via_model(request: Request, size: int):
+        return build_response(request=request, data=USERS[:size], meta={"n": size})
+
+    @app.get("/fast", response_model=APIResponse[List[UserResponse]])
+    async def via_fast_path(request: Request, size: int):
+        return build_json_response(
+            request=request,
+            adapter=USER_LIST_ENVELOPE,
+            data=USERS[:size],
+            meta={"n": size},
+        )
+
+    return app
+
+
+async def run(app: FastAPI, path: str, size: int, rounds: int) -> float:
+    scope = dict(SCOPE, path=path, raw_path=path.encode())
+    scope["query_string"] = f"size={size}".encode()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(10):
+        await app(dict(scope), receive, send)
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / rounds
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app = build_app()
+    for size in PAGE_SIZES:
+        model = asyncio.run(run(app, "/model", size, rounds))
+        fast = asyncio.run(run(app, "/fast", size, rounds))
+        print(
+            f"{size:>5} items   response_model {model * 1e3:7.2f} ms"
+            f"   fast path {fast * 1e3:7.2f} ms   ({model / fast:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
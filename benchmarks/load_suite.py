@@ -0,0 +1,313 @@
+"""Load and regression benchmarks for the users API.
+
+Seeds a database with N users, then drives create, get-by-id, first-page
+and deep-page listing requests either in-process (httpx ASGI transport) or
+against a real uvicorn server, and reports throughput and p50/p95/p99.
+
+The database is a throwaway SQLite file unless BENCH_DATABASE_URL (an async
+SQLAlchemy URL, e.g. the docker-compose Postgres on port 5434) is set.
+
+    python -m benchmarks.load_suite --users 100000 --transport uvicorn
+    python -m benchmarks.load_suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.load_suite --baseline benchmarks/baseline.json --threshold 0.2
+
+With --baseline the run exits non-zero when any scenario's p95 rises, or its
+throughput drops, by more than the threshold fraction.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+DEFAULT_DATABASE_URL = (
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.gettempdir(), 'bench_users.db')}"
+)
+DATABASE_URL = os.environ.get("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL)
+# Settings are read at import time, so point the app at the bench database first
+os.environ["DATABASE_URL"] = DATABASE_URL
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("SQL_LOG_LEVEL", "WARNING")
+
+from sqlalchemy import func, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from app.models.base import Base  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+PAGE_SIZE = 20
+
+SEED_SQL = {
+    # Mirrors the generate_series seed in init.sql
+    "postgresql": """
+        INSERT INTO users (u_id, u_username, u_password)
+        SELECT 'uid_' || g, 'user_' || g, md5(random()::text)
+        FROM generate_series(1, :n) AS g
+        ON CONFLICT DO NOTHING
+    """,
+    "sqlite": """
+        WITH RECURSIVE g(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM g WHERE x < :n)
+        INSERT OR IGNORE INTO users (u_id, u_username, u_password)
+        SELECT 'uid_' || x, 'user_' || x, hex(randomblob(16)) FROM g
+    """,
+}
+
+
+async def seed(users: int) -> None:
+    engine = create_async_engine(DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        existing = (await conn.execute(select(func.count()).select_from(User))).scalar()
+        if existing < users:
+            print(f"seeding {users} users ({existing} present)")
+            started = time.perf_counter()
+            await conn.execute(text(SEED_SQL[engine.dialect.name]), {"n": users})
+            print(f"  done in {time.perf_counter() - started:.1f}s")
+    await engine.dispose()
+
+
+def build_scenarios(users: int) -> Dict[str, Callable[[httpx.AsyncClient], object]]:
+    deep_page = max(users // PAGE_SIZE - 1, 1)
+
+    def create(client):
+        payload = {"username": f"bench_{uuid.uuid4().hex}", "password": "benchmark"}
+        return client.post("/users/", json=payload)
+
+    def get_by_id(client):
+        return client.get(f"/users/uid_{random.randint(1, users)}")
+
+    def list_page_1(client):
+        return client.get("/users/", params={"page_no": 1, "page_size": PAGE_SIZE})
+
+    def list_deep_page(client):
+        return client.get(
+            "/users/", params={"page_no": deep_page, "page_size": PAGE_SIZE}
+        )
+
+    return {
+        "create": create,
+        "get_by_id": get_by_id,
+        "list_page_1": list_page_1,
+        "list_deep_page": list_deep_page,
+    }
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, request, requests: int, concurrency: int
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await request(client)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput": requests / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1e3,
+        "p95_ms": percentile(latencies, 0.95) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+    }
+
+
+async def run_suite(
+    client: httpx.AsyncClient, args, scenarios: Dict[str, Callable]
+) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name in args.scenarios:
+        request = scenarios[name]
+        # Warm caches, pools and the hash workers before measuring
+        for _ in range(min(args.concurrency, args.requests)):
+            await request(client)
+        results[name] = await run_scenario(
+            client, request, args.requests, args.concurrency
+        )
+        print(format_result(name, results[name]))
+    return results
+
+
+async def run_asgi(args, scenarios) -> Dict[str, Dict[str, float]]:
+    from app.db.database import engine
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench"
+            ) as client:
+                return await run_suite(client, args, scenarios)
+    finally:
+        # Pooled aiosqlite connections keep worker threads alive otherwise
+        await engine.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_ready(base_url: str, server: subprocess.Popen) -> None:
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        for _ in range(100):
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited before becoming ready")
+            try:
+                await client.get("/openapi.json")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("uvicorn did not become ready")
+
+
+async def run_uvicorn(args, scenarios) -> Dict[str, Dict[str, float]]:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "app.main:app",
+        "--port",
+        str(port),
+        "--workers",
+        str(args.workers),
+        "--no-access-log",
+        "--log-level",
+        "warning",
+    ]
+    server = subprocess.Popen(command, env=os.environ.copy())
+    try:
+        await wait_until_ready(base_url, server)
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+            return await run_suite(client, args, scenarios)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def format_result(name: str, result: Dict[str, float]) -> str:
+    return (
+        f"  {name:<16} {result['throughput']:9.1f} req/s"
+        f"  p50 {result['p50_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f} ms"
+        f"  p99 {result['p99_ms']:8.2f} ms  errors {result['errors']}"
+    )
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """Scenarios whose p95 or throughput moved past ``threshold`` (a fraction)."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p95 {base['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms"
+            )
+        if result["throughput"] < base["throughput"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {base['throughput']:.1f} -> "
+                f"{result['throughput']:.1f} req/s"
+            )
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--transport", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: value.split(","),
+        default=["create", "get_by_id", "list_page_1", "list_deep_page"],
+    )
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--baseline", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    return parser.parse_args(argv)
+
+
+async def main(args) -> int:
+    await seed(args.users)
+    scenarios = build_scenarios(args.users)
+    unknown = set(args.scenarios) - set(scenarios)
+    if unknown:
+        print(f"unknown scenarios: {', '.join(sorted(unknown))}")
+        return 2
+
+    print(
+        f"{args.transport}: {args.requests} requests per scenario, "
+        f"concurrency {args.concurrency}, {args.users} users"
+    )
+    runner = run_uvicorn if args.transport == "uvicorn" else run_asgi
+    results = await runner(args, scenarios)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(
+                {
+                    "transport": args.transport,
+                    "users": args.users,
+                    "concurrency": args.concurrency,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["transport"] != args.transport:
+            print(f"warning: baseline was recorded over {baseline['transport']}")
+        regressions = find_regressions(results, baseline["results"], args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
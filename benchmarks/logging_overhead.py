@@ -0,0 +1,105 @@
+"""Request latency with logging off, with inline handlers, and with the queue.
+
+Each request goes through RequestLoggingMiddleware and a handler that logs
+one line, so three records are written per request. Output goes to a
+temporary file so terminal speed does not skew the numbers; the "slow sink"
+rows add 200us per write to model a congested pipe or log shipper.
+
+    python -m benchmarks.logging_overhead [requests]
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import tempfile
+import time
+
+from fastapi import FastAPI
+
+from app.core.logging import (
+    RequestLoggingMiddleware,
+    build_queue_pipeline,
+    formatter,
+    logger,
+)
+from benchmarks.middleware_overhead import SCOPE
+
+
+class SlowFileHandler(logging.FileHandler):
+    def emit(self, record):
+        time.sleep(0.0002)
+        super().emit(record)
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware)
+
+    @app.get("/ping")
+    async def ping():
+        logger.debug("Handling ping")
+        return {"ok": True}
+
+    return app
+
+
+async def run(app: FastAPI, requests: int) -> list[float]:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(100):
+        await app(dict(SCOPE), receive, send)
+
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await app(dict(SCOPE), receive, send)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def report(name: str, latencies: list[float]) -> None:
+    cuts = statistics.quantiles(latencies, n=100)
+    print(f"{name:<18} p50 {cuts[49] * 1e6:8.1f} us   p99 {cuts[98] * 1e6:8.1f} us")
+
+
+def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    app = build_app()
+    original_handlers = logger.handlers[:]
+
+    logger.disabled = True
+    report("logging off", asyncio.run(run(app, requests)))
+    logger.disabled = False
+
+    for label, handler_cls in (
+        ("", logging.FileHandler),
+        (", slow sink", SlowFileHandler),
+    ):
+        with tempfile.NamedTemporaryFile("w", suffix=".log") as target:
+            file_handler = handler_cls(target.name, encoding="utf-8")
+            file_handler.setFormatter(formatter)
+
+            logger.handlers = [file_handler]
+            report(f"inline{label}", asyncio.run(run(app, requests)))
+
+            # Large queue so the slow sink measures latency, not drops
+            queue_handler, listener = build_queue_pipeline(
+                [file_handler], maxsize=requests * 4
+            )
+            listener.start()
+            logger.handlers = [queue_handler]
+            report(f"queue{label}", asyncio.run(run(app, requests)))
+            listener.stop()
+
+            file_handler.close()
+
+    logger.handlers = original_handlers
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Per-request overhead of the middleware stack.
+
+Compares the previous BaseHTTPMiddleware implementations of the language
+and request-logging middleware with the current pure ASGI ones, by driving
+a bare FastAPI app directly through its ASGI interface (no network).
+
+    python -m benchmarks.middleware_overhead [requests]
+"""
+
+import asyncio
+import sys
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.context import correlation_id, if_id, request_id
+from app.core.logging import RequestLoggingMiddleware, logger
+from app.middleware.language import LanguageMiddleware
+
+
+class LegacyLanguageMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request.state.lang = request.headers.get("lang", "vi")
+        return await call_next(request)
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        token_request_id = request_id.set(str(uuid.uuid4())[:8])
+        token_correlation_id = correlation_id.set(uuid.uuid4())
+        token_if_id = if_id.set("IF-0001")
+        start_time = time.perf_counter()
+        logger.info(f"Incoming request: {request.method} {request.url}")
+        try:
+            response = await call_next(request)
+            process_time = time.perf_counter() - start_time
+            logger.info(
+                f"Request finished: {request.method} {request.url} - "
+                f"Status: {response.status_code} - Time: {process_time:.4f}s"
+            )
+            return response
+        finally:
+            request_id.reset(token_request_id)
+            correlation_id.reset(token_correlation_id)
+            if_id.reset(token_if_id)
+
+
+def build_app(*middleware) -> FastAPI:
+    app = FastAPI()
+    for cls in middleware:
+        app.add_middleware(cls)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/ping",
+    "raw_path": b"/ping",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"bench"), (b"lang", b"en")],
+    "client": ("127.0.0.1", 1234),
+    "server": ("bench", 80),
+}
+
+
+async def run(app: FastAPI, requests: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    # warm up routing and middleware stack construction
+    for _ in range(100):
+        await app(dict(SCOPE), receive, send)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(SCOPE), receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    # Keep log I/O out of the measurement; only the middleware hops matter
+    logger.disabled = True
+
+    variants = {
+        "no middleware": build_app(),
+        "BaseHTTPMiddleware": build_app(
+            LegacyRequestLoggingMiddleware, LegacyLanguageMiddleware
+        ),
+        "pure ASGI": build_app(RequestLoggingMiddleware, LanguageMiddleware),
+    }
+    baseline = None
+    for name, app in variants.items():
+        per_request = asyncio.run(run(app, requests))
+        baseline = per_request if baseline is None else baseline
+        overhead = (per_request - baseline) * 1e6
+        print(
+            f"{name:<20} {per_request * 1e6:8.1f} us/request"
+            f"  (+{overhead:6.1f} us middleware)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Latency of GET /users/search queries against a large users table.
+
+Seeds N users (``user_1`` .. ``user_N``, default one million) like the load
+suite, makes sure the search indexes exist, then times each query through
+the repository and reports p50/p95/p99 per query and mode.
+
+    python -m benchmarks.search --users 1000000 --runs 200
+
+Point BENCH_DATABASE_URL at Postgres (e.g. the docker-compose service on
+port 5434) for the pg_trgm / text_pattern_ops numbers; the default is a
+SQLite file of its own, since the trigram FTS5 table is only built when the
+users table is created.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault(
+    "BENCH_DATABASE_URL",
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.gettempdir(), 'bench_search.db')}",
+)
+
+from sqlalchemy import text  # noqa: E402
+
+from benchmarks.load_suite import percentile, seed  # noqa: E402
+from app.core.enum import SearchMode  # noqa: E402
+from app.db.database import AsyncSessionLocal, engine  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.repositories.user_repository import UserRepository  # noqa: E402
+
+# (query, mode): from a handful of matches to hundreds of thousands
+QUERIES = [
+    ("user_123456", SearchMode.PREFIX),
+    ("user_1234", SearchMode.PREFIX),
+    ("user_1", SearchMode.PREFIX),
+    ("er_98765", SearchMode.SUBSTRING),
+    ("_4242", SearchMode.SUBSTRING),
+    ("99999", SearchMode.SUBSTRING),
+]
+
+
+async def ensure_indexes() -> None:
+    """Add the search indexes to a Postgres table created before they existed."""
+    if engine.dialect.name != "postgresql":
+        return
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for index in User.__table__.indexes:
+            await conn.run_sync(index.create, checkfirst=True)
+        await conn.execute(text("ANALYZE users"))
+
+
+async def time_query(repo, query: str, mode: SearchMode, runs: int, limit: int):
+    latencies = []
+    async with AsyncSessionLocal() as db:
+        # First run warms the connection and the statement cache
+        await repo.search_by_username(db, query, mode=mode, limit=limit)
+        for _ in range(runs):
+            started = time.perf_counter()
+            result = await repo.search_by_username(db, query, mode=mode, limit=limit)
+            latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return len(result["items"]), latencies
+
+
+async def main(args) -> int:
+    await seed(args.users)
+    await ensure_indexes()
+    repo = UserRepository()
+    print(
+        f"{engine.dialect.name}: {args.users} users, {args.runs} runs, limit {args.limit}"
+    )
+    slow = []
+    try:
+        for query, mode in QUERIES:
+            found, latencies = await time_query(
+                repo, query, mode, args.runs, args.limit
+            )
+            p50, p95, p99 = (percentile(latencies, f) * 1e3 for f in (0.5, 0.95, 0.99))
+            print(
+                f"  {mode:<9} {query!r:<14} {found:3d} rows"
+                f"  p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  p99 {p99:7.2f} ms"
+            )
+            if p95 > args.max_p95_ms:
+                slow.append(f"{mode} {query!r}: p95 {p95:.2f} ms")
+    finally:
+        await engine.dispose()
+    for line in slow:
+        print(f"SLOW {line}")
+    return 1 if slow else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument(
+        "--max-p95-ms",
+        type=float,
+        default=10.0,
+        help="exit non-zero when a query's p95 is above this",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -31,6 +31,32 @@ CREATE INDEX IF NOT EXISTS idx_users_username
     ON public.users USING btree
     (u_username COLLATE pg_catalog."default" ASC NULLS LAST)
     TABLESPACE pg_default;
+-- Index: idx_users_created_at_uid
+
+-- DROP INDEX IF EXISTS public.idx_users_created_at_uid;
+
+CREATE INDEX IF NOT EXISTS idx_users_created_at_uid
+    ON public.users USING btree
+    (created_at ASC NULLS LAST, u_id COLLATE pg_catalog."default" ASC NULLS LAST)
+    TABLESPACE pg_default;
+-- Index: idx_users_username_pattern (prefix search)
+
+-- DROP INDEX IF EXISTS public.idx_users_username_pattern;
+
+CREATE INDEX IF NOT EXISTS idx_users_username_pattern
+    ON public.users USING btree
+    (u_username COLLATE pg_catalog."default" text_pattern_ops ASC NULLS LAST)
+    TABLESPACE pg_default;
+-- Index: idx_users_username_trgm (substring search)
+
+-- DROP INDEX IF EXISTS public.idx_users_username_trgm;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_users_username_trgm
+    ON public.users USING gin
+    (u_username gin_trgm_ops)
+    TABLESPACE pg_default;
 
 INSERT INTO users (u_id, u_username, u_password)
 SELECT 
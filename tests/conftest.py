@@ -4,27 +4,36 @@ import pytest
 # Setup environment variables before importing app modules
 # This ensures that settings.DATABASE_URL is populated when app.core.config is loaded
 TEST_DB_PATH = os.path.join(os.path.dirname(__file__), "db_test.db")
-DATABASE_URL = f"sqlite:///{TEST_DB_PATH}"
+DATABASE_URL = f"sqlite+aiosqlite:///{TEST_DB_PATH}"
 
 os.environ["DATABASE_URL"] = DATABASE_URL
 os.environ["SECRET_KEY"] = "test_secret_key"
+os.environ["PASSWORD_HASH_WORKERS"] = "2"
 
+import httpx
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from app.main import app
 from app.models.base import Base
-from app.dependencies import get_db
-
-# Create engine for SQLite
-# check_same_thread=False is needed for SQLite with multiple threads (like in FastAP)
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
+from app.dependencies import get_db, get_read_db
+from app.db.instrumentation import attach_query_listeners
+from app.repositories.count_cache import count_cache
+from app.repositories.entity_cache import EntityCache, MemoryCacheBackend
+from app.repositories.user_repository import UserRepository
+
+# Async engine for the application code under test. A file-backed SQLite
+# database with a real pool lets concurrent requests use separate connections.
+engine = create_async_engine(DATABASE_URL)
+attach_query_listeners(engine.sync_engine)
+TestingSessionLocal = async_sessionmaker(
+    bind=engine, autoflush=False, expire_on_commit=False
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -33,27 +42,44 @@ def setup_test_db():
     Create the test database and tables before tests run.
     Drop them after tests complete.
     """
-    # Create tables
-    Base.metadata.create_all(bind=engine)
+    # DDL runs once per session, so a plain sync engine is enough here
+    sync_engine = create_engine(f"sqlite:///{TEST_DB_PATH}")
+    Base.metadata.create_all(bind=sync_engine)
     yield
     # Drop tables/cleanup
-    Base.metadata.drop_all(bind=engine)
+    Base.metadata.drop_all(bind=sync_engine)
+    sync_engine.dispose()
     if os.path.exists(TEST_DB_PATH):
         os.remove(TEST_DB_PATH)
 
 
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    """
+    Test sessions roll back their writes, so caches must not outlive a test.
+    """
+    monkeypatch.setattr(
+        UserRepository, "entity_cache", EntityCache(MemoryCacheBackend())
+    )
+    count_cache.clear()
+    yield
+    count_cache.clear()
+
+
 @pytest.fixture(scope="function")
-def db_session():
+async def db_session():
     """
     Get a new database session for a test.
-    Rollback logic is handled by specific test requirements or implicit transaction.
-    Here we provide a fresh session.
+    The session is closed without committing, so inserted rows are rolled back.
     """
-    db = TestingSessionLocal()
-    try:
+    async with TestingSessionLocal() as db:
+        yield db
+    await engine.dispose()
+
+
+async def override_get_db():
+    async with TestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 @pytest.fixture(scope="module")
@@ -61,14 +87,22 @@ def client():
     """
     Test client with overridden database dependency.
     """
-    def override_get_db():
-        try:
-            db = TestingSessionLocal()
-            yield db
-        finally:
-            db.close()
-
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+async def async_client():
+    """
+    In-process async client, for tests that drive concurrent requests.
+    """
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+    app.dependency_overrides.clear()
+    await engine.dispose()
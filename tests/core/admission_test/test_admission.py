@@ -0,0 +1,162 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core import admission
+from app.core.admission import (
+    ConcurrencyLimiter,
+    OverloadedError,
+    RateLimitedError,
+    RateLimiter,
+    build_concurrency_limiters,
+    for_path,
+)
+from app.core.config import settings
+from app.core.context import deadline
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_waiters_get_slots_in_order():
+    limiter = ConcurrencyLimiter("test", 1, queue_size=2, queue_timeout=1)
+    await limiter.acquire()
+    order = []
+
+    async def wait(name):
+        await limiter.acquire()
+        order.append(name)
+
+    waiters = [asyncio.create_task(wait(name)) for name in ("a", "b")]
+    await asyncio.sleep(0)
+    assert limiter.stats()["queued"] == 2
+
+    limiter.release()
+    await asyncio.sleep(0)
+    limiter.release()
+    await asyncio.gather(*waiters)
+    assert order == ["a", "b"]
+    assert limiter.in_flight == 1
+
+
+async def test_full_queue_and_slow_queue_are_rejected():
+    limiter = ConcurrencyLimiter("test", 1, queue_size=1, queue_timeout=0.02)
+    await limiter.acquire()
+    queued = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(OverloadedError) as full:
+        await limiter.acquire()
+    with pytest.raises(OverloadedError) as slow:
+        await queued
+    assert (full.value.reason, slow.value.reason) == ("queue_full", "queue_timeout")
+    assert limiter.stats() == {"limit": 1, "max_limit": 1, "in_flight": 1, "queued": 0}
+
+
+async def test_queue_wait_is_bounded_by_the_deadline():
+    limiter = ConcurrencyLimiter("test", 1, queue_size=1, queue_timeout=10)
+    await limiter.acquire()
+    token = deadline.set(time.monotonic() - 1)
+    try:
+        with pytest.raises(OverloadedError):
+            await limiter.acquire()
+    finally:
+        deadline.reset(token)
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    limiter = ConcurrencyLimiter("test", 1, queue_size=1, queue_timeout=1)
+    await limiter.acquire()
+    queued = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+
+    limiter.release()
+    assert limiter.stats()["queued"] == 0
+    assert limiter.in_flight == 0
+
+
+def test_limit_backs_off_when_slow_and_recovers_when_saturated():
+    limiter = ConcurrencyLimiter("test", 10, target_latency=0.1, min_limit=2)
+    limiter.in_flight = 10
+    limiter.release(latency=0.5)
+    assert limiter.stats()["limit"] == 9
+    # Further slow requests within the same interval do not compound
+    limiter.release(latency=0.5, overloaded=True)
+    assert limiter.stats()["limit"] == 9
+
+    for _ in range(20):
+        limiter.in_flight = int(limiter.limit)
+        limiter.release(latency=0.01)
+    assert limiter.limit == 10
+
+
+def test_limit_never_drops_below_the_minimum():
+    limiter = ConcurrencyLimiter("test", 3, target_latency=0.1, min_limit=2)
+    for _ in range(5):
+        limiter._last_decrease = 0.0
+        limiter.in_flight = 1
+        limiter.release(latency=1)
+    assert limiter.stats()["limit"] == 2
+
+
+def test_rate_limiter_allows_a_burst_then_rejects():
+    limiter = RateLimiter("test", rate=2, burst=3)
+    for _ in range(3):
+        limiter.acquire("a")
+    with pytest.raises(RateLimitedError) as rejected:
+        limiter.acquire("a")
+    assert 0 < rejected.value.retry_after <= 0.5
+    # Buckets are per client
+    limiter.acquire("b")
+
+
+async def test_rate_limiter_refills():
+    limiter = RateLimiter("test", rate=100, burst=1)
+    limiter.acquire("a")
+    await asyncio.sleep(0.02)
+    limiter.acquire("a")
+
+
+def test_rate_limiter_forgets_least_recent_clients():
+    limiter = RateLimiter("test", rate=1, burst=1, max_clients=2)
+    for client in ("a", "b", "c"):
+        limiter.acquire(client)
+    limiter.acquire("a")
+    with pytest.raises(RateLimitedError):
+        limiter.acquire("c")
+
+
+def test_route_limits_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_CONCURRENCY", 8)
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_SIZE", 16)
+    monkeypatch.setattr(settings, "ADMISSION_LIMITS", "/metrics:0,/users/bulk:2:4:0")
+    limiters = build_concurrency_limiters()
+
+    bulk = for_path(limiters, "/users/bulk")
+    default = for_path(limiters, "/users/")
+    assert (bulk.max_limit, bulk.queue_size, bulk.target_latency) == (2, 4, 0)
+    assert (default.name, default.max_limit, default.queue_size) == (
+        admission.DEFAULT_GROUP,
+        8,
+        16,
+    )
+    assert for_path(limiters, "/metrics") is None
+
+
+def test_routes_can_be_limited_per_method(monkeypatch):
+    monkeypatch.setattr(
+        settings, "ADMISSION_LIMITS", "/users/bulk:2:4:0,POST /users/:16:64:0"
+    )
+    limiters = build_concurrency_limiters()
+
+    create = for_path(limiters, "/users/", "POST")
+    assert (create.name, create.max_limit, create.target_latency) == (
+        "POST /users/",
+        16,
+        0,
+    )
+    assert for_path(limiters, "/users/", "GET").name == admission.DEFAULT_GROUP
+    assert for_path(limiters, "/users/bulk", "POST").max_limit == 2
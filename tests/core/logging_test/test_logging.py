@@ -0,0 +1,57 @@
+import json
+import logging
+import queue
+
+from app.core import logging as app_logging
+from app.core.logging import (
+    BoundedQueueHandler,
+    JsonLineFormatter,
+    _parse_sample_rates,
+    should_log_request,
+)
+
+
+def make_record(msg="hello %s", args=("world",)):
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+
+
+def test_drop_policy_counts_overflow():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1), overflow="drop")
+
+    handler.emit(make_record())
+    handler.emit(make_record())
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_prepare_merges_args_without_formatting():
+    handler = BoundedQueueHandler(queue.Queue())
+
+    record = handler.prepare(make_record())
+
+    assert record.msg == "hello world"
+    assert record.args is None
+
+
+def test_json_line_formatter():
+    record = make_record()
+    record.request_id = "ABCD"
+
+    payload = json.loads(JsonLineFormatter().format(record))
+
+    assert payload["message"] == "hello world"
+    assert payload["level"] == "INFO"
+    assert payload["request_id"] == "ABCD"
+
+
+def test_sample_rates_use_longest_prefix(monkeypatch):
+    monkeypatch.setattr(
+        app_logging,
+        "SAMPLE_RATES",
+        _parse_sample_rates("/users:0,/users/export:1"),
+    )
+
+    assert not should_log_request("/users/123")
+    assert should_log_request("/users/export")
+    assert should_log_request("/docs")
@@ -0,0 +1,68 @@
+from app.core.metrics import (
+    CounterMetric,
+    GaugeMetric,
+    HistogramMetric,
+    MetricsRegistry,
+)
+
+
+def worker(directory, process_id):
+    registry = MetricsRegistry(str(directory), process_id=process_id)
+    metrics = (
+        CounterMetric(registry, "errors_total", "Errors.", ("kind",)),
+        GaugeMetric(registry, "in_flight", "In flight."),
+        HistogramMetric(
+            registry, "latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)
+        ),
+    )
+    return registry, metrics
+
+
+def test_samples_are_summed_across_workers(tmp_path):
+    for process_id in (1, 2):
+        _, (errors, in_flight, latency) = worker(tmp_path, process_id)
+        errors.labels("db").inc()
+        in_flight.inc(process_id)
+        latency.labels("/users").observe(0.05)
+        latency.labels("/users").observe(0.5)
+
+    registry, _ = worker(tmp_path, 3)
+    text = registry.render()
+
+    assert 'errors_total{kind="db"} 2' in text
+    assert "in_flight 3" in text
+    assert 'latency_seconds_bucket{route="/users",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="/users",le="1.0"} 4' in text
+    assert 'latency_seconds_bucket{route="/users",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{route="/users"} 4' in text
+    assert "# TYPE latency_seconds histogram" in text
+
+
+def test_closed_worker_keeps_counters_but_drops_gauges(tmp_path):
+    registry, (errors, in_flight, _) = worker(tmp_path, 1)
+    errors.labels("db").inc()
+    in_flight.inc()
+
+    registry.close()
+
+    text = worker(tmp_path, 2)[0].render()
+    assert 'errors_total{kind="db"} 1' in text
+    assert "in_flight" not in text
+
+
+def test_store_grows_past_initial_size(tmp_path):
+    registry, (errors, _, _) = worker(tmp_path, 1)
+
+    for i in range(3000):
+        errors.labels(f"kind-{i}").inc()
+
+    text = registry.render()
+    assert 'errors_total{kind="kind-2999"} 1' in text
+
+
+def test_label_values_are_escaped(tmp_path):
+    registry, (errors, _, _) = worker(tmp_path, 1)
+
+    errors.labels('say "hi"\n').inc()
+
+    assert 'errors_total{kind="say \\"hi\\"\\n"} 1' in registry.render()
@@ -0,0 +1,59 @@
+import pytest
+
+from app.core.config import settings
+from app.core.security import (
+    HashQueueFullError,
+    get_hash_pool_stats,
+    hash_password,
+    hash_password_async,
+    hash_passwords_async,
+    verify_password,
+    verify_password_async,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_hash_password_async_round_trip():
+    hashed = await hash_password_async("secret")
+
+    assert hashed != "secret"
+    assert verify_password("secret", hashed)
+    assert await verify_password_async("secret", hashed)
+    assert not await verify_password_async("wrong", hashed)
+
+
+async def test_async_verify_accepts_sync_hash():
+    hashed = hash_password("secret")
+
+    assert await verify_password_async("secret", hashed)
+
+
+async def test_hash_passwords_async_keeps_order():
+    passwords = ["a", "b", "c"]
+
+    hashed = await hash_passwords_async(passwords)
+
+    assert len(hashed) == 3
+    assert all(verify_password(p, h) for p, h in zip(passwords, hashed))
+
+
+async def test_hash_pool_stats_are_recorded():
+    before = get_hash_pool_stats()
+
+    await hash_password_async("secret")
+
+    after = get_hash_pool_stats()
+    assert after["completed"] == before["completed"] + 1
+    assert after["hash_time_total"] > before["hash_time_total"]
+    assert after["in_flight"] == 0
+
+
+async def test_hash_queue_limit_rejects_excess_jobs(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_QUEUE_LIMIT", 0)
+    rejected = get_hash_pool_stats()["rejected"]
+
+    with pytest.raises(HashQueueFullError):
+        await hash_password_async("secret")
+
+    assert get_hash_pool_stats()["rejected"] == rejected + 1
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.context import query_stats
+from app.db import instrumentation
+from app.db.instrumentation import QueryStats, normalize_sql
+
+pytestmark = pytest.mark.anyio
+
+
+def track_queries() -> QueryStats:
+    # Fixtures run in another context, so the test itself must set this
+    stats = QueryStats()
+    query_stats.set(stats)
+    return stats
+
+
+@pytest.fixture
+def warnings(monkeypatch):
+    messages = []
+    monkeypatch.setattr(
+        instrumentation.logger, "warning", lambda msg, *args: messages.append(msg)
+    )
+    return messages
+
+
+def test_normalize_sql_collapses_values():
+    first = normalize_sql(
+        "SELECT *\n FROM users WHERE u_id IN (%(p1)s, %(p2)s) AND age > 30"
+    )
+    second = normalize_sql("SELECT * FROM users WHERE u_id IN (?) AND age > 'x'")
+
+    assert first == second == "SELECT * FROM users WHERE u_id IN (?) AND age > ?"
+
+
+async def test_queries_are_attributed_to_current_request(db_session):
+    stats = track_queries()
+
+    await db_session.execute(text("SELECT 1"))
+    await db_session.execute(text("SELECT 2"))
+
+    assert stats.queries == 2
+    assert stats.db_time > 0
+    assert 'desc="2 queries"' in stats.server_timing()
+
+
+async def test_repeated_statement_warns_once(db_session, warnings, monkeypatch):
+    track_queries()
+    monkeypatch.setattr(settings, "DB_N_PLUS_ONE_THRESHOLD", 2)
+
+    for i in range(5):
+        await db_session.execute(text(f"SELECT {i}"))
+
+    assert len([m for m in warnings if m.startswith("Possible N+1")]) == 1
+
+
+async def test_slow_queries_are_logged(db_session, warnings, monkeypatch):
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0)
+
+    await db_session.execute(text("SELECT 42"))
+
+    assert len(warnings) == 1
+    assert warnings[0].startswith("Slow query (")
+    assert warnings[0].endswith("): SELECT ?")
+
+
+async def test_failed_statements_do_not_leave_start_times(db_session):
+    connection = await db_session.connection()
+
+    with pytest.raises(Exception):
+        await db_session.execute(text("SELECT * FROM missing_table"))
+    await db_session.execute(text("SELECT 1"))
+
+    assert connection.info["query_start"] == {}
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.pool import InstrumentedQueuePool, attach_pool_listeners, get_pool_stats
+from tests.conftest import DATABASE_URL
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def small_engine():
+    engine = create_async_engine(
+        DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    attach_pool_listeners(engine.pool)
+    yield engine
+    await engine.dispose()
+
+
+async def test_pool_stats_track_checkouts(small_engine):
+    async with small_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        stats = get_pool_stats(small_engine.pool)
+        assert stats["checked_out"] == 1
+
+    stats = get_pool_stats(small_engine.pool)
+    assert stats["pool_size"] == 1
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["checkins"] == 1
+    assert stats["connects"] == 1
+    assert stats["wait_time"]["count"] == 1
+
+
+async def test_pool_stats_count_checkout_timeouts(small_engine):
+    async with small_engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            async with small_engine.connect():
+                pass
+
+    assert get_pool_stats(small_engine.pool)["timeouts"] == 1
+
+
+async def test_pool_stats_survive_dispose(small_engine):
+    async with small_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    await small_engine.dispose()
+
+    async with small_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert get_pool_stats(small_engine.pool)["checkouts"] == 2
@@ -0,0 +1,219 @@
+import time
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.context import deadline
+from app.db import resilience
+from app.db.pool import InstrumentedQueuePool, get_pool_stats
+from app.db.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    attach_breaker,
+    is_transient,
+    retrying,
+)
+from app.dependencies import get_read_db
+from app.main import app
+from tests.conftest import DATABASE_URL
+
+pytestmark = pytest.mark.anyio
+
+
+class DriverError(Exception):
+    def __init__(self, sqlstate=None, sqlite_errorcode=None):
+        super().__init__(sqlstate or "driver error")
+        self.sqlstate = sqlstate
+        if sqlite_errorcode is not None:
+            self.sqlite_errorcode = sqlite_errorcode
+
+
+def dbapi_error(cls, sqlstate=None, sqlite_errorcode=None):
+    return cls("SELECT 1", {}, DriverError(sqlstate, sqlite_errorcode))
+
+
+@pytest.fixture
+async def breaker_engine():
+    engine = create_async_engine(DATABASE_URL, poolclass=InstrumentedQueuePool)
+    breaker = CircuitBreaker(threshold=2, reset_seconds=60)
+    attach_breaker(engine.sync_engine, breaker)
+    yield engine, breaker
+    await engine.dispose()
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(resilience.settings, "DB_RETRY_BASE_DELAY", 0.001)
+    monkeypatch.setattr(resilience.settings, "DB_RETRY_ATTEMPTS", 3)
+
+
+@pytest.mark.parametrize(
+    "error, transient",
+    [
+        (dbapi_error(exc.OperationalError), True),
+        (dbapi_error(exc.OperationalError, "08006"), True),
+        (dbapi_error(exc.OperationalError, "40P01"), True),
+        (dbapi_error(exc.DBAPIError, "40001"), True),
+        (dbapi_error(exc.OperationalError, sqlite_errorcode=5), True),
+        (dbapi_error(exc.OperationalError, sqlite_errorcode=261), True),
+        (dbapi_error(exc.OperationalError, sqlite_errorcode=1), False),
+        (exc.TimeoutError("pool exhausted"), True),
+        (dbapi_error(exc.IntegrityError, "23505"), False),
+        (dbapi_error(exc.IntegrityError), False),
+        (dbapi_error(exc.OperationalError, "57014"), False),
+        (dbapi_error(exc.ProgrammingError, "42P01"), False),
+        (CircuitOpenError(1.0), False),
+        (ValueError("bug"), False),
+    ],
+)
+def test_is_transient_classifies_errors(error, transient):
+    assert is_transient(error) is transient
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(threshold=3, reset_seconds=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError) as raised:
+        breaker.before_call()
+    assert 59 < raised.value.retry_after <= 60
+
+
+def test_breaker_lets_one_probe_through_after_reset(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(threshold=1, reset_seconds=10)
+    breaker.record_failure()
+
+    now[0] += 10
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Only the probe goes through while its outcome is pending
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    now[0] += 10
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+
+
+def test_breaker_frees_a_probe_that_never_reports(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(threshold=1, reset_seconds=10)
+    breaker.record_failure()
+    now[0] += 10
+    breaker.before_call()
+
+    now[0] += 10
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+async def run(attempts, retryable=True):
+    """Call through retrying(), failing with the queued errors first."""
+    calls = 0
+    async for attempt in retrying(retryable):
+        with attempt:
+            calls += 1
+            if attempts:
+                raise attempts.pop(0)
+    return calls
+
+
+async def test_retrying_retries_transient_errors(fast_retries):
+    errors = [dbapi_error(exc.OperationalError), dbapi_error(exc.OperationalError)]
+    assert await run(errors) == 3
+
+
+async def test_retrying_gives_up_after_the_attempt_limit(fast_retries):
+    errors = [dbapi_error(exc.OperationalError) for _ in range(5)]
+    with pytest.raises(exc.OperationalError):
+        await run(errors)
+    assert len(errors) == 2
+
+
+async def test_retrying_raises_permanent_errors_at_once(fast_retries):
+    errors = [dbapi_error(exc.IntegrityError, "23505")]
+    with pytest.raises(exc.IntegrityError):
+        await run(errors)
+    assert not errors
+
+
+async def test_retrying_does_not_retry_when_not_retryable(fast_retries):
+    errors = [dbapi_error(exc.OperationalError), dbapi_error(exc.OperationalError)]
+    with pytest.raises(exc.OperationalError):
+        await run(errors, retryable=False)
+    assert len(errors) == 1
+
+
+async def test_retrying_stops_at_the_request_deadline(fast_retries):
+    errors = [dbapi_error(exc.OperationalError), dbapi_error(exc.OperationalError)]
+    token = deadline.set(time.monotonic())
+    try:
+        with pytest.raises(exc.OperationalError):
+            await run(errors)
+    finally:
+        deadline.reset(token)
+    assert len(errors) == 1
+
+
+async def test_open_breaker_fails_checkouts_fast(breaker_engine):
+    engine, breaker = breaker_engine
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        with pytest.raises(exc.OperationalError):
+            await conn.execute(text("SELECT * FROM missing_table"))
+    # Bad SQL is not the database being down
+    assert breaker.failures == 0
+
+    breaker.record_failure()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        async with engine.connect():
+            pass
+    assert get_pool_stats(engine.pool)["breaker"]["state"] == CircuitBreaker.OPEN
+
+
+async def test_statement_success_closes_half_open_breaker(breaker_engine):
+    engine, breaker = breaker_engine
+    breaker.reset_seconds = 0
+    breaker.record_failure()
+    breaker.record_failure()
+    async with engine.connect() as conn:
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        await conn.execute(text("SELECT 1"))
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_open_breaker_returns_503(breaker_engine, async_client):
+    engine, breaker = breaker_engine
+    breaker.record_failure()
+    breaker.record_failure()
+
+    async def breaker_db():
+        async with async_sessionmaker(bind=engine)() as db:
+            yield db
+
+    app.dependency_overrides[get_read_db] = breaker_db
+    response = await async_client.get("/users/uid_missing")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "60"
+    assert response.json()["code"] == 503
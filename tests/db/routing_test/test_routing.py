@@ -0,0 +1,137 @@
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.requests import Request
+
+from app import dependencies
+from app.db import routing
+from app.db.routing import Replica, SessionRouter
+from app.models.base import Base
+from app.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def databases(tmp_path):
+    """A primary and two replicas, each holding one user named after it."""
+    engines = {}
+    for name in ("primary", "replica0", "replica1"):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                User.__table__.insert().values(u_id=name, u_username=name)
+            )
+        engines[name] = engine
+    yield engines
+    for engine in engines.values():
+        await engine.dispose()
+
+
+def build_router(engines, **kwargs) -> SessionRouter:
+    factories = {name: async_sessionmaker(bind=e) for name, e in engines.items()}
+    replicas = [
+        Replica(name, engines[name], factories[name])
+        for name in engines
+        if name != "primary"
+    ]
+    return SessionRouter(factories["primary"], replicas, **kwargs)
+
+
+async def served_by(session_factory) -> str:
+    async with session_factory() as db:
+        return (await db.execute(select(User.u_id))).scalar_one()
+
+
+def make_request(method: str, session_id: str = "client-a") -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": method,
+            "path": "/users/",
+            "headers": [(b"x-session-id", session_id.encode())],
+            "client": ("127.0.0.1", 5000),
+        }
+    )
+
+
+async def test_reads_round_robin_and_writes_use_primary(databases):
+    router = build_router(databases)
+
+    reads = [await served_by(router.route(True)[0]) for _ in range(4)]
+
+    assert reads == ["replica0", "replica1", "replica0", "replica1"]
+    assert await served_by(router.route(False)[0]) == "primary"
+
+
+async def test_reads_follow_own_writes_to_primary(databases):
+    router = build_router(databases, read_your_writes=60)
+
+    router.record_write("client-a")
+
+    assert await served_by(router.route(True, "client-a")[0]) == "primary"
+    assert await served_by(router.route(True, "client-b")[0]) != "primary"
+
+
+async def test_read_your_writes_window_expires(databases):
+    router = build_router(databases, read_your_writes=0)
+
+    router.record_write("client-a")
+
+    assert router.route(True, "client-a")[1] is not None
+
+
+async def test_health_check_ejects_failed_and_lagging_replicas(
+    databases, tmp_path, monkeypatch
+):
+    databases["replica0"] = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica0.db'}"
+    )
+    databases["replica2"] = databases.pop("replica1")
+    router = build_router(databases, max_lag=5)
+    lagging = {databases["replica2"]}
+
+    async def fake_lag(conn):
+        return 60.0 if conn.engine in lagging else 0.0
+
+    monkeypatch.setattr(routing, "measure_lag", fake_lag)
+    await router.check_health()
+
+    assert [r.available for r in router.replicas] == [False, False]
+    assert await served_by(router.route(True)[0]) == "primary"
+
+    lagging.clear()
+    await router.check_health()
+
+    assert [r.name for r in router.replicas if r.available] == ["replica2"]
+
+
+async def test_get_db_records_writes_for_the_session_header(databases, monkeypatch):
+    router = build_router(databases, read_your_writes=60)
+    monkeypatch.setattr(dependencies, "session_router", router)
+
+    writer = dependencies.get_db(make_request("POST"))
+    db = await writer.__anext__()
+    await db.execute(text("SELECT 1"))
+    with pytest.raises(StopAsyncIteration):
+        await writer.__anext__()
+
+    reader = dependencies.get_db(make_request("GET"))
+    assert (
+        await (await reader.__anext__()).execute(select(User.u_id))
+    ).scalar_one() == ("primary")
+    await reader.aclose()
+
+
+async def test_get_db_ejects_replica_on_connection_error(databases, monkeypatch):
+    router = build_router(databases)
+    monkeypatch.setattr(dependencies, "session_router", router)
+
+    reader = dependencies.get_db(make_request("GET"))
+    await reader.__anext__()
+    with pytest.raises(OperationalError):
+        await reader.athrow(OperationalError("SELECT 1", {}, Exception("gone")))
+
+    assert [r.available for r in router.replicas] == [False, True]
@@ -0,0 +1,116 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import deadline as deadline_module
+from app.core.context import deadline
+from app.core.deadline import DeadlineExceededError, request_timeout
+from app.db.timeouts import _set_statement_timeout, attach_statement_timeouts
+from tests.conftest import DATABASE_URL
+
+pytestmark = pytest.mark.anyio
+
+ENDLESS_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) "
+    "SELECT count(*) FROM c"
+)
+
+
+@pytest.fixture
+async def timed_engine():
+    engine = create_async_engine(DATABASE_URL)
+    attach_statement_timeouts(engine.sync_engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def route_timeouts(monkeypatch):
+    monkeypatch.setattr(deadline_module.settings, "REQUEST_TIMEOUT", 10.0)
+    monkeypatch.setattr(deadline_module.settings, "REQUEST_TIMEOUT_MAX", 30.0)
+    monkeypatch.setattr(
+        deadline_module,
+        "ROUTE_TIMEOUTS",
+        deadline_module._parse_route_timeouts("/users:5,/users/export:0"),
+    )
+
+
+@pytest.mark.parametrize(
+    "path, header, expected",
+    [
+        ("/metrics", None, 10.0),
+        ("/users/uid_1", None, 5.0),
+        ("/users/export", None, None),
+        ("/users/uid_1", "2.5", 2.5),
+        ("/users/uid_1", "300", 30.0),
+        ("/users/export", "20", 20.0),
+        ("/users/uid_1", "soon", 5.0),
+        ("/users/uid_1", "0", 5.0),
+    ],
+)
+def test_request_timeout(route_timeouts, path, header, expected):
+    assert request_timeout(path, header) == expected
+
+
+async def test_sqlite_statement_is_interrupted_at_the_deadline(timed_engine):
+    async with timed_engine.connect() as conn:
+        token = deadline.set(time.monotonic() + 0.1)
+        started = time.monotonic()
+        try:
+            with pytest.raises(DeadlineExceededError):
+                await conn.execute(ENDLESS_QUERY)
+        finally:
+            deadline.reset(token)
+        assert time.monotonic() - started < 2
+        # The connection is still usable once the deadline is gone
+        assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+
+
+async def test_statement_after_the_deadline_is_not_sent(timed_engine):
+    async with timed_engine.connect() as conn:
+        token = deadline.set(time.monotonic() - 1)
+        try:
+            with pytest.raises(DeadlineExceededError):
+                await conn.execute(text("SELECT 1"))
+        finally:
+            deadline.reset(token)
+
+
+async def test_statements_without_a_deadline_run_unbounded(timed_engine):
+    async with timed_engine.connect() as conn:
+        assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+        assert not conn.sync_connection.info.get("interrupt_timer")
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+
+
+def postgres_context(autocommit=False):
+    options = {"isolation_level": "AUTOCOMMIT"} if autocommit else {}
+    return SimpleNamespace(execution_options=options)
+
+
+def test_postgres_timeout_is_local_to_the_transaction():
+    conn, cursor = SimpleNamespace(info={}), RecordingCursor()
+    _set_statement_timeout(conn, cursor, postgres_context(), 1.2345)
+    assert cursor.statements == ["SET LOCAL statement_timeout = 1235"]
+    assert conn.info == {}
+
+
+def test_postgres_autocommit_timeout_is_reset_afterwards():
+    conn, cursor = SimpleNamespace(info={}), RecordingCursor()
+    _set_statement_timeout(conn, cursor, postgres_context(autocommit=True), 0.5)
+    _set_statement_timeout(conn, cursor, postgres_context(autocommit=True), None)
+    _set_statement_timeout(conn, cursor, postgres_context(autocommit=True), None)
+    assert cursor.statements == [
+        "SET statement_timeout = 500",
+        "SET statement_timeout = DEFAULT",
+    ]
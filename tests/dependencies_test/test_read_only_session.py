@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette.requests import Request
+
+from app import dependencies
+from app.core.context import query_stats
+from app.db.instrumentation import QueryStats
+from app.db.routing import SessionRouter
+from app.models.user import User
+from tests.conftest import TestingSessionLocal, engine
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def committed_user(monkeypatch):
+    router = SessionRouter(
+        TestingSessionLocal,
+        primary_autocommit=async_sessionmaker(
+            bind=engine.execution_options(isolation_level="AUTOCOMMIT")
+        ),
+    )
+    monkeypatch.setattr(dependencies, "session_router", router)
+    async with TestingSessionLocal() as db:
+        db.add(User(u_id="reader", u_username="reader", u_password="x"))
+        await db.commit()
+    yield
+    async with TestingSessionLocal() as db:
+        await db.execute(delete(User))
+        await db.commit()
+
+
+async def round_trips(dependency) -> int:
+    """Round-trips for one get-by-id request served through ``dependency``."""
+    stats = QueryStats()
+    query_stats.set(stats)
+    request = Request({"type": "http", "method": "GET", "headers": []})
+    session = dependency(request)
+    db = await session.__anext__()
+    user = (await db.execute(select(User).filter_by(u_id="reader"))).scalar_one()
+    assert user.u_username == "reader"
+    with pytest.raises(StopAsyncIteration):
+        await session.__anext__()
+    return stats.round_trips
+
+
+async def test_read_only_session_skips_transaction_round_trips(committed_user):
+    # BEGIN + SELECT + COMMIT versus the SELECT alone
+    assert await round_trips(dependencies.get_db) == 3
+    assert await round_trips(dependencies.get_read_db) == 1
+
+
+async def test_unused_read_only_session_never_connects(committed_user):
+    stats = QueryStats()
+    query_stats.set(stats)
+    session = dependencies.get_read_db(
+        Request({"type": "http", "method": "GET", "headers": []})
+    )
+
+    db = await session.__anext__()
+    with pytest.raises(StopAsyncIteration):
+        await session.__anext__()
+
+    assert not db.in_transaction()
+    assert stats.round_trips == 0
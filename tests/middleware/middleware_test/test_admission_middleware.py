@@ -0,0 +1,81 @@
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.admission import ConcurrencyLimiter, RateLimiter
+from app.dependencies import get_read_db
+from app.main import app
+from app.middleware.admission import AdmissionMiddleware
+from app.middleware.language import LanguageMiddleware
+
+pytestmark = pytest.mark.anyio
+
+
+async def slow(request):
+    await asyncio.sleep(float(request.query_params.get("sleep", "0")))
+    return JSONResponse({"ok": True})
+
+
+@pytest.fixture
+def limiter():
+    return ConcurrencyLimiter("test", 1, queue_size=0)
+
+
+@pytest.fixture
+async def limited_client(limiter):
+    inner = Starlette(routes=[Route("/slow", slow), Route("/free", slow)])
+    wrapped = LanguageMiddleware(
+        AdmissionMiddleware(
+            inner,
+            limiters=[("/free", None), ("", limiter)],
+            rate_limiters=[("/slow", RateLimiter("/slow", rate=1, burst=2))],
+        )
+    )
+    transport = httpx.ASGITransport(app=wrapped)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+async def test_over_the_limit_gets_503_with_retry_after(limited_client, limiter):
+    busy = asyncio.create_task(limited_client.get("/slow", params={"sleep": 0.1}))
+    await asyncio.sleep(0.02)
+    response = await limited_client.get("/slow", headers={"lang": "en"})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    body = response.json()
+    assert (body["code"], body["status"]) == (503, "error")
+    assert (await busy).status_code == 200
+    assert limiter.in_flight == 0
+
+
+async def test_unlimited_prefix_is_not_queued(limited_client):
+    busy = asyncio.create_task(limited_client.get("/slow", params={"sleep": 0.1}))
+    await asyncio.sleep(0.02)
+    assert (await limited_client.get("/free")).status_code == 200
+    await busy
+
+
+async def test_client_over_its_rate_gets_429(limited_client):
+    statuses = [(await limited_client.get("/slow")).status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+
+    response = await limited_client.get("/slow", headers={"lang": "en"})
+    assert response.headers["retry-after"] == "1"
+    assert response.json()["message"] == "Too many requests, please retry later"
+
+
+async def test_pool_timeout_is_503_not_500(async_client):
+    async def exhausted_pool():
+        raise PoolTimeoutError("QueuePool limit reached")
+        yield
+
+    app.dependency_overrides[get_read_db] = exhausted_pool
+    response = await async_client.get("/users/uid_1")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,65 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.context import request_id
+from app.core.logging import RequestLoggingMiddleware
+from app.middleware.language import LanguageMiddleware
+
+
+@pytest.fixture(scope="module")
+def middleware_client():
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(LanguageMiddleware)
+
+    @app.get("/context")
+    async def context(request: Request):
+        return {"lang": request.state.lang, "request_id": request_id.get()}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"{i}:{request_id.get()}\n"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    with TestClient(app) as c:
+        yield c
+
+
+def test_language_defaults_to_vi(middleware_client):
+    assert middleware_client.get("/context").json()["lang"] == "vi"
+
+
+def test_language_read_from_header(middleware_client):
+    response = middleware_client.get("/context", headers={"lang": "en"})
+
+    assert response.json()["lang"] == "en"
+
+
+def test_request_id_visible_in_handler(middleware_client):
+    first = middleware_client.get("/context").json()["request_id"]
+    second = middleware_client.get("/context").json()["request_id"]
+
+    assert first != "0000"
+    assert first != second
+    assert request_id.get() == "0000"
+
+
+def test_streaming_body_keeps_request_context(middleware_client):
+    lines = middleware_client.get("/stream").text.splitlines()
+
+    ids = {line.split(":")[1] for line in lines}
+    assert len(lines) == 3
+    assert len(ids) == 1 and "0000" not in ids
+
+
+def test_server_timing_header(middleware_client):
+    response = middleware_client.get("/context")
+
+    assert response.headers["server-timing"] == (
+        'db;dur=0.0;desc="0 queries", pool;dur=0.0'
+    )
@@ -0,0 +1,114 @@
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware import compression
+from app.middleware.compression import CompressionMiddleware, choose_encoding
+
+BIG = {"items": ["user_%d" % i for i in range(500)]}
+
+
+@pytest.fixture(scope="module")
+def compressing_client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=200)
+
+    @app.get("/big")
+    async def big():
+        return JSONResponse(BIG)
+
+    @app.get("/small")
+    async def small():
+        return JSONResponse({"ok": True})
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" * 500, media_type="image/png")
+
+    @app.get("/not-modified")
+    async def not_modified():
+        return Response(status_code=304, headers={"ETag": 'W/"x"'})
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for i in range(100):
+                yield f'{{"n": {i}, "pad": "{"x" * 50}"}}\n'
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    with TestClient(app) as c:
+        yield c
+
+
+def raw_get(client, path, accept_encoding="gzip"):
+    # httpx would transparently decode; read the bytes as sent instead
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as r:
+        return r, b"".join(r.iter_raw())
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, deflate", "gzip"),
+        ("br;q=1.0, gzip;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("*", "gzip"),
+        ("*;q=0.5, gzip;q=0", None),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_choose_encoding_without_brotli(monkeypatch, header, expected):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding(header) == expected
+
+
+def test_choose_encoding_prefers_brotli_when_installed(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", object())
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("gzip;q=1, br;q=0.5") == "gzip"
+
+
+def test_large_json_is_gzipped(compressing_client):
+    response, body = raw_get(compressing_client, "/big")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(body)
+    assert gzip.decompress(body) == JSONResponse(BIG).body
+    assert len(body) < len(JSONResponse(BIG).body) / 3
+
+
+def test_small_and_binary_bodies_are_left_alone(compressing_client):
+    for path in ("/small", "/image"):
+        response, _ = raw_get(compressing_client, path)
+        assert "content-encoding" not in response.headers
+
+
+def test_identity_clients_get_plain_bodies(compressing_client):
+    response, body = raw_get(compressing_client, "/big", accept_encoding="identity")
+
+    assert "content-encoding" not in response.headers
+    assert body == JSONResponse(BIG).body
+
+
+def test_not_modified_passes_through(compressing_client):
+    response, body = raw_get(compressing_client, "/not-modified")
+
+    assert response.status_code == 304
+    assert "content-encoding" not in response.headers
+    assert body == b""
+
+
+def test_streamed_body_is_compressed_per_chunk(compressing_client):
+    response, body = raw_get(compressing_client, "/stream")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    lines = zlib.decompress(body, 31).decode().splitlines()
+    assert len(lines) == 100
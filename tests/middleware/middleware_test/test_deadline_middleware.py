@@ -0,0 +1,61 @@
+import asyncio
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.context import deadline
+from app.core.deadline import DeadlineExceededError
+from app.dependencies import get_read_db
+from app.main import app
+from app.middleware.deadline import DeadlineMiddleware
+from app.middleware.language import LanguageMiddleware
+
+pytestmark = pytest.mark.anyio
+
+
+async def slow(request):
+    await asyncio.sleep(float(request.query_params.get("sleep", "0")))
+    return JSONResponse({"deadline_set": deadline.get() is not None})
+
+
+@pytest.fixture
+async def slow_client():
+    inner = Starlette(routes=[Route("/slow", slow)])
+    wrapped = LanguageMiddleware(DeadlineMiddleware(inner))
+    transport = httpx.ASGITransport(app=wrapped)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+async def test_request_within_budget_sees_its_deadline(slow_client):
+    response = await slow_client.get("/slow")
+    assert response.status_code == 200
+    assert response.json() == {"deadline_set": True}
+    assert deadline.get() is None
+
+
+async def test_request_over_budget_gets_504(slow_client):
+    response = await slow_client.get(
+        "/slow",
+        params={"sleep": 5},
+        headers={"X-Request-Timeout": "0.05", "lang": "en"},
+    )
+    assert response.status_code == 504
+    body = response.json()
+    assert body["code"] == 504
+    assert body["status"] == "error"
+    assert body["message"] == "The request took too long to process"
+
+
+async def test_deadline_error_from_the_database_is_504(async_client):
+    async def expired_db():
+        raise DeadlineExceededError("query cancelled at the request deadline")
+        yield
+
+    app.dependency_overrides[get_read_db] = expired_db
+    response = await async_client.get("/users/uid_1")
+    assert response.status_code == 504
+    assert response.json()["code"] == 504
@@ -0,0 +1,91 @@
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.messages import MessageCode, get_message
+from app.middleware import response as response_module
+from app.middleware.response import (
+    build_json_response,
+    build_response,
+    envelope_adapter,
+)
+from app.models.user import User
+from app.schemas.response import APIResponse
+from app.schemas.user import UserResponse
+
+USERS = [
+    User(
+        u_id=f"id-{i}",
+        u_username=f"user-{i}",
+        u_password="secret",
+        created_at=datetime(2024, 1, 1, 8, i, tzinfo=timezone.utc),
+        updated_at=datetime(2024, 1, 2),
+        created_by="SYS",
+        updated_by=None,
+    )
+    for i in range(3)
+]
+META = {"total": 3, "page_no": 1, "next_cursor": None, "has_next": False}
+MESSAGE = get_message(MessageCode.USER_LIST_RETRIEVED, "vi")
+
+
+@pytest.fixture(scope="module")
+def envelope_client():
+    app = FastAPI()
+
+    @app.get("/model", response_model=APIResponse[List[UserResponse]])
+    async def via_model(request: Request):
+        return build_response(request=request, data=USERS, message=MESSAGE, meta=META)
+
+    @app.get("/fast", response_model=APIResponse[List[UserResponse]])
+    async def via_fast_path(request: Request):
+        return build_json_response(
+            request=request,
+            adapter=envelope_adapter(List[UserResponse]),
+            data=USERS,
+            message=MESSAGE,
+            meta=META,
+        )
+
+    @app.get("/one-model", response_model=APIResponse[UserResponse], status_code=201)
+    async def one_via_model(request: Request):
+        return build_response(request=request, data=USERS[0], code=201)
+
+    @app.get("/one-fast", response_model=APIResponse[UserResponse])
+    async def one_via_fast_path(request: Request):
+        return build_json_response(
+            request=request,
+            adapter=envelope_adapter(UserResponse),
+            data=USERS[0],
+            code=201,
+        )
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def frozen_timestamp(monkeypatch):
+    monkeypatch.setattr(
+        response_module, "_utc_timestamp", lambda: "2024-01-01T00:00:00Z"
+    )
+
+
+def test_list_envelope_is_byte_identical(envelope_client):
+    slow = envelope_client.get("/model")
+    fast = envelope_client.get("/fast")
+
+    assert fast.status_code == slow.status_code == 200
+    assert fast.headers["content-type"] == slow.headers["content-type"]
+    assert fast.content.replace(b"/fast", b"/model") == slow.content
+
+
+def test_single_envelope_is_byte_identical(envelope_client):
+    slow = envelope_client.get("/one-model")
+    fast = envelope_client.get("/one-fast")
+
+    assert fast.status_code == slow.status_code == 201
+    assert fast.content.replace(b"/one-fast", b"/one-model") == slow.content
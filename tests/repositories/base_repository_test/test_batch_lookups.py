@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+from sqlalchemy import delete
+
+from app.core.context import request_id
+from app.models.user import User
+from app.repositories.batch_loader import BatchLoader
+from app.repositories.user_repository import UserRepository
+from tests.conftest import TestingSessionLocal
+from tests.repositories.base_repository_test.test_data_base_repository import (
+    insert_users,
+)
+
+pytestmark = pytest.mark.anyio
+
+user_repo = UserRepository()
+
+
+async def test_find_many_by_ids_keeps_input_order(db_session):
+    await insert_users(db_session, 5)
+
+    users = await user_repo.find_many_by_ids(
+        db_session, ["user03", "missing", "user00", "user03", "user04"], chunk_size=2
+    )
+
+    assert [user.u_id for user in users] == ["user03", "user00", "user04"]
+
+
+async def test_lookups_of_separate_sessions_share_one_query():
+    async with TestingSessionLocal() as db:
+        await insert_users(db, 5)
+        await db.commit()
+    ids = ["user00", "user01", "user02", "missing"]
+    before = user_repo.batch_loader.batches
+
+    async def lookup(user_id):
+        # One session per lookup, like concurrent requests
+        async with TestingSessionLocal() as db:
+            return await user_repo.get_by_id(db, user_id)
+
+    try:
+        users = await asyncio.gather(*(lookup(i) for i in ids))
+    finally:
+        async with TestingSessionLocal() as db:
+            await db.execute(delete(User))
+            await db.commit()
+
+    assert [user and user.u_id for user in users] == [
+        "user00",
+        "user01",
+        "user02",
+        None,
+    ]
+    assert user_repo.batch_loader.batches == before + 1
+
+
+async def test_session_in_a_transaction_sees_its_own_rows(db_session):
+    await insert_users(db_session, 2)
+    before = user_repo.batch_loader.batches
+
+    user = await user_repo.get_by_id(db_session, "user01")
+
+    assert user.u_id == "user01"
+    assert user_repo.batch_loader.batches == before
+
+
+async def test_batch_loader_splits_at_max_batch_size():
+    calls = []
+
+    async def load_many(db, keys):
+        calls.append(keys)
+        return {key: key * 2 for key in keys}
+
+    loader = BatchLoader(load_many, window=0.05, max_batch_size=3)
+
+    results = await asyncio.gather(*(loader.load(None, i) for i in range(5)))
+
+    assert results == [0, 2, 4, 6, 8]
+    assert calls == [[0, 1, 2], [3, 4]]
+    assert loader.stats()["batch_size"]["count"] == 2
+
+
+async def test_batch_loader_only_merges_loads_of_the_same_group():
+    calls = []
+
+    async def load_many(db, keys):
+        calls.append((db, keys))
+        return {key: (db, key) for key in keys}
+
+    loader = BatchLoader(load_many, window=0.05, max_batch_size=10)
+
+    results = await asyncio.gather(
+        loader.load("a", 1), loader.load("b", 1), loader.load("a", 2)
+    )
+
+    assert results == [("a", 1), ("b", 1), ("a", 2)]
+    assert sorted(calls) == [("a", [1, 2]), ("b", [1])]
+
+
+async def test_batch_loader_runs_outside_the_callers_context():
+    seen = []
+
+    async def load_many(group, keys):
+        seen.append(request_id.get())
+        return {key: key for key in keys}
+
+    loader = BatchLoader(load_many, window=0.01, max_batch_size=10)
+    token = request_id.set("caller")
+    try:
+        assert await loader.load(None, 1) == 1
+    finally:
+        request_id.reset(token)
+
+    assert seen == [request_id.get()]
+    assert seen != ["caller"]
+
+
+async def test_batch_loader_fans_out_errors():
+    async def load_many(db, keys):
+        raise RuntimeError("boom")
+
+    loader = BatchLoader(load_many, window=0, max_batch_size=10)
+
+    results = await asyncio.gather(
+        loader.load(None, 1), loader.load(None, 2), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,127 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import psycopg
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.repositories.user_repository import UserRepository
+from tests.repositories.base_repository_test.test_data_base_repository import (
+    build_users,
+    insert_users,
+)
+
+pytestmark = pytest.mark.anyio
+
+user_repo = UserRepository()
+
+
+async def usernames(db):
+    return {user.u_id: user.u_username for user in await user_repo.find_all(db)}
+
+
+async def test_bulk_update_sets_columns_by_primary_key(db_session):
+    await insert_users(db_session, 3)
+
+    changed = await user_repo.bulk_update(
+        db_session,
+        [
+            {"u_id": "user00", "u_username": "zero"},
+            {"u_id": "user02", "u_username": "two"},
+            {"u_id": "missing", "u_username": "nobody"},
+        ],
+    )
+
+    assert changed == 2
+    assert await usernames(db_session) == {
+        "user00": "zero",
+        "user01": "user01",
+        "user02": "two",
+    }
+
+
+async def test_bulk_update_invalidates_cached_entities(db_session):
+    await insert_users(db_session, 1)
+    await user_repo.get_by_id(db_session, "user00")
+
+    await user_repo.bulk_update(db_session, [{"u_id": "user00", "u_username": "new"}])
+
+    assert (await user_repo.get_by_id(db_session, "user00")).u_username == "new"
+
+
+async def test_upsert_inserts_and_updates(db_session):
+    await insert_users(db_session, 2)
+    rows = [
+        {"u_id": "user01", "u_username": "renamed", "u_password": "x"},
+        {"u_id": "user05", "u_username": "user05", "u_password": "x"},
+    ]
+
+    written = await user_repo.upsert(db_session, rows)
+
+    assert written == 2
+    assert await usernames(db_session) == {
+        "user00": "user00",
+        "user01": "renamed",
+        "user05": "user05",
+    }
+
+
+async def test_upsert_can_skip_conflicts(db_session):
+    await insert_users(db_session, 1)
+    rows = [{"u_id": "user00", "u_username": "ignored", "u_password": "x"}]
+
+    written = await user_repo.upsert(db_session, rows, update_columns=[])
+
+    assert written == 0
+    assert await usernames(db_session) == {"user00": "user00"}
+
+
+async def test_bulk_delete_by_ids_uses_chunks(db_session):
+    await insert_users(db_session, 5)
+    ids = [row["u_id"] for row in build_users(5)][:4] + ["missing"]
+
+    deleted = await user_repo.bulk_delete_by_ids(db_session, ids, chunk_size=2)
+
+    assert deleted == 4
+    assert await usernames(db_session) == {"user04": "user04"}
+
+
+class _FailingCopySession:
+    """Just enough of an AsyncSession on psycopg for _copy_rows, whose COPY
+    fails the way psycopg reports a duplicate key."""
+
+    def __init__(self):
+        self.engine = create_async_engine("postgresql+psycopg://u:p@localhost/db")
+        self.rolled_back = False
+
+    def get_bind(self):
+        return self.engine.sync_engine
+
+    async def connection(self):
+        return self
+
+    async def get_raw_connection(self):
+        return SimpleNamespace(driver_connection=self)
+
+    @asynccontextmanager
+    async def cursor(self):
+        yield self
+
+    @asynccontextmanager
+    async def copy(self, sql):
+        raise psycopg.errors.UniqueViolation("duplicate key value")
+        yield
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+async def test_copy_driver_errors_surface_as_sqlalchemy_errors():
+    db = _FailingCopySession()
+
+    with pytest.raises(IntegrityError) as raised:
+        await user_repo._copy_rows(db, build_users(1))
+
+    assert isinstance(raised.value.orig, psycopg.errors.UniqueViolation)
+    assert db.rolled_back
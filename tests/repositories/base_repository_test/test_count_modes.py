@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import delete
+
+from app.core.enum import CountMode
+from app.models.user import User
+from app.repositories.count_cache import CountCache
+from app.repositories.entity_cache import invalidate_committed
+from app.repositories.user_repository import UserRepository
+from tests.conftest import TestingSessionLocal
+from tests.repositories.base_repository_test.test_data_base_repository import (
+    build_users,
+    insert_users,
+)
+
+pytestmark = pytest.mark.anyio
+
+user_repo = UserRepository()
+
+
+@pytest.mark.parametrize(
+    "count_mode", [CountMode.EXACT, CountMode.ESTIMATE, CountMode.CACHED]
+)
+async def test_paginate_reports_total_for_counting_modes(db_session, count_mode):
+    await insert_users(db_session, 5)
+
+    result = await user_repo.paginate(
+        db_session, page=1, per_page=2, count_mode=count_mode
+    )
+
+    assert result["total"] == 5
+    assert result["pages"] == 3
+    assert result["has_next"]
+    assert result["count_mode"] == count_mode
+
+
+async def test_paginate_without_count_uses_extra_row(db_session):
+    await insert_users(db_session, 4)
+
+    first = await user_repo.paginate(
+        db_session, page=1, per_page=2, count_mode=CountMode.NONE
+    )
+    last = await user_repo.paginate(
+        db_session, page=2, per_page=2, count_mode=CountMode.NONE
+    )
+
+    assert first["total"] is None and first["pages"] is None
+    assert first["has_next"] and len(first["items"]) == 2
+    assert not last["has_next"] and last["has_prev"]
+
+
+async def test_cached_count_is_invalidated_by_inserts(db_session):
+    await insert_users(db_session, 3)
+    assert await user_repo.cached_count(db_session) == 3
+
+    await user_repo.create(db_session, build_users(4)[-1])
+
+    assert await user_repo.cached_count(db_session) == 4
+
+
+async def test_cached_count_is_reused_until_invalidated(db_session, monkeypatch):
+    await insert_users(db_session, 3)
+    assert await user_repo.cached_count(db_session) == 3
+
+    async def fail_count(*args, **kwargs):
+        raise AssertionError("count should have been served from cache")
+
+    monkeypatch.setattr(user_repo, "count", fail_count)
+    assert await user_repo.cached_count(db_session) == 3
+
+
+async def test_count_cached_before_commit_is_dropped_after_it():
+    try:
+        async with TestingSessionLocal() as writer, TestingSessionLocal() as reader:
+            await insert_users(writer, 2)
+            # A concurrent request counts (and caches) the committed rows
+            assert await user_repo.cached_count(reader) == 0
+
+            await writer.commit()
+            await invalidate_committed(writer)
+
+            assert await user_repo.cached_count(reader) == 2
+    finally:
+        async with TestingSessionLocal() as db:
+            await db.execute(delete(User))
+            await db.commit()
+
+
+def test_count_taken_before_an_invalidation_is_not_stored():
+    cache = CountCache(ttl=60)
+    key = cache.key("users")
+    generation = cache.generation("users")
+
+    cache.invalidate("users")
+    cache.set(key, 5, generation)
+
+    assert cache.get(key) is None
@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta, timezone
+
+from app.repositories.user_repository import UserRepository
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def build_users(count: int):
+    # Pairs of users share a created_at so the u_id tiebreak is exercised
+    return [
+        {
+            "u_id": f"user{i:02d}",
+            "u_username": f"user{i:02d}",
+            "u_password": "password",
+            "created_at": BASE_TIME + timedelta(minutes=i // 2),
+            "updated_at": BASE_TIME,
+        }
+        for i in range(count)
+    ]
+
+
+async def insert_users(db, count: int = 7):
+    await UserRepository().bulk_create(db, build_users(count))
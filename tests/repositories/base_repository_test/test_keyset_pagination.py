@@ -0,0 +1,76 @@
+import pytest
+
+from app.repositories.pagination import InvalidCursorError
+from app.repositories.user_repository import UserRepository
+from tests.repositories.base_repository_test.test_data_base_repository import (
+    insert_users,
+)
+
+pytestmark = pytest.mark.anyio
+
+user_repo = UserRepository()
+
+
+def ids(page):
+    return [user.u_id for user in page["items"]]
+
+
+async def test_keyset_walks_forward_newest_first(db_session):
+    await insert_users(db_session, 7)
+
+    first = await user_repo.paginate_keyset(db_session, per_page=3)
+    assert ids(first) == ["user06", "user05", "user04"]
+    assert first["has_next"] and not first["has_prev"]
+    assert first["prev_cursor"] is None
+
+    second = await user_repo.paginate_keyset(
+        db_session, cursor=first["next_cursor"], per_page=3
+    )
+    assert ids(second) == ["user03", "user02", "user01"]
+    assert second["has_next"] and second["has_prev"]
+
+    last = await user_repo.paginate_keyset(
+        db_session, cursor=second["next_cursor"], per_page=3
+    )
+    assert ids(last) == ["user00"]
+    assert not last["has_next"] and last["next_cursor"] is None
+
+
+async def test_keyset_walks_backward(db_session):
+    await insert_users(db_session, 7)
+
+    first = await user_repo.paginate_keyset(db_session, per_page=3)
+    second = await user_repo.paginate_keyset(
+        db_session, cursor=first["next_cursor"], per_page=3
+    )
+
+    back = await user_repo.paginate_keyset(
+        db_session, cursor=second["prev_cursor"], per_page=3
+    )
+    assert ids(back) == ids(first)
+    assert back["has_next"] and not back["has_prev"]
+
+
+async def test_keyset_rejects_garbage_cursor(db_session):
+    with pytest.raises(InvalidCursorError):
+        await user_repo.paginate_keyset(db_session, cursor="not-a-cursor")
+
+
+async def test_keyset_walk_over_server_default_timestamps(db_session):
+    # created_at comes from the database default, so several rows share it
+    await user_repo.bulk_create(
+        db_session,
+        [
+            {"u_id": f"user{i:02d}", "u_username": f"user{i:02d}", "u_password": "x"}
+            for i in range(4)
+        ],
+    )
+
+    seen, cursor = [], None
+    for _ in range(10):
+        page = await user_repo.paginate_keyset(db_session, cursor=cursor, per_page=1)
+        seen += ids(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == ["user00", "user01", "user02", "user03"]
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from app.repositories.user_repository import UserRepository
+from tests.repositories.base_repository_test.test_data_base_repository import (
+    insert_users,
+)
+
+pytestmark = pytest.mark.anyio
+
+user_repo = UserRepository()
+
+
+def test_select_loads_requested_and_key_columns_only():
+    sql = str(user_repo._select(["u_username"]))
+
+    for name in ("u_username", "u_id", "created_at"):
+        assert f"users.{name}" in sql
+    for name in ("u_password", "updated_at", "created_by"):
+        assert f"users.{name}" not in sql
+
+
+def test_select_rejects_unknown_columns():
+    with pytest.raises(ValueError):
+        user_repo._select(["u_username", "nope"])
+
+
+async def test_projected_rows_refuse_unloaded_attributes(db_session):
+    await insert_users(db_session, 3)
+
+    result = await user_repo.paginate(
+        db_session, per_page=2, order_by=user_repo.keyset_columns, fields=["u_username"]
+    )
+
+    assert [user.u_username for user in result["items"]] == ["user00", "user01"]
+    with pytest.raises(InvalidRequestError):
+        result["items"][0].u_password
+
+
+async def test_keyset_pages_work_on_projected_rows(db_session):
+    await insert_users(db_session, 3)
+
+    first = await user_repo.paginate_keyset(db_session, per_page=2, fields=["u_id"])
+    second = await user_repo.paginate_keyset(
+        db_session, cursor=first["next_cursor"], per_page=2, fields=["u_id"]
+    )
+
+    ids = [user.u_id for user in first["items"] + second["items"]]
+    assert sorted(ids) == ["user00", "user01", "user02"]
@@ -0,0 +1,38 @@
+import pytest
+
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+from tests.repositories.base_repository_test.test_data_base_repository import (
+    insert_users,
+)
+
+pytestmark = pytest.mark.anyio
+
+user_repo = UserRepository()
+
+
+async def test_stream_yields_bounded_batches(db_session):
+    await insert_users(db_session, 7)
+
+    batches = [
+        batch
+        async for batch in user_repo.stream(
+            db_session, order_by=User.u_id, batch_size=3
+        )
+    ]
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert batches[0][0].u_id == "user00"
+
+
+async def test_stream_columns_yields_mappings(db_session):
+    await insert_users(db_session, 2)
+
+    batches = [
+        batch
+        async for batch in user_repo.stream(
+            db_session, columns=[User.u_id], filters=[User.u_id == "user01"]
+        )
+    ]
+
+    assert [dict(row) for batch in batches for row in batch] == [{"u_id": "user01"}]
@@ -0,0 +1,198 @@
+import asyncio
+import fnmatch
+import sys
+from datetime import datetime
+
+import pytest
+from sqlalchemy import delete
+
+from app.core.config import settings
+from app.models.user import User
+from app.repositories.entity_cache import (
+    MISS,
+    EntityCache,
+    MemoryCacheBackend,
+    SharedCacheBackend,
+    build_entity_cache,
+    invalidate_committed,
+)
+from app.repositories.user_repository import UserRepository
+from tests.conftest import TestingSessionLocal
+from tests.repositories.base_repository_test.test_data_base_repository import (
+    build_users,
+    insert_users,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio client."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def scan_iter(self, match):
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+
+async def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(maxsize=2)
+    await backend.set("a", 1, ttl=60)
+    await backend.set("b", 2, ttl=60)
+    await backend.get("a")
+    await backend.set("c", 3, ttl=60)
+
+    assert await backend.get("b") is MISS
+    assert await backend.get("a") == 1
+    assert backend.evictions == 1
+
+
+async def test_memory_backend_expires_entries():
+    backend = MemoryCacheBackend()
+    await backend.set("a", 1, ttl=-1)
+
+    assert await backend.get("a") is MISS
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = EntityCache(MemoryCacheBackend())
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"id": 1}
+
+    results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(10)))
+
+    assert calls == 1
+    assert all(result == {"id": 1} for result in results)
+    assert cache.stats()["coalesced"] == 9
+
+
+async def test_missing_rows_are_negatively_cached():
+    cache = EntityCache(MemoryCacheBackend())
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        return None
+
+    assert await cache.get_or_load("k", loader) is None
+    assert await cache.get_or_load("k", loader) is None
+    assert calls == 1
+    assert cache.stats()["negative_hits"] == 1
+
+
+async def test_repository_reads_through_and_invalidates_on_update(db_session):
+    user_repo = UserRepository()
+    await insert_users(db_session, 1)
+
+    first = await user_repo.get_by_id(db_session, "user00")
+    await user_repo.get_by_id(db_session, "user00")
+    assert first.u_username == "user00"
+    assert user_repo.entity_cache.stats()["hits"] == 1
+
+    await user_repo.update_by_id(db_session, "user00", {"u_username": "renamed"})
+
+    assert (await user_repo.get_by_id(db_session, "user00")).u_username == "renamed"
+
+
+async def test_repository_invalidates_negative_entry_on_insert(db_session):
+    user_repo = UserRepository()
+    assert await user_repo.get_by_id(db_session, "user00") is None
+
+    await user_repo.create(db_session, build_users(1)[0])
+
+    assert await user_repo.get_by_id(db_session, "user00") is not None
+
+
+async def test_repository_invalidates_on_delete(db_session):
+    user_repo = UserRepository()
+    await insert_users(db_session, 1)
+    assert await user_repo.get_by_id(db_session, "user00") is not None
+
+    assert await user_repo.delete_by_id(db_session, "user00")
+
+    assert await user_repo.get_by_id(db_session, "user00") is None
+
+
+async def test_load_in_flight_during_invalidation_is_not_cached():
+    cache = EntityCache(MemoryCacheBackend())
+    release = asyncio.Event()
+
+    async def old_row():
+        await release.wait()
+        return {"u_id": "user00", "u_username": "old"}
+
+    load = asyncio.create_task(cache.get_or_load("k", old_row))
+    await asyncio.sleep(0)
+    await cache.invalidate("k")
+    release.set()
+
+    assert (await load)["u_username"] == "old"
+    assert await cache.backend.get("k") is MISS
+
+
+async def test_row_cached_by_a_reader_before_commit_is_dropped_after_it():
+    user_repo = UserRepository()
+    async with TestingSessionLocal() as db:
+        await insert_users(db, 1)
+        await db.commit()
+
+    try:
+        async with TestingSessionLocal() as writer, TestingSessionLocal() as reader:
+            await user_repo.update_by_id(writer, "user00", {"u_username": "renamed"})
+            # A concurrent request reads (and caches) the committed, old row
+            stale = await user_repo.get_by_id(reader, "user00")
+            assert stale.u_username == "user00"
+
+            await writer.commit()
+            await invalidate_committed(writer)
+
+            fresh = await user_repo.get_by_id(reader, "user00")
+            assert fresh.u_username == "renamed"
+    finally:
+        async with TestingSessionLocal() as db:
+            await db.execute(delete(User))
+            await db.commit()
+
+
+async def test_shared_backend_round_trips_rows(db_session, monkeypatch):
+    monkeypatch.setattr(
+        UserRepository, "entity_cache", EntityCache(SharedCacheBackend(FakeRedis()))
+    )
+    user_repo = UserRepository()
+    await insert_users(db_session, 1)
+
+    loaded = await user_repo.get_by_id(db_session, "user00")
+    cached = await user_repo.get_by_id(db_session, "user00")
+
+    assert user_repo.entity_cache.stats()["hits"] == 1
+    assert isinstance(cached.created_at, datetime)
+    assert cached.created_at == loaded.created_at
+    assert cached.u_username == "user00"
+
+
+def test_redis_backend_without_the_package_names_it(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "redis")
+    # A None entry makes the import fail as if redis were not installed
+    monkeypatch.setitem(sys.modules, "redis.asyncio", None)
+
+    with pytest.raises(RuntimeError, match="pip install 'redis>=5'"):
+        build_entity_cache()
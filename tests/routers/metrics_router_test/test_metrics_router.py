@@ -0,0 +1,21 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_metrics_report_route_latency(async_client):
+    await async_client.get("/users/")
+    await async_client.get("/users/nobody")
+
+    response = await async_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/users/",status="200"}'
+    ) in text
+    assert 'route="/users/{user_id}",status="404"' in text
+    assert 'http_exceptions_total{handler="http",exception="HTTPException"}' in text
+    assert "http_requests_in_flight 1" in text
@@ -0,0 +1,22 @@
+import pytest
+from sqlalchemy import delete
+
+from app.models.user import User
+from tests.conftest import TestingSessionLocal
+from tests.repositories.base_repository_test.test_data_base_repository import (
+    insert_users,
+)
+
+
+@pytest.fixture
+async def seeded_users():
+    """
+    Commit users so requests on other connections can see them.
+    """
+    async with TestingSessionLocal() as db:
+        await insert_users(db, 5)
+        await db.commit()
+    yield
+    async with TestingSessionLocal() as db:
+        await db.execute(delete(User))
+        await db.commit()
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.services import user_service
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bulk_import_reports_rows_without_aborting(async_client, seeded_users):
+    payload = [
+        {"username": "alice", "password": "pw"},
+        {"username": "user00", "password": "pw"},  # already seeded
+        {"username": "alice", "password": "pw"},  # duplicate within the batch
+        {"username": "bob"},  # missing password
+        {"username": "carol", "password": "pw"},
+    ]
+
+    response = await async_client.post("/users/bulk", json=payload)
+
+    data = response.json()["data"]
+    assert response.status_code == 200
+    assert data["total"] == 5
+    assert data["created"] == 2
+    assert [(e["index"], e["error"]) for e in data["errors"]] == [
+        (1, "user.username_exists"),
+        (2, "user.username_exists"),
+        (3, "common.validation_error"),
+    ]
+    assert data["chunks"][0]["created"] == 2
+    assert data["rows_per_sec"] > 0
+
+    created = await async_client.get("/users/", params={"page_size": 100})
+    usernames = {user["u_username"] for user in created.json()["data"]}
+    assert {"alice", "carol"} <= usernames
+
+
+async def test_bulk_import_accepts_ndjson(async_client, seeded_users):
+    body = "\n".join(
+        [
+            json.dumps({"username": "dave", "password": "pw"}),
+            "not json",
+            json.dumps({"username": "erin", "password": "pw"}),
+        ]
+    )
+
+    response = await async_client.post(
+        "/users/bulk",
+        content=body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+
+    data = response.json()["data"]
+    assert data["created"] == 2
+    assert [e["index"] for e in data["errors"]] == [1]
+
+
+async def test_bulk_import_parses_lines_split_across_chunks(async_client, seeded_users):
+    body = (
+        json.dumps({"username": "frank", "password": "pw"})
+        + "\n"
+        + json.dumps({"username": "grace", "password": "pw"})
+    ).encode()
+
+    async def chunks():
+        for start in range(0, len(body), 7):
+            yield body[start : start + 7]
+
+    response = await async_client.post(
+        "/users/bulk",
+        content=chunks(),
+        headers={"content-type": "application/x-ndjson"},
+    )
+
+    data = response.json()["data"]
+    assert data["created"] == 2
+    assert data["errors"] == []
+
+
+async def test_bulk_import_stops_at_a_chunk_boundary_near_the_deadline(
+    async_client, seeded_users, monkeypatch
+):
+    monkeypatch.setattr(settings, "BULK_IMPORT_CHUNK_SIZE", 2)
+    # No time left once a chunk has been timed
+    monkeypatch.setattr(user_service, "remaining", lambda: 0.0)
+    payload = [{"username": f"late{i}", "password": "pw"} for i in range(5)]
+
+    response = await async_client.post("/users/bulk", json=payload)
+
+    data = response.json()["data"]
+    assert response.status_code == 200
+    assert (data["total"], data["created"], data["resume_from"]) == (2, 2, 2)
+    created = await async_client.get("/users/", params={"page_size": 100})
+    usernames = {user["u_username"] for user in created.json()["data"]}
+    assert {"late0", "late1"} <= usernames
+    assert "late2" not in usernames
+
+
+async def test_bulk_import_rejects_non_array_json(async_client):
+    response = await async_client.post("/users/bulk", json={"username": "x"})
+
+    assert response.status_code == 400
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.services import user_service
+
+pytestmark = pytest.mark.anyio
+
+# Recursive CTE that keeps SQLite busy for roughly a second
+SLOW_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 2000000) "
+    "SELECT count(*) FROM c"
+)
+
+
+async def test_slow_query_does_not_block_other_requests(async_client, monkeypatch):
+    async def slow_count(db, conditions=None):
+        await db.execute(SLOW_QUERY)
+        return 0
+
+    monkeypatch.setattr(user_service.user_repo, "count", slow_count)
+
+    slow_request = asyncio.create_task(async_client.get("/users/"))
+    # Let the slow request reach the database before issuing the others
+    await asyncio.sleep(0.05)
+
+    responses = await asyncio.gather(
+        *(async_client.get(f"/users/missing-{i}") for i in range(5))
+    )
+
+    assert all(response.status_code == 404 for response in responses)
+    # Every fast request finished while the slow query was still running
+    assert not slow_request.done()
+
+    response = await slow_request
+    assert response.status_code == 200
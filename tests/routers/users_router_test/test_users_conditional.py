@@ -0,0 +1,124 @@
+import pytest
+
+from app.repositories.user_repository import UserRepository
+from app.routers import users as users_router
+from app.services import user_service
+from tests.conftest import TestingSessionLocal
+
+pytestmark = pytest.mark.anyio
+
+
+async def rename(user_id: str, username: str):
+    async with TestingSessionLocal() as db:
+        await UserRepository().update_by_id(db, user_id, {"u_username": username})
+        await db.commit()
+
+
+async def test_user_carries_validators(async_client, seeded_users):
+    response = await async_client.get("/users/user01")
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('W/"')
+    assert response.headers["last-modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+async def test_matching_etag_returns_304_without_body(async_client, seeded_users):
+    etag = (await async_client.get("/users/user01")).headers["etag"]
+
+    response = await async_client.get(
+        "/users/user01", headers={"If-None-Match": f'"other", {etag}'}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+async def test_changed_user_gets_a_new_etag(async_client, seeded_users):
+    etag = (await async_client.get("/users/user01")).headers["etag"]
+    await rename("user01", "renamed")
+
+    response = await async_client.get("/users/user01", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["data"]["u_username"] == "renamed"
+    assert response.headers["etag"] != etag
+
+
+async def test_etag_depends_on_language(async_client, seeded_users):
+    vi = await async_client.get("/users/user01")
+    en = await async_client.get("/users/user01", headers={"lang": "en"})
+    assert vi.headers["etag"] != en.headers["etag"]
+
+
+async def test_if_modified_since(async_client, seeded_users):
+    current = await async_client.get(
+        "/users/user01", headers={"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    )
+    stale = await async_client.get(
+        "/users/user01", headers={"If-Modified-Since": "Sun, 31 Dec 2023 23:59:59 GMT"}
+    )
+    assert current.status_code == 304
+    assert stale.status_code == 200
+
+
+async def test_list_page_revalidates_without_loading_rows(
+    async_client, seeded_users, monkeypatch
+):
+    params = {"page_no": 1, "page_size": 2}
+    etag = (await async_client.get("/users/", params=params)).headers["etag"]
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("rows loaded for a current page")
+
+    monkeypatch.setattr(users_router, "get_users_paginated", fail)
+    response = await async_client.get(
+        "/users/", params=params, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+async def test_list_page_etag_follows_its_rows(async_client, seeded_users):
+    params = {"page_no": 1, "page_size": 2}
+    first = (await async_client.get("/users/", params=params)).json()["data"][0]
+    etag = (await async_client.get("/users/", params=params)).headers["etag"]
+    other_page = await async_client.get("/users/", params={**params, "page_no": 2})
+    assert other_page.headers["etag"] != etag
+
+    await rename(first["u_id"], "renamed")
+    response = await async_client.get(
+        "/users/", params=params, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+async def test_changed_list_page_is_counted_once(
+    async_client, seeded_users, monkeypatch
+):
+    counts = []
+    count = user_service.user_repo.count
+
+    async def counting(*args, **kwargs):
+        counts.append(args)
+        return await count(*args, **kwargs)
+
+    monkeypatch.setattr(user_service.user_repo, "count", counting)
+    response = await async_client.get(
+        "/users/", params={"page_size": 2}, headers={"If-None-Match": '"stale"'}
+    )
+    assert response.status_code == 200
+    assert response.json()["meta"]["total"] == 5
+    assert len(counts) == 1
+
+
+async def test_cursor_and_ids_lists_revalidate(async_client, seeded_users):
+    for params in ({"ids": "user01,user02,missing"}, {"page_size": 2}):
+        page = await async_client.get("/users/", params=params)
+        cursor = page.json()["meta"].get("next_cursor")
+        if "ids" not in params:
+            params = {**params, "cursor": cursor}
+            page = await async_client.get("/users/", params=params)
+        response = await async_client.get(
+            "/users/", params=params, headers={"If-None-Match": page.headers["etag"]}
+        )
+        assert response.status_code == 304
@@ -0,0 +1,36 @@
+import csv
+import io
+import json
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_export_ndjson_streams_every_user(async_client, seeded_users):
+    response = await async_client.get("/users/export")
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [row["u_id"] for row in rows] == [f"user{i:02d}" for i in range(5)]
+    assert "u_password" not in rows[0]
+    assert rows[0]["created_at"] == "2024-01-01T00:00:00Z"
+
+
+async def test_export_csv_has_header(async_client, seeded_users):
+    response = await async_client.get("/users/export", params={"format": "csv"})
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert response.headers["content-type"].startswith("text/csv")
+    assert len(rows) == 5
+    assert rows[0]["u_username"] == "user00"
+
+
+async def test_export_filters_on_updated_at(async_client, seeded_users):
+    response = await async_client.get(
+        "/users/export", params={"updated_after": "2030-01-01T00:00:00Z"}
+    )
+
+    assert response.status_code == 200
+    assert response.text == ""
@@ -0,0 +1,52 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_list_returns_only_requested_fields(async_client, seeded_users):
+    response = await async_client.get(
+        "/users/", params={"page_size": 2, "fields": "u_username, u_id"}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert all(set(user) == {"u_id", "u_username"} for user in body["data"])
+    assert body["meta"]["next_cursor"]
+
+
+async def test_cursor_ids_and_search_take_fields(async_client, seeded_users):
+    first = await async_client.get("/users/", params={"page_size": 2})
+    for params in (
+        {"cursor": first.json()["meta"]["next_cursor"], "page_size": 2},
+        {"ids": "user01,user02"},
+    ):
+        response = await async_client.get(
+            "/users/", params={**params, "fields": "updated_at"}
+        )
+        assert [set(user) for user in response.json()["data"]] == [
+            {"updated_at"},
+            {"updated_at"},
+        ]
+        assert response.json()["data"][0]["updated_at"] == "2024-01-01T00:00:00Z"
+
+    response = await async_client.get(
+        "/users/search", params={"q": "user", "limit": 2, "fields": "u_id"}
+    )
+    assert response.json()["data"] == [{"u_id": "user00"}, {"u_id": "user01"}]
+    assert response.json()["meta"]["next_cursor"]
+
+
+async def test_single_user_fields_and_etag(async_client, seeded_users):
+    full = await async_client.get("/users/user01")
+    narrow = await async_client.get("/users/user01", params={"fields": "u_username"})
+
+    assert narrow.json()["data"] == {"u_username": "user01"}
+    assert narrow.headers["etag"] != full.headers["etag"]
+
+
+async def test_unknown_or_empty_fields_are_rejected(async_client, seeded_users):
+    for fields in ("u_password", "u_id,nope", " , "):
+        response = await async_client.get("/users/", params={"fields": fields})
+        assert response.status_code == 400
+    response = await async_client.get("/users/user01", params={"fields": "u_password"})
+    assert response.status_code == 400
@@ -0,0 +1,76 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_offset_page_returns_cursor(async_client, seeded_users):
+    response = await async_client.get("/users/", params={"page_size": 2})
+
+    body = response.json()
+    assert response.status_code == 200
+    assert [u["u_id"] for u in body["data"]] == ["user04", "user03"]
+    assert body["meta"]["total"] == 5
+    assert body["meta"]["next_cursor"]
+    assert body["meta"]["prev_cursor"] is None
+
+
+async def test_cursor_pages_follow_offset_page(async_client, seeded_users):
+    first = (await async_client.get("/users/", params={"page_size": 2})).json()
+
+    response = await async_client.get(
+        "/users/", params={"page_size": 2, "cursor": first["meta"]["next_cursor"]}
+    )
+
+    body = response.json()
+    assert response.status_code == 200
+    assert [u["u_id"] for u in body["data"]] == ["user02", "user01"]
+    assert "total" not in body["meta"]
+    assert body["meta"]["has_prev"] and body["meta"]["has_next"]
+
+
+async def test_invalid_cursor_is_bad_request(async_client):
+    response = await async_client.get("/users/", params={"cursor": "bogus"})
+
+    assert response.status_code == 400
+
+
+async def test_page_size_has_upper_bound(async_client):
+    response = await async_client.get("/users/", params={"page_size": 1000})
+
+    assert response.status_code == 422
+
+
+async def test_count_mode_none_omits_total(async_client, seeded_users):
+    response = await async_client.get(
+        "/users/", params={"page_size": 2, "count_mode": "none"}
+    )
+
+    meta = response.json()["meta"]
+    assert response.status_code == 200
+    assert meta["count_mode"] == "none"
+    assert meta["total"] is None
+    assert meta["has_next"]
+
+
+async def test_ids_returns_requested_users(async_client, seeded_users):
+    response = await async_client.get("/users/", params={"ids": "user03,nope,user01"})
+
+    body = response.json()
+    assert response.status_code == 200
+    assert [u["u_id"] for u in body["data"]] == ["user03", "user01"]
+    assert body["meta"] == {"requested": 3, "found": 2, "missing": ["nope"]}
+
+
+async def test_ids_has_upper_bound(async_client):
+    ids = ",".join(f"u{i}" for i in range(101))
+
+    response = await async_client.get("/users/", params={"ids": ids})
+
+    assert response.status_code == 400
+
+
+async def test_server_timing_counts_request_queries(async_client, seeded_users):
+    response = await async_client.get("/users/", params={"page_size": 2})
+
+    assert response.status_code == 200
+    assert 'desc="2 queries"' in response.headers["server-timing"]
@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import delete, insert, update
+
+from app.models.user import User
+from tests.conftest import TestingSessionLocal
+
+pytestmark = pytest.mark.anyio
+
+USERNAMES = ["ali", "alice", "alicia", "Alien", "bob_ali", "xalix", "al%x", "a*li"]
+
+
+@pytest.fixture
+async def search_users():
+    async with TestingSessionLocal() as db:
+        await db.execute(
+            insert(User),
+            [
+                {"u_id": f"s_{i}", "u_username": name}
+                for i, name in enumerate(USERNAMES)
+            ],
+        )
+        await db.commit()
+    yield
+    async with TestingSessionLocal() as db:
+        await db.execute(delete(User))
+        await db.commit()
+
+
+def usernames(response):
+    assert response.status_code == 200, response.text
+    return [user["u_username"] for user in response.json()["data"]]
+
+
+async def test_prefix_search_pages_in_username_order(async_client, search_users):
+    first = await async_client.get("/users/search", params={"q": "ali", "limit": 2})
+    assert usernames(first) == ["ali", "alice"]
+    meta = first.json()["meta"]
+    assert meta["has_next"] is True
+    assert meta["mode"] == "prefix"
+
+    second = await async_client.get(
+        "/users/search",
+        params={"q": "ali", "limit": 2, "cursor": meta["next_cursor"]},
+    )
+    # Matching is case-sensitive: "Alien" is not a match
+    assert usernames(second) == ["alicia"]
+    assert second.json()["meta"]["next_cursor"] is None
+
+
+async def test_substring_search_ranks_earlier_and_shorter_matches_first(
+    async_client, search_users
+):
+    params = {"q": "ali", "mode": "substring", "limit": 3}
+    first = await async_client.get("/users/search", params=params)
+    assert usernames(first) == ["ali", "alice", "alicia"]
+
+    cursor = first.json()["meta"]["next_cursor"]
+    second = await async_client.get(
+        "/users/search", params={**params, "cursor": cursor}
+    )
+    assert usernames(second) == ["xalix", "bob_ali"]
+
+
+async def test_search_treats_wildcards_literally(async_client, search_users):
+    for q, expected in (("%", ["al%x"]), ("_", ["bob_ali"]), ("*", ["a*li"])):
+        response = await async_client.get(
+            "/users/search", params={"q": q, "mode": "substring"}
+        )
+        assert usernames(response) == expected
+    response = await async_client.get("/users/search", params={"q": "al%"})
+    assert usernames(response) == ["al%x"]
+
+
+async def test_substring_index_follows_renames(async_client, search_users):
+    async with TestingSessionLocal() as db:
+        await db.execute(
+            update(User).where(User.u_username == "xalix").values(u_username="zed")
+        )
+        await db.commit()
+    response = await async_client.get(
+        "/users/search", params={"q": "ali", "mode": "substring"}
+    )
+    assert "xalix" not in usernames(response)
+    response = await async_client.get(
+        "/users/search", params={"q": "ze", "mode": "substring"}
+    )
+    assert usernames(response) == ["zed"]
+
+
+async def test_search_rejects_bad_input(async_client):
+    response = await async_client.get("/users/search", params={"q": ""})
+    assert response.status_code == 422
+    response = await async_client.get(
+        "/users/search", params={"q": "ali", "cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 400
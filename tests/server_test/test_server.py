@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from app import server
+from app.core.config import settings
+from app.server import RecyclingConfig, build_config
+
+
+def test_request_limit_is_jittered_and_stable_per_process():
+    config = RecyclingConfig(
+        "app.main:app", limit_max_requests=100, max_requests_jitter=10
+    )
+
+    limit = config.limit_max_requests
+
+    assert 100 <= limit <= 110
+    assert config.limit_max_requests == limit
+
+
+def test_request_limit_changes_in_a_new_process(monkeypatch):
+    config = RecyclingConfig(
+        "app.main:app", limit_max_requests=100, max_requests_jitter=1000
+    )
+    limits = set()
+    for pid in range(20):
+        monkeypatch.setattr(server.os, "getpid", lambda: pid)
+        limits.add(config.limit_max_requests)
+
+    assert len(limits) > 1
+
+
+def test_single_worker_disables_recycling(monkeypatch):
+    monkeypatch.setattr(settings, "WEB_MAX_REQUESTS", 50)
+
+    assert build_config(1).limit_max_requests is None
+    assert build_config(4).limit_max_requests >= 50
+
+
+def test_workers_share_a_metrics_dir_when_none_is_set(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_DIR", "")
+    monkeypatch.delenv("METRICS_DIR", raising=False)
+    monkeypatch.setenv("PASSWORD_HASH_WORKERS", "1")
+    monkeypatch.setattr(server.atexit, "register", lambda *args, **kwargs: None)
+
+    server.configure_worker_env(4)
+
+    directory = os.environ["METRICS_DIR"]
+    assert settings.METRICS_DIR == directory
+    assert os.path.isdir(directory)
+    os.rmdir(directory)
+
+
+def test_single_worker_keeps_the_private_metrics_dir(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_DIR", "")
+    monkeypatch.delenv("METRICS_DIR", raising=False)
+    monkeypatch.setenv("PASSWORD_HASH_WORKERS", "1")
+
+    server.configure_worker_env(1)
+
+    assert "METRICS_DIR" not in os.environ
+    assert settings.METRICS_DIR == ""
+
+
+@pytest.mark.anyio
+async def test_warm_up_runs_every_step():
+    from app.core.security import shutdown_hash_pool
+    from app.db.database import engine
+    from app.warmup import WARM_UP_STEPS, warm_up
+
+    timings = await warm_up()
+
+    assert list(timings) == list(WARM_UP_STEPS)
+    assert engine.pool.checkedin() >= 1
+    await engine.dispose()
+    shutdown_hash_pool()
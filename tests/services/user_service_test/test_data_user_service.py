@@ -1,7 +1,7 @@
 from app.repositories.user_repository import UserRepository
 
 
-def insert_test_user(db):
+async def insert_test_user(db):
     users_data = [
         {"u_id": "testuser1", "u_username": "testuser1", "u_password": "password1"},
         {"u_id": "testuser2", "u_username": "testuser2", "u_password": "password2"},
@@ -9,4 +9,4 @@ def insert_test_user(db):
     ]
 
     user_repo = UserRepository()
-    user_repo.bulk_create(db, users_data)
+    await user_repo.bulk_create(db, users_data)